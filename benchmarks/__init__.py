@@ -0,0 +1 @@
+"""Benchmarks runnable on a build box without audio hardware."""
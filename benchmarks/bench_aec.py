@@ -0,0 +1,128 @@
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.audio.aec import EchoCanceller
+
+CHUNK = 512
+
+
+@dataclass
+class EchoScene:
+    """Synthetic far-end playback, its echo in the mic, and optional near-end speech."""
+
+    ref: np.ndarray  # Played int16 samples
+    mic: np.ndarray  # Captured int16 samples: echo + near-end + noise
+    echo: np.ndarray  # Echo component of ``mic`` (float)
+    near: np.ndarray  # Near-end component of ``mic`` (float)
+    delay: int  # Playback-to-capture delay in samples
+
+
+def _speech_like(
+    rng: np.random.Generator, n: int, rate: int, rms: float, rhythm: float
+) -> np.ndarray:
+    """Band-limited noise with a syllable-rate envelope."""
+    noise = np.convolve(rng.normal(0.0, 1.0, n), np.ones(4) / 4, "same")
+    phase = 2 * np.pi * rhythm * np.arange(n) / rate + rng.uniform(0, 6)
+    signal: np.ndarray = noise * (0.5 + 0.5 * np.sin(phase)) ** 2
+    scale = rms / float(np.sqrt(np.mean(np.square(signal))))
+    return signal * scale
+
+
+def synthetic_echo(
+    rate: int = 16_000,
+    duration: float = 10.0,
+    *,
+    delay: float = 0.08,
+    tail: float = 0.04,
+    gain: float = 0.5,
+    double_talk: tuple[float, float] | None = None,
+    seed: int = 0,
+) -> EchoScene:
+    """Build a far-end signal and the microphone signal it produces in a small room.
+
+    Args:
+        rate: Sample rate in Hz.
+        duration: Seconds of audio.
+        delay: Playback-to-capture latency in seconds.
+        tail: Room impulse response length in seconds (exponential decay).
+        gain: Echo path gain (RMS of the impulse response energy).
+        double_talk: ``(start, end)`` seconds with near-end speech, if any.
+        seed: Random seed, so runs are reproducible.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration * rate)
+    ref = np.clip(_speech_like(rng, n, rate, 2000.0, 3.0), -32768, 32767).astype(np.int16)
+    taps = int(tail * rate)
+    room = rng.normal(0.0, 1.0, taps) * np.exp(-np.arange(taps) / (tail * rate / 5))
+    room *= gain / np.sqrt(np.sum(np.square(room)))
+    lag = int(delay * rate)
+    echo = np.concatenate([np.zeros(lag), np.convolve(ref.astype(np.float64), room)])[:n]
+    near = np.zeros(n)
+    if double_talk is not None:
+        start, end = int(double_talk[0] * rate), int(double_talk[1] * rate)
+        near[start:end] = _speech_like(rng, end - start, rate, 1500.0, 2.3)
+    mic = np.clip(echo + near + rng.normal(0.0, 30.0, n), -32768, 32767).astype(np.int16)
+    return EchoScene(ref=ref, mic=mic, echo=echo, near=near, delay=lag)
+
+
+def cancel(
+    scene: EchoScene, rate: int, block: int = 256
+) -> tuple[np.ndarray, EchoCanceller, float]:
+    """Run the canceller over the scene in capture-sized chunks.
+
+    Returns:
+        Output samples, the canceller, and CPU seconds spent.
+    """
+    canceller = EchoCanceller(rate, block=block)
+    n = len(scene.mic) - len(scene.mic) % CHUNK
+    out = np.empty(n, dtype=np.int16)
+    start = time.process_time()
+    for i in range(0, n, CHUNK):
+        out[i : i + CHUNK] = canceller.process(scene.mic[i : i + CHUNK], scene.ref[i : i + CHUNK])
+    return out, canceller, time.process_time() - start
+
+
+def erle(echo: np.ndarray, residual: np.ndarray) -> float:
+    """Echo return loss enhancement in dB: echo power over residual echo power."""
+    return float(10 * np.log10(np.mean(np.square(echo)) / np.mean(np.square(residual))))
+
+
+def main() -> None:
+    """Measure echo cancellation (ERLE) and CPU cost on synthetic echo."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rate", type=int, default=16_000)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of audio")
+    parser.add_argument("--delay", type=float, default=0.08, help="echo delay in seconds")
+    parser.add_argument("--block", type=int, default=256, help="filter block size")
+    args = parser.parse_args()
+
+    rate = args.rate
+    settle = int(2.0 * rate)  # Skip convergence
+    talk = (args.duration * 0.6, args.duration * 0.8)
+    print(f"{args.duration:.0f} s at {rate} Hz, echo delay {args.delay * 1e3:.0f} ms")
+    header = f"{'scene':>12} | {'delay est.':>10} | {'ERLE dB':>7} | {'near SNR dB':>11}"
+    print(f"{header} | {'CPU ms/s':>8}")
+    for name, double_talk in (("echo only", None), ("double talk", talk)):
+        scene = synthetic_echo(rate, args.duration, delay=args.delay, double_talk=double_talk)
+        out, canceller, cpu = cancel(scene, rate, args.block)
+        n = len(out)
+        residual = out.astype(np.float64) - scene.near[:n]
+        if double_talk is None:
+            span = slice(settle, n)
+            near_db = float("nan")
+        else:
+            span = slice(int(talk[0] * rate), int(talk[1] * rate))
+            # Talker to everything else left in the output (echo and distortion)
+            near_db = erle(scene.near[span], residual[span])
+        result = erle(scene.echo[span], residual[span])
+        delay_ms = (canceller.delay or 0) / rate * 1e3
+        cpu_ms = cpu / args.duration * 1e3
+        row = f"{name:>12} | {delay_ms:>7.1f} ms | {result:>7.1f} | {near_db:>11.1f}"
+        print(f"{row} | {cpu_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
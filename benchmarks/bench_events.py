@@ -0,0 +1,94 @@
+import argparse
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.realtime import events
+from src.realtime.events import EventDispatcher, TranscriptDelta, TurnAccumulator
+
+
+def _messages(count: int) -> list[str]:
+    """A response's worth of transcript deltas, as the data channel delivers them."""
+    return [
+        json.dumps(
+            {
+                "type": "response.audio_transcript.delta",
+                "event_id": f"event_{i}",
+                "response_id": "resp_1",
+                "item_id": "item_1",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": "こんにちは",
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def bench_closures(messages: list[str]) -> float:
+    """Previous path: seven closures and a handler dict rebuilt per message, ``json.loads``."""
+    transcript: list[str] = []
+    start = time.perf_counter()
+    for message in messages:
+
+        def on_delta(data: dict[str, Any]) -> None:
+            transcript.append(data.get("delta", ""))
+
+        def on_other(_: dict[str, Any]) -> None:
+            pass
+
+        handlers: dict[str, Callable[[dict[str, Any]], None]] = {
+            "input_audio_buffer.speech_started": on_other,
+            "input_audio_buffer.speech_stopped": on_other,
+            "response.audio_transcript.delta": on_delta,
+            "response.audio_transcript.done": on_other,
+            "response.text.delta": on_delta,
+            "response.done": on_other,
+            "output_audio_buffer.stopped": on_other,
+        }
+        data = json.loads(message)
+        event_type = data.get("type")
+        if event_type in handlers:
+            handlers[event_type](data)
+    return time.perf_counter() - start
+
+
+def bench_dispatcher(messages: list[str], decoder: Callable[[str | bytes], Any]) -> float:
+    """New path: dispatcher built once, typed events, transcript accumulated."""
+    events.decode = decoder
+    turn = TurnAccumulator()
+    dispatcher = EventDispatcher()
+    dispatcher.on(TranscriptDelta, lambda e: turn.add_text(e.delta))
+    start = time.perf_counter()
+    for message in messages:
+        dispatcher.dispatch(message)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Compare per-message dispatch cost for a burst of transcript delta events."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    messages = _messages(args.events)
+    default = events.decode
+    paths: list[tuple[str, Callable[[], float]]] = [
+        ("closures + json", lambda: bench_closures(messages)),
+        ("dispatcher + json", lambda: bench_dispatcher(messages, json.loads)),
+    ]
+    if default is not json.loads:
+        paths.append(("dispatcher + orjson", lambda: bench_dispatcher(messages, default)))
+    print(f"Dispatching {args.events} transcript delta events")
+    print(f"{'path':>20} | {'µs/event':>8} | {'speedup':>7}")
+    baseline = 0.0
+    for name, run in paths:
+        elapsed = min(run() for _ in range(3))
+        baseline = baseline or elapsed
+        print(f"{name:>20} | {elapsed / args.events * 1e6:>8.2f} | {baseline / elapsed:>6.1f}x")
+    events.decode = default
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.audio.features import compute_features
+from src.audio.utils import calculate_rms
+
+CHUNK = 512
+FRAMES = 20_000
+
+
+def bench_per_consumer(frames: np.ndarray, consumers: int) -> float:
+    """Previous path: every consumer upcasts each frame to float64 itself."""
+    start = time.perf_counter()
+    for frame in frames:
+        for _ in range(consumers):
+            rms = calculate_rms(frame)
+            peak = int(np.max(np.abs(frame.astype(np.int32))))
+            _ = rms, peak
+    return time.perf_counter() - start
+
+
+def bench_feature_bus(frames: np.ndarray, consumers: int, batch: int) -> float:
+    """Feature bus: one float32 batch per wake-up, consumers read shared records."""
+    start = time.perf_counter()
+    for i in range(0, len(frames), batch):
+        features = compute_features(frames[i : i + batch])
+        for record in features:
+            for _ in range(consumers):
+                rms, peak = float(record["rms"]), float(record["peak"])
+                _ = rms, peak
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Compare per-frame feature cost as consumers are added."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--batch", type=int, default=4, help="blocks per loop wake-up")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = rng.integers(-3000, 3000, (FRAMES, CHUNK), dtype=np.int16)
+    print(f"{FRAMES} frames of {CHUNK} samples; feature bus batch = {args.batch}")
+    header = f"{'consumers':>9} | {'per consumer (us)':>17} | {'feature bus (us)':>16}"
+    print(f"{header} | {'speedup':>7}")
+    for consumers in (1, 2, 3, 4):
+        t_old = bench_per_consumer(frames, consumers) / FRAMES * 1e6
+        t_bus = bench_feature_bus(frames, consumers, args.batch) / FRAMES * 1e6
+        print(f"{consumers:>9} | {t_old:>17.2f} | {t_bus:>16.2f} | {t_old / t_bus:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
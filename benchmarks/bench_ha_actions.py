@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import time
+
+from benchmarks.ha_standin import TOKEN, HomeAssistantConfig, HomeAssistantStandIn
+from src.ha import ActionExecutor
+from src.http_client import HttpClient
+from src.realtime.types import FunctionCall
+
+
+def _calls(count: int) -> list[FunctionCall]:
+    """``count`` service calls on distinct entities, as one multi-device command."""
+    return [
+        FunctionCall(
+            "call_service",
+            {"domain": "light", "service": "turn_off", "entity_id": f"light.room_{i}"},
+            f"call_{i}",
+        )
+        for i in range(count)
+    ]
+
+
+async def measure(counts: list[int], runs: int, latency: float) -> list[tuple[int, float, float]]:
+    """Best-of-``runs`` seconds for sequential and executor dispatch per call count."""
+    server = HomeAssistantStandIn(HomeAssistantConfig(latency=latency))
+    await server.start()
+    executor = ActionExecutor(server.base_url, TOKEN)
+    rows = []
+    try:
+        for count in counts:
+            calls = _calls(count)
+            sequential = concurrent = float("inf")
+            for _ in range(runs):
+                start = time.perf_counter()
+                for call in calls:  # Previous path: one call at a time
+                    await executor.execute([call])
+                sequential = min(sequential, time.perf_counter() - start)
+                start = time.perf_counter()
+                await executor.execute(calls)
+                concurrent = min(concurrent, time.perf_counter() - start)
+            rows.append((count, sequential, concurrent))
+    finally:
+        await HttpClient.close()
+        await server.stop()
+    return rows
+
+
+async def measure_speculation(
+    count: int, runs: int, latency: float, tail: float
+) -> tuple[float, float]:
+    """Best-of-``runs`` seconds from ``response.done`` to all results, without and with speculation.
+
+    The calls' arguments complete at once and the model keeps generating for
+    ``tail`` seconds (its spoken confirmation) before the response is done.
+    """
+    server = HomeAssistantStandIn(HomeAssistantConfig(latency=latency))
+    await server.start()
+    executor = ActionExecutor(server.base_url, TOKEN)
+    calls = _calls(count)
+    waits = {False: float("inf"), True: float("inf")}
+    try:
+        for _ in range(runs):
+            for speculative in waits:
+                if speculative:
+                    for call in calls:
+                        executor.speculate(call)
+                await asyncio.sleep(tail)
+                start = time.perf_counter()
+                await executor.execute(calls)
+                waits[speculative] = min(waits[speculative], time.perf_counter() - start)
+    finally:
+        await HttpClient.close()
+        await server.stop()
+    return waits[False], waits[True]
+
+
+def main() -> None:
+    """Compare sequential and concurrent execution of a response's Home Assistant calls."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.08, help="seconds per service call")
+    parser.add_argument(
+        "--tail", type=float, default=0.3, help="generation after the arguments (seconds)"
+    )
+    args = parser.parse_args()
+
+    rows = asyncio.run(measure(args.counts, args.runs, args.latency))
+    print(f"Service latency {args.latency * 1000:.0f} ms")
+    print(f"{'calls':>5} | {'sequential ms':>13} | {'executor ms':>11} | {'speedup':>7}")
+    for count, sequential, concurrent in rows:
+        print(
+            f"{count:>5} | {sequential * 1000:>13.1f} | {concurrent * 1000:>11.1f} | "
+            f"{sequential / concurrent:>6.1f}x"
+        )
+
+    count = max(args.counts)
+    at_done, speculated = asyncio.run(
+        measure_speculation(count, args.runs, args.latency, args.tail)
+    )
+    print(f"\n{count} whitelisted calls, {args.tail * 1000:.0f} ms generation after the arguments")
+    print(f"response.done → results: {at_done * 1000:.1f} ms at done, ", end="")
+    print(f"{speculated * 1000:.1f} ms speculative")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.standin import RealtimeStandIn, StandInConfig
+from src.audio import AudioPlayer, AudioStream, NoiseSampler, SyntheticSource
+from src.http_client import HttpClient
+from src.interfaces import WakeEvent, WakeWordDetector
+from src.main import run_cycle
+from src.realtime.realtime import RealtimeSessionManager
+from src.settings import settings
+
+STAGES = ["wake", "ephemeral_key", "sdp_answer", "speech_stopped", "first_audio_frame"]
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "turn_latency.jsonl"
+
+
+class UtteranceSource(SyntheticSource):
+    """Quiet room noise; a loud tone stands in for speech while ``speak()`` lasts."""
+
+    def __init__(self, sample_rate: int) -> None:
+        """Create source.
+
+        Args:
+            sample_rate: Output rate in Hz.
+        """
+        super().__init__(sample_rate=sample_rate, tones=((300.0, 0.2),), noise=0.003)
+        self._speech = 0
+
+    def speak(self, duration: float) -> None:
+        """Produce ``duration`` seconds of "speech" starting with the next block."""
+        self._speech = int(duration * self._rate)
+
+    def _blocks(self) -> Iterator[np.ndarray]:
+        rng = np.random.default_rng(self._seed)
+        position = 0
+        while True:
+            signal = rng.normal(0.0, self._noise, self._chunk)
+            if self._speech > 0:
+                t = (position + np.arange(self._chunk)) / self._rate
+                for freq, amplitude in self._tones:
+                    signal += amplitude * np.sin(2 * np.pi * freq * t)
+                self._speech -= self._chunk
+            yield np.clip(signal * 32767, -32768, 32767).astype(np.int16)
+            position += self._chunk
+
+
+class ScriptedWakeDetector(WakeWordDetector):
+    """Fires after a fixed amount of stream audio, standing in for Porcupine."""
+
+    def __init__(
+        self, stream: AudioStream, after: float, source: UtteranceSource, utterance: float
+    ) -> None:
+        """Create detector.
+
+        Args:
+            stream: Stream to consume.
+            after: Seconds of audio to read before reporting a wake word.
+            source: Source that "speaks" the request after the wake word.
+            utterance: Seconds of speech following the wake word.
+        """
+        self._stream = stream
+        self._after = after
+        self._source = source
+        self._utterance = utterance
+        self.detected_at = 0.0
+
+    async def wait_for_wake(self) -> WakeEvent:
+        """Read ``after`` seconds of audio, then report the capture index reached."""
+        reader = self._stream.subscribe()
+        try:
+            needed = int(self._after * self._stream._rate)
+            while needed > 0:
+                needed -= len(await reader.get())
+        finally:
+            self._stream.unsubscribe(reader)
+        self.detected_at = time.perf_counter()
+        self._source.speak(self._utterance)
+        return WakeEvent("scripted", reader.position)
+
+
+class NullPlayer(AudioPlayer):
+    """Player that discards audio instead of opening an output device."""
+
+    def __init__(self) -> None:
+        """Create player without touching PortAudio."""
+        self.samples = 0
+
+    async def play_audio(self, audio_data: np.ndarray) -> None:
+        """Count and drop the samples."""
+        self.samples += audio_data.size
+
+    async def start(self) -> None:
+        """Nothing to start."""
+
+    async def stop(self) -> None:
+        """Nothing to stop."""
+
+
+async def measure(
+    runs: int,
+    config: StandInConfig,
+    wake_after: float,
+    standby: int = 0,
+    local_endpointing: bool = False,
+) -> list[dict[str, float]]:
+    """Drive ``run_cycle`` against the stand-in and collect stage times.
+
+    Returns:
+        One dict per run mapping stage name to milliseconds since the cycle started.
+        Negative values are stages a pre-warmed session finished before the cycle.
+    """
+    server = RealtimeStandIn(config)
+    await server.start()
+    settings.REALTIME_API_NEW_SESSION_URL = server.session_url
+    settings.REALTIME_API_SIGNALING_URL = server.signaling_url
+    settings.OPENAI_API_KEY = "sk-standin"
+
+    source = UtteranceSource(sample_rate=48_000)
+    stream = AudioStream(source=source)
+    stream_task = asyncio.create_task(stream.run())
+    utterance = config.speech_start + config.speech_duration
+    detector = ScriptedWakeDetector(stream, wake_after, source, utterance)
+    noise = NoiseSampler(stream) if local_endpointing else None
+    noise_task = asyncio.create_task(noise.start()) if noise is not None else None
+    RealtimeSessionManager.start_standby(stream, standby, player_factory=NullPlayer, noise=noise)
+    results: list[dict[str, float]] = []
+    try:
+        for _ in range(runs):
+            # Measure the steady state: the pool refills between real-world turns
+            while len(RealtimeSessionManager._standby) < standby:
+                await asyncio.sleep(0.01)
+            started = time.perf_counter()
+            session = await run_cycle(stream, detector, player=NullPlayer(), noise=noise)
+            deadline = time.perf_counter() + 5.0
+            while "first_audio_frame" not in session.timings and time.perf_counter() < deadline:
+                await asyncio.sleep(0.005)
+            marks = {"wake": detector.detected_at, **session.timings}
+            results.append({k: (marks[k] - started) * 1e3 for k in STAGES if k in marks})
+        if RealtimeSessionManager._current_session is not None:
+            await RealtimeSessionManager._current_session.disconnect()
+    finally:
+        await RealtimeSessionManager.stop_standby()
+        await HttpClient.close()
+        stream_task.cancel()
+        if noise_task is not None:
+            noise_task.cancel()
+        await server.stop()
+    print(
+        f"HTTP requests: {server.stats.session_requests + server.stats.sdp_requests}, "
+        f"TCP connections: {len(server.stats.connections)}"
+    )
+    return results
+
+
+def summarize(results: list[dict[str, float]]) -> dict[str, dict[str, float]]:
+    """Percentiles per stage, in milliseconds since the cycle started."""
+    summary = {}
+    for stage in STAGES:
+        values = np.array([r[stage] for r in results if stage in r])
+        if len(values) == 0:
+            continue
+        summary[stage] = {
+            "n": float(len(values)),
+            "mean": float(values.mean()),
+            "p50": float(np.percentile(values, 50)),
+            "p90": float(np.percentile(values, 90)),
+            "max": float(values.max()),
+        }
+    return summary
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    """Benchmark the wake → response cycle against a local stand-in server."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--wake-after", type=float, default=0.2, help="seconds of audio")
+    parser.add_argument("--key-latency", type=float, default=0.05)
+    parser.add_argument("--sdp-latency", type=float, default=0.05)
+    parser.add_argument("--response-latency", type=float, default=0.2)
+    parser.add_argument("--standby", type=int, default=0, help="pre-warmed sessions")
+    parser.add_argument(
+        "--local-endpointing", action="store_true", help="end turns on-device, not by server VAD"
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        key_latency=args.key_latency,
+        sdp_latency=args.sdp_latency,
+        response_latency=args.response_latency,
+    )
+    results = asyncio.run(
+        measure(args.runs, config, args.wake_after, args.standby, args.local_endpointing)
+    )
+    summary = summarize(results)
+
+    print(f"{'stage':>18} | {'p50 ms':>8} | {'p90 ms':>8} | {'max ms':>8}")
+    for stage, stats in summary.items():
+        print(f"{stage:>18} | {stats['p50']:>8.1f} | {stats['p90']:>8.1f} | {stats['max']:>8.1f}")
+
+    record = {
+        "benchmark": "turn_latency",
+        "commit": _git_commit(),
+        "timestamp": time.time(),
+        "config": {
+            **vars(config),
+            "standby": args.standby,
+            "local_endpointing": args.local_endpointing,
+        },
+        "summary": summary,
+        "runs": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Appended results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import time
+from collections import deque
+
+import numpy as np
+from scipy.signal import resample_poly
+
+from src.audio.framing import FrameAccumulator
+
+PORCUPINE_RATE = 16_000
+FRAME_LENGTH = 512
+CHUNK = 512
+SECONDS = 60
+
+
+def _resampled_chunks(input_rate: int) -> list[np.ndarray]:
+    """Build the per-block 16 kHz chunks the detector sees for a given mic rate."""
+    rng = np.random.default_rng(0)
+    chunks = []
+    for _ in range(SECONDS * input_rate // CHUNK):
+        block = rng.integers(-3000, 3000, CHUNK, dtype=np.int16)
+        if input_rate != PORCUPINE_RATE:
+            block = resample_poly(block, PORCUPINE_RATE, input_rate).astype(np.int16)
+        chunks.append(block)
+    return chunks
+
+
+def bench_deque(chunks: list[np.ndarray]) -> tuple[float, int]:
+    """Previous path: per-sample deque extend + popleft list comprehension."""
+    buffer: deque[int] = deque()
+    count = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        buffer.extend(chunk)
+        while len(buffer) >= FRAME_LENGTH:
+            frame = np.array([buffer.popleft() for _ in range(FRAME_LENGTH)], dtype=np.int16)
+            count += len(frame) // FRAME_LENGTH
+    return time.perf_counter() - start, count
+
+
+def bench_accumulator(chunks: list[np.ndarray]) -> tuple[float, int]:
+    """New path: FrameAccumulator slicing."""
+    acc = FrameAccumulator(FRAME_LENGTH)
+    count = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        for frame in acc.push(chunk):
+            count += len(frame) // FRAME_LENGTH
+    return time.perf_counter() - start, count
+
+
+def main() -> None:
+    """Compare frame assembly cost for one minute of audio at common mic rates."""
+    print(f"Framing {SECONDS}s of audio into {FRAME_LENGTH}-sample Porcupine frames")
+    print(f"{'input rate':>10} | {'deque (ms)':>10} | {'numpy (ms)':>10} | {'speedup':>7}")
+    for rate in (16_000, 44_100, 48_000):
+        chunks = _resampled_chunks(rate)
+        t_deque, n_deque = bench_deque(chunks)
+        t_acc, n_acc = bench_accumulator(chunks)
+        assert n_deque == n_acc
+        print(
+            f"{rate:>10} | {t_deque * 1e3:>10.1f} | {t_acc * 1e3:>10.1f} | "
+            f"{t_deque / t_acc:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import tempfile
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from src.audio import AudioStream, FileSource
+from src.audio.noise import NoiseSampler
+from src.wake import WakeEngine
+
+SPOTTER_RATE = 16_000
+FRAME_LENGTH = 512
+NOISE = 30  # Ambient noise RMS; the sampler's threshold settles near NOISE + NOISE_MARGIN
+ONSET = (600, 280, 0.2)  # Quiet lead-in of the keyword: Hz, amplitude, seconds
+BODY = (1500, 3000, 0.3)  # Loud part that opens the gate
+
+
+class TwoToneSpotter:
+    """Stand-in keyword model that needs the quiet onset as well as the loud body.
+
+    Like a real keyword, the start is too quiet to open the energy gate, so the
+    spotter only fires when the lookback replays it.
+    """
+
+    sample_rate = SPOTTER_RATE
+    frame_length = FRAME_LENGTH
+
+    def __init__(self) -> None:
+        """Create spotter with no onset heard yet."""
+        self.frames = 0
+        self._onset = 0  # Consecutive onset frames since the last silence
+
+    @property
+    def keywords(self) -> Sequence[str]:
+        """The single stand-in keyword."""
+        return ["two_tone"]
+
+    def process(self, pcm: np.ndarray) -> int:
+        """Fire on a loud high tone that follows at least four quiet low-tone frames."""
+        self.frames += 1
+        rms = float(np.sqrt(np.mean(pcm.astype(np.float32) ** 2)))
+        crossings = int(np.count_nonzero(np.diff(np.signbit(pcm))))
+        if rms < 100:
+            self._onset = 0
+        elif rms < 1000:
+            self._onset += crossings < 60
+        elif crossings >= 60 and self._onset >= 4:
+            self._onset = 0
+            return 0
+        return -1
+
+    def delete(self) -> None:
+        """Nothing to release."""
+
+
+def _tone(rate: int, hz: float, amplitude: float, seconds: float) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return amplitude * np.sin(2 * np.pi * hz * t)
+
+
+def make_corpus(
+    rate: int, keywords: int, distractors: int, slot: float = 10.0, seed: int = 0
+) -> tuple[np.ndarray, list[tuple[int, int]]]:
+    """Noise with keywords and loud non-keyword bursts, one per ``slot`` seconds.
+
+    Returns:
+        Samples, and the capture indices where each keyword's loud body starts and ends.
+    """
+    rng = np.random.default_rng(seed)
+    slots = rng.permutation([True] * keywords + [False] * distractors)
+    signal = rng.normal(0.0, NOISE, int(rate * slot * len(slots)))
+    spans = []
+    for i, is_keyword in enumerate(slots):
+        start = int(rate * (i * slot + slot / 2))
+        body = _tone(rate, *BODY)
+        if is_keyword:
+            onset = _tone(rate, *ONSET)
+            signal[start - len(onset) : start] += onset
+            spans.append((start, start + len(body)))
+        signal[start : start + len(body)] += body
+    return signal.astype(np.int16), spans
+
+
+async def detect(
+    path: Path, rate: int, gated: bool, lookback: float | None = None
+) -> tuple[list[int], float]:
+    """Replay a corpus through the engine and collect every wake.
+
+    Returns:
+        Capture index of each detection and the engine's skip fraction.
+    """
+    stream = AudioStream(source=FileSource(path, sample_rate=rate, realtime=False))
+    noise = NoiseSampler(stream)
+    engine = WakeEngine(stream, [TwoToneSpotter()], noise if gated else None, lookback=lookback)
+    detections: list[int] = []
+
+    async def listen() -> None:
+        while True:
+            detections.append((await engine.wait_for_wake()).sample_index)
+
+    sampler = asyncio.create_task(noise.start())
+    listener = asyncio.create_task(listen())
+    await asyncio.sleep(0)  # Subscribe before the first block is captured
+    try:
+        await stream.run()
+        # Subscriptions never end; give the engine time to work through the tail
+        await stream.drain()
+        await asyncio.sleep(0.2)
+    finally:
+        sampler.cancel()
+        listener.cancel()
+        engine.close()
+    return detections, engine.skip_fraction
+
+
+def recall(detections: list[int], spans: list[tuple[int, int]], rate: int) -> float:
+    """Share of keywords detected during their loud body or within 100 ms after it."""
+    tolerance = rate // 10
+    hits = sum(any(start <= d <= end + tolerance for d in detections) for start, end in spans)
+    return hits / len(spans)
+
+
+def main() -> None:
+    """Compare energy-gated and always-on wake inference on a replayed corpus."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rate", type=int, default=48_000, help="Capture rate in Hz")
+    parser.add_argument("--keywords", type=int, default=20)
+    parser.add_argument("--distractors", type=int, default=10)
+    args = parser.parse_args()
+
+    samples, spans = make_corpus(args.rate, args.keywords, args.distractors)
+    seconds = len(samples) / args.rate
+    print(f"{seconds:.0f}s corpus at {args.rate} Hz: {args.keywords} keywords, ", end="")
+    print(f"{args.distractors} loud distractors")
+    print(f"{'mode':>16} | {'recall':>6} | {'false':>5} | {'skipped':>7} | {'CPU (s)':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "corpus.pcm"
+        path.write_bytes(samples.tobytes())
+        modes = [("always on", False, None), ("gated", True, None), ("gated, no lookbk", True, 0.0)]
+        for name, gated, lookback in modes:
+            start = time.process_time()
+            detections, skipped = asyncio.run(detect(path, args.rate, gated, lookback))
+            cpu = time.process_time() - start
+            hits = recall(detections, spans, args.rate)
+            false = len(detections) - round(hits * len(spans))
+            print(f"{name:>16} | {hits:>6.0%} | {false:>5} | {skipped:>7.0%} | {cpu:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
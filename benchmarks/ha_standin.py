@@ -0,0 +1,117 @@
+"""Local stand-in for the Home Assistant REST API."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+TOKEN = "standin-token"
+
+
+@dataclass
+class HomeAssistantConfig:
+    """Simulated server behaviour; all durations in seconds."""
+
+    latency: float = 0.05  # Time a service call takes (device round trip)
+    slow: dict[str, float] = field(default_factory=dict)  # Per-entity latency overrides
+
+
+@dataclass
+class HomeAssistantStats:
+    """Request, concurrency and connection counters."""
+
+    calls: list[tuple[str, str, float, float]] = field(default_factory=list)  # Service, entity,
+    # start, end (perf_counter)
+    in_flight: int = 0
+    max_in_flight: int = 0
+    connections: set[tuple[str, int]] = field(default_factory=set)  # Client (host, port)
+
+
+class HomeAssistantStandIn:
+    """aiohttp server answering ``/api/services`` and ``/api/states`` like Home Assistant.
+
+    Service calls take ``latency`` seconds (or the entity's ``slow`` override)
+    and set the state of their entities: ``turn_off`` to ``"off"``, anything else
+    to ``"on"``. Requests without the bearer ``TOKEN`` are rejected with 401.
+    """
+
+    config: HomeAssistantConfig
+    stats: HomeAssistantStats
+    states: dict[str, str]
+    _runner: web.AppRunner | None
+    _site: web.TCPSite | None
+
+    def __init__(self, config: HomeAssistantConfig | None = None) -> None:
+        """Create server; call ``start()`` to listen."""
+        self.config = config or HomeAssistantConfig()
+        self.stats = HomeAssistantStats()
+        self.states = {}
+        self._runner = None
+        self._site = None
+
+    @property
+    def base_url(self) -> str:
+        """``http://host:port`` the server listens on; stand-in for ``HA_URL``."""
+        assert self._site is not None, "server not started"
+        host, port = self._site._server.sockets[0].getsockname()[:2]  # type: ignore[union-attr]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> None:
+        """Listen on an ephemeral localhost port."""
+        app = web.Application(middlewares=[self._authorize])
+        app.router.add_post("/api/services/{domain}/{service}", self._handle_service)
+        app.router.add_get("/api/states/{entity_id}", self._handle_state)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        self._site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await self._site.start()
+
+    async def stop(self) -> None:
+        """Close the HTTP server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _authorize(
+        self, request: web.Request, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> web.StreamResponse:
+        if request.transport is not None:
+            peer = request.transport.get_extra_info("peername")
+            self.stats.connections.add((peer[0], peer[1]))
+        if request.headers.get("Authorization") != f"Bearer {TOKEN}":
+            raise web.HTTPUnauthorized()
+        return await handler(request)
+
+    async def _handle_service(self, request: web.Request) -> web.Response:
+        service = f"{request.match_info['domain']}.{request.match_info['service']}"
+        data = await request.json()
+        entities = data.get("entity_id", [])
+        entities = [entities] if isinstance(entities, str) else list(entities)
+        latency = max([self.config.slow.get(e, self.config.latency) for e in entities] or [0.0])
+        stats = self.stats
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        start = time.perf_counter()
+        try:
+            await asyncio.sleep(latency)
+        finally:
+            stats.in_flight -= 1
+        state = "off" if request.match_info["service"] == "turn_off" else "on"
+        changed = []
+        for entity in entities:
+            self.states[entity] = state
+            stats.calls.append((service, entity, start, time.perf_counter()))
+            changed.append({"entity_id": entity, "state": state, "attributes": {}})
+        return web.json_response(changed)
+
+    async def _handle_state(self, request: web.Request) -> web.Response:
+        entity = request.match_info["entity_id"]
+        if entity not in self.states:
+            raise web.HTTPNotFound()
+        return web.json_response(
+            {"entity_id": entity, "state": self.states[entity], "attributes": {}}
+        )
@@ -0,0 +1,267 @@
+"""Local stand-in for the OpenAI Realtime session and WebRTC signaling endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import fractions
+import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import numpy as np
+from aiohttp import web
+from aiortc import MediaStreamTrack, RTCPeerConnection, RTCSessionDescription
+from aiortc.mediastreams import MediaStreamError
+from av import AudioFrame
+
+RESPONSE_RATE = 48_000
+RESPONSE_SAMPLES = 960  # 20 ms, what the real endpoint sends
+
+
+@dataclass
+class StandInConfig:
+    """Simulated server behaviour; all durations in seconds."""
+
+    key_latency: float = 0.05  # POST /sessions processing time
+    sdp_latency: float = 0.05  # POST /realtime processing time
+    speech_start: float = 0.1  # Uplink audio before "speech_started"
+    speech_duration: float = 0.5  # Uplink audio of speech after "speech_started"
+    vad_silence: float = 0.5  # Trailing silence server VAD waits for before "speech_stopped"
+    response_latency: float = 0.2  # "speech_stopped" → first response audio frame
+    transcript: tuple[str, ...] = ("こんにちは", "、", "どうぞ")  # Transcript deltas
+    key_ttl: float = 60.0  # Ephemeral key lifetime
+
+
+@dataclass
+class StandInStats:
+    """Request and connection counters."""
+
+    session_requests: int = 0
+    sdp_requests: int = 0
+    client_events: list[str] = field(default_factory=list)  # Data channel event types
+    connections: set[tuple[str, int]] = field(default_factory=set)  # Client (host, port)
+    peers: list[RTCPeerConnection] = field(default_factory=list)
+
+
+class _ResponseTrack(MediaStreamTrack):
+    """Silent until released, then paced 20 ms stereo tone frames."""
+
+    kind = "audio"
+
+    def __init__(self, release: asyncio.Event) -> None:
+        super().__init__()
+        self._release = release
+        self._pts = 0
+        self._start = 0.0
+        t = np.arange(RESPONSE_SAMPLES) / RESPONSE_RATE
+        tone = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+        self._payload = np.repeat(tone, 2).reshape(1, -1)
+
+    async def recv(self) -> AudioFrame:
+        await self._release.wait()
+        if self._pts == 0:
+            self._start = time.perf_counter()
+        # Pace like a real sender so receive timing is meaningful
+        due = self._start + self._pts / RESPONSE_RATE
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        frame = AudioFrame.from_ndarray(self._payload, format="s16", layout="stereo")
+        frame.sample_rate = RESPONSE_RATE
+        frame.pts = self._pts
+        frame.time_base = fractions.Fraction(1, RESPONSE_RATE)
+        self._pts += RESPONSE_SAMPLES
+        return frame
+
+
+class RealtimeStandIn:
+    """aiohttp server that answers SDP offers with a local aiortc peer.
+
+    The peer plays a scripted turn: after ``speech_start`` seconds of uplink audio it
+    sends ``input_audio_buffer.speech_started``, after ``speech_duration`` plus
+    ``vad_silence`` more it sends ``speech_stopped``, and ``response_latency`` later it
+    starts streaming audio. Sessions created with ``turn_detection: null`` skip the
+    VAD events and respond ``response_latency`` after the client's ``response.create``.
+    With the audio the peer sends the ``transcript`` deltas and ``response.done``.
+    """
+
+    config: StandInConfig
+    stats: StandInStats
+    _runner: web.AppRunner | None
+    _site: web.TCPSite | None
+    _tasks: set[asyncio.Task[None]]
+    _manual_keys: set[str]
+
+    def __init__(self, config: StandInConfig | None = None) -> None:
+        """Create server; call ``start()`` to listen."""
+        self.config = config or StandInConfig()
+        self.stats = StandInStats()
+        self._runner = None
+        self._site = None
+        self._tasks = set()
+        self._manual_keys = set()
+
+    @property
+    def base_url(self) -> str:
+        """``http://host:port`` the server listens on."""
+        assert self._site is not None, "server not started"
+        host, port = self._site._server.sockets[0].getsockname()[:2]  # type: ignore[union-attr]
+        return f"http://{host}:{port}"
+
+    @property
+    def session_url(self) -> str:
+        """Stand-in for ``REALTIME_API_NEW_SESSION_URL``."""
+        return f"{self.base_url}/v1/realtime/sessions"
+
+    @property
+    def signaling_url(self) -> str:
+        """Stand-in for ``REALTIME_API_SIGNALING_URL``."""
+        return f"{self.base_url}/v1/realtime"
+
+    async def start(self) -> None:
+        """Listen on an ephemeral localhost port."""
+        app = web.Application(middlewares=[self._count_connections])
+        app.router.add_post("/v1/realtime/sessions", self._handle_session)
+        app.router.add_post("/v1/realtime", self._handle_sdp)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        self._site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await self._site.start()
+
+    async def stop(self) -> None:
+        """Close every peer connection and the HTTP server."""
+        for task in self._tasks:
+            task.cancel()
+        for pc in self.stats.peers:
+            await pc.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _count_connections(
+        self, request: web.Request, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> web.StreamResponse:
+        if request.transport is not None:
+            peer = request.transport.get_extra_info("peername")
+            self.stats.connections.add((peer[0], peer[1]))
+        return await handler(request)
+
+    async def _handle_session(self, request: web.Request) -> web.Response:
+        self.stats.session_requests += 1
+        payload = await request.json()
+        await asyncio.sleep(self.config.key_latency)
+        expires_at = int(time.time() + self.config.key_ttl)
+        key = f"ek_standin_{self.stats.session_requests}"
+        if "turn_detection" in payload and payload["turn_detection"] is None:
+            self._manual_keys.add(key)
+        return web.json_response({"client_secret": {"value": key, "expires_at": expires_at}})
+
+    async def _handle_sdp(self, request: web.Request) -> web.Response:
+        self.stats.sdp_requests += 1
+        key = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        manual = key in self._manual_keys
+        offer = RTCSessionDescription(sdp=await request.text(), type="offer")
+        pc = RTCPeerConnection()
+        self.stats.peers.append(pc)
+        release = asyncio.Event()
+        channel_ready: asyncio.Future[object] = asyncio.get_running_loop().create_future()
+
+        @pc.on("datachannel")
+        def on_datachannel(channel: object) -> None:
+            if not channel_ready.done():
+                channel_ready.set_result(channel)
+
+        @pc.on("track")
+        def on_track(track: MediaStreamTrack) -> None:
+            script = self._manual_turn if manual else self._script_turn
+            task = asyncio.create_task(script(track, channel_ready, release))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        await pc.setRemoteDescription(offer)
+        pc.addTrack(_ResponseTrack(release))
+        await pc.setLocalDescription(await pc.createAnswer())
+        await asyncio.sleep(self.config.sdp_latency)
+        return web.Response(text=pc.localDescription.sdp, content_type="application/sdp")
+
+    async def _script_turn(
+        self,
+        track: MediaStreamTrack,
+        channel_ready: asyncio.Future[object],
+        release: asyncio.Event,
+    ) -> None:
+        channel = await channel_ready
+        config = self.config
+        received = 0.0
+        stopped = config.speech_start + config.speech_duration + config.vad_silence
+        events = [
+            (config.speech_start, "input_audio_buffer.speech_started"),
+            (stopped, "input_audio_buffer.speech_stopped"),
+        ]
+        try:
+            while events:
+                frame = await track.recv()
+                if isinstance(frame, AudioFrame):
+                    received += frame.samples / frame.sample_rate
+                while events and received >= events[0][0]:
+                    _, event_type = events.pop(0)
+                    channel.send(json.dumps({"type": event_type}))  # type: ignore[attr-defined]
+            await asyncio.sleep(config.response_latency)
+            release.set()
+            self._respond(channel)
+        except Exception:
+            # The client hung up mid-turn
+            return
+
+    async def _manual_turn(
+        self,
+        track: MediaStreamTrack,
+        channel_ready: asyncio.Future[object],
+        release: asyncio.Event,
+    ) -> None:
+        channel = await channel_ready
+        requested = asyncio.Event()
+
+        @channel.on("message")  # type: ignore[attr-defined]
+        def on_message(message: str) -> None:
+            event_type = json.loads(message).get("type", "")
+            self.stats.client_events.append(event_type)
+            if event_type == "response.create":
+                requested.set()
+
+        # Keep consuming uplink audio until the client asks for a response
+        drain = asyncio.create_task(self._drain(track))
+        try:
+            await requested.wait()
+            await asyncio.sleep(self.config.response_latency)
+            release.set()
+            self._respond(channel)
+        finally:
+            drain.cancel()
+
+    def _respond(self, channel: object) -> None:
+        """Send the transcript of the response the audio track is now playing."""
+        response_id = f"resp_{len(self.stats.peers)}"
+        events: list[dict[str, object]] = [
+            {"type": "response.audio_transcript.delta", "response_id": response_id, "delta": d}
+            for d in self.config.transcript
+        ]
+        events.append(
+            {
+                "type": "response.audio_transcript.done",
+                "response_id": response_id,
+                "transcript": "".join(self.config.transcript),
+            }
+        )
+        events.append(
+            {"type": "response.done", "response": {"id": response_id, "status": "completed"}}
+        )
+        for event in events:
+            channel.send(json.dumps(event))  # type: ignore[attr-defined]
+
+    @staticmethod
+    async def _drain(track: MediaStreamTrack) -> None:
+        try:
+            while True:
+                await track.recv()
+        except MediaStreamError:
+            return  # The client stopped sending
@@ -1,7 +1,5 @@
 import asyncio
 
-import numpy as np
-
 from src.audio.noise import NoiseSampler
 from src.audio.stream import AudioStream
 
@@ -16,10 +14,9 @@ async def main() -> None:
     # Noise sampler starts
     asyncio.create_task(noise.start())
 
-    queue = stream.subscribe()
-    async for frame in stream.frames(queue):
-        max_value = np.max(np.abs(frame))
-        if noise.current_threshold() < max_value:
+    features = stream.subscribe_features()
+    async for block in stream.frames(features):
+        if noise.current_threshold() < block["peak"][0]:
             print("Voice detected!")
         await asyncio.sleep(0.1)
 
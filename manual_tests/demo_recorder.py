@@ -2,7 +2,6 @@ import asyncio
 import io
 import wave
 
-import numpy as np
 import sounddevice as sd
 
 from src.audio.noise import NoiseSampler
@@ -61,10 +60,10 @@ async def main() -> None:
     await asyncio.sleep(1)
 
     print("Say something, then be quiet for 1.5 seconds...")
-    frame: list[np.ndarray] = await recorder.record_until_silence()
-    wav_data = recorder.frames_to_wav(frame)
+    recording = await recorder.record_until_silence()
+    wav_data = b"".join(recording.wav())
 
-    if wav_data:
+    if len(recording.samples):
         print(f"Audio recorded ({len(wav_data)} bytes)")
 
         # Play back the recorded audio
@@ -0,0 +1,41 @@
+import asyncio
+import sys
+import time
+
+from src.audio.noise import NoiseSampler
+from src.audio.recorder import Recorder
+from src.audio.sources import FileSource, SyntheticSource
+from src.audio.stream import AudioStream
+
+
+async def main() -> None:
+    """Replay a WAV file (or a synthetic tone) through the noise sampler and recorder.
+
+    Runs faster than real time without any audio hardware:
+    ``python -m manual_tests.demo_replay path/to/utterance.wav``
+    """
+    if len(sys.argv) > 1:
+        source: FileSource | SyntheticSource = FileSource(sys.argv[1], realtime=False)
+    else:
+        source = SyntheticSource(tones=((220.0, 0.2),), noise=0.01, duration=12.0, realtime=False)
+
+    stream = AudioStream(source=source)
+    noise = NoiseSampler(stream)
+    recorder = Recorder(stream, noise)
+
+    noise_task = asyncio.create_task(noise.start())
+    record_task = asyncio.create_task(recorder.record_until_silence())
+    await asyncio.sleep(0)  # Let both subscribe before the first block
+
+    started = time.perf_counter()
+    await stream.run()
+    recording = await asyncio.wait_for(record_task, timeout=1.0)
+    elapsed = time.perf_counter() - started
+    noise_task.cancel()
+
+    print(f"Recorded {recording.duration:.2f}s of audio in {elapsed * 1e3:.1f} ms wall time")
+    print(f"Noise threshold: {noise.current_threshold()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,6 @@
 """SmartSpeaker2 source package."""
 
-from .interfaces import RealtimeAPIClient, WakeWordDetector
+from .interfaces import RealtimeAPIClient, WakeEvent, WakeWordDetector
 from .settings import Settings
 
-__all__ = ["WakeWordDetector", "RealtimeAPIClient", "Settings"]
+__all__ = ["WakeWordDetector", "WakeEvent", "RealtimeAPIClient", "Settings"]
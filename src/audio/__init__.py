@@ -1,9 +1,23 @@
 """Audio processing modules."""
 
+from .clips import ClipCache
 from .device import AudioDevice
 from .noise import NoiseSampler
 from .player import AudioPlayer
-from .recorder import Recorder
+from .recorder import Recorder, Recording
+from .sources import AudioSource, CorpusSource, FileSource, SyntheticSource
 from .stream import AudioStream
 
-__all__ = ["AudioDevice", "AudioStream", "AudioPlayer", "NoiseSampler", "Recorder"]
+__all__ = [
+    "AudioDevice",
+    "AudioStream",
+    "AudioPlayer",
+    "ClipCache",
+    "NoiseSampler",
+    "Recorder",
+    "Recording",
+    "AudioSource",
+    "FileSource",
+    "SyntheticSource",
+    "CorpusSource",
+]
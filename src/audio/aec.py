@@ -0,0 +1,360 @@
+"""Acoustic echo cancellation with the player output as reference."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .resample import StreamingResampler
+from .ring import SpscRing
+
+
+def estimate_delay(mic: np.ndarray, ref: np.ndarray, max_delay: int) -> tuple[int, float]:
+    """Estimate how many samples ``mic`` lags ``ref`` with GCC-PHAT.
+
+    The cross-spectrum is whitened (phase transform) so the correlation peak
+    stays sharp for speech and music, whose energy sits in a few bands.
+
+    Args:
+        mic: Microphone samples.
+        ref: Reference samples covering the same time span as ``mic``.
+        max_delay: Largest lag searched, in samples.
+
+    Returns:
+        ``(lag, confidence)``: the lag of the correlation peak and the ratio of the
+        peak to the mean correlation magnitude over the searched lags.
+    """
+    n = 1 << (len(mic) + len(ref) - 1).bit_length()
+    cross = np.fft.rfft(mic, n) * np.conj(np.fft.rfft(ref, n))
+    cross /= np.abs(cross) + 1e-12
+    corr = np.abs(np.fft.irfft(cross, n)[: max_delay + 1])
+    lag = int(np.argmax(corr))
+    return lag, float(corr[lag] / (corr.mean() + 1e-12))
+
+
+class _History:
+    """Last ``size`` samples, stored twice so any window is one contiguous slice."""
+
+    _buffer: np.ndarray
+    _size: int
+    _pos: int
+
+    def __init__(self, size: int) -> None:
+        self._buffer = np.zeros(2 * size, dtype=np.float32)
+        self._size = size
+        self._pos = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        n, size, pos = len(samples), self._size, self._pos
+        first = min(n, size - pos)
+        for offset in (0, size):
+            self._buffer[offset + pos : offset + pos + first] = samples[:first]
+            self._buffer[offset : offset + n - first] = samples[first:]
+        self._pos = (pos + n) % size
+
+    def latest(self, n: int, lag: int = 0) -> np.ndarray:
+        """View of ``n`` samples ending ``lag`` samples before the newest one."""
+        end = (self._pos - lag) % self._size + self._size
+        return self._buffer[end - n : end]
+
+
+class EchoReference:
+    """Audio actually played, handed from the output callback to the capture side.
+
+    ``write()`` runs in the output callback and only copies into an ``SpscRing``.
+    ``take()`` runs on the event loop, once per captured block: it downmixes and
+    resamples to the capture rate and returns exactly as many samples as were
+    captured, so the reference advances on the microphone clock. Idle playback
+    reads as silence. After a gap the reference is re-primed with a small margin
+    so callback phase differences do not cause repeated underruns; the resulting
+    fixed offset is measured by ``EchoCanceller``'s delay estimate.
+
+    Only one player may write at a time.
+    """
+
+    _rate: int
+    _channels: int
+    _ring: SpscRing
+    _scratch: np.ndarray
+    _resampler: StreamingResampler | None
+    _pending: np.ndarray
+    _pending_len: int
+    _primed: bool
+
+    PRIME = 0.03  # Seconds buffered before playback is used as reference
+    MAX_LAG = 0.2  # Older backlog is dropped to bound the delay (seconds)
+
+    def __init__(self, rate: int = 48_000, channels: int = 2, capacity: float = 0.5) -> None:
+        """Create reference.
+
+        Args:
+            rate: Playback sample rate in Hz.
+            channels: Interleaved playback channel count.
+            capacity: Seconds of playback held for the capture side.
+        """
+        self._rate = rate
+        self._channels = channels
+        self._ring = SpscRing(int(capacity * rate), channels)
+        self._scratch = np.zeros((self._ring.capacity, channels), dtype=np.int16)
+        self._resampler = None
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._pending_len = 0
+        self._primed = False
+
+    def write(self, played: np.ndarray) -> None:
+        """Record a block handed to the output device. Output callback side.
+
+        Args:
+            played: int16 samples, interleaved or shaped ``(samples, channels)``.
+        """
+        # A full ring means nobody is consuming; the stale audio is dropped by take()
+        self._ring.write(played.reshape(-1, self._channels))
+
+    def take(self, count: int, rate: int) -> np.ndarray:
+        """Return the next ``count`` reference samples at ``rate``. Event loop side.
+
+        Args:
+            count: Samples captured since the previous call.
+            rate: Capture sample rate in Hz.
+
+        Returns:
+            Mono int16 samples; silence where nothing was played.
+        """
+        if self._resampler is None or self._resampler.dst_rate != rate:
+            self._resampler = StreamingResampler(self._rate, rate)
+            self._pending = np.zeros(int((self.MAX_LAG + self.PRIME) * rate) + count, np.int16)
+            self._pending_len = 0
+        got = self._ring.read(self._scratch)
+        if got:
+            mono = self._scratch[:got].mean(axis=1).astype(np.int16)
+            self._append(self._resampler.process(mono))
+
+        out = np.zeros(count, dtype=np.int16)
+        if not self._primed:
+            if self._pending_len < count + int(self.PRIME * rate):
+                return out
+            self._primed = True
+        n = min(count, self._pending_len)
+        out[:n] = self._pending[:n]
+        self._consume(n)
+        if n < count:
+            self._primed = False  # Playback stopped or underran
+        return out
+
+    def _append(self, samples: np.ndarray) -> None:
+        overflow = self._pending_len + len(samples) - len(self._pending)
+        if overflow > 0:
+            self._consume(min(overflow, self._pending_len))
+            samples = samples[max(0, len(samples) - len(self._pending)) :]
+        self._pending[self._pending_len : self._pending_len + len(samples)] = samples
+        self._pending_len += len(samples)
+
+    def _consume(self, n: int) -> None:
+        rest = self._pending_len - n
+        self._pending[:rest] = self._pending[n : self._pending_len]
+        self._pending_len = rest
+
+
+class EchoCanceller:
+    """Partitioned-block frequency-domain adaptive filter (overlap-save NLMS).
+
+    The reference is delayed by a GCC-PHAT estimate of the playback-to-capture
+    latency, so the adaptive filter only has to model the room response, not the
+    device buffering. The filter is split into partitions of one block each;
+    every block costs a handful of FFTs of twice the block size regardless of the
+    filter length, and all partitions are updated in one vectorized step.
+
+    Double talk is handled with two filters: a background filter adapts on every
+    block while the reference carries audio, and the foreground filter that
+    produces the output only takes over its weights while they cancel better.
+    Near-end speech therefore disturbs the background filter but not the output.
+    """
+
+    _rate: int
+    _block: int
+    _partitions: int
+    _step: float
+    _max_delay: int
+    _window: int
+    _interval: int
+    _mic: _History
+    _ref: _History
+    _background: np.ndarray
+    _foreground: np.ndarray
+    _spectra: np.ndarray
+    _power: np.ndarray
+    _padded: np.ndarray
+    _delay: int | None
+    _candidate: int | None
+    _until_estimate: int
+    _mic_power: float
+    _background_power: float
+    _foreground_power: float
+    _power_decay: float
+    _error_decay: float
+    _out: np.ndarray
+
+    POWER_TIME = 0.15  # Time constant of the reference power estimate (seconds)
+    ERROR_TIME = 0.05  # Time constant of the error powers compared between filters (s)
+    SILENCE = 100.0  # Reference power (int16 units squared) below which nothing adapts
+    TAKEOVER = 0.5  # Background/foreground error power ratio at which weights are copied
+    DIVERGED = 4.0  # Background error power ratio at which it restarts from the foreground
+    CONFIDENCE = 8.0  # Minimum GCC-PHAT peak-to-mean ratio to accept a delay
+
+    def __init__(
+        self,
+        rate: int,
+        *,
+        block: int = 256,
+        filter_length: float = 0.064,
+        max_delay: float = 0.3,
+        step: float = 0.5,
+        estimate_window: float = 1.0,
+        estimate_interval: float = 0.5,
+    ) -> None:
+        """Create canceller.
+
+        Args:
+            rate: Sample rate of both signals in Hz.
+            block: Samples per filter block; ``process()`` takes multiples of it.
+            filter_length: Echo tail modelled after the estimated delay (seconds).
+            max_delay: Largest playback-to-capture delay searched (seconds).
+            step: Normalized adaptation step size (0-1).
+            estimate_window: Audio correlated per delay estimate (seconds).
+            estimate_interval: Time between delay estimates (seconds).
+        """
+        self._rate = rate
+        self._block = block
+        self._partitions = max(1, round(filter_length * rate / block))
+        self._step = step
+        self._max_delay = int(max_delay * rate)
+        self._window = max(int(estimate_window * rate), self._max_delay + 2 * block)
+        self._interval = max(block, int(estimate_interval * rate))
+        self._mic = _History(self._window)
+        self._ref = _History(self._window)
+        bins = block + 1
+        self._background = np.zeros((self._partitions, bins), dtype=np.complex64)
+        self._foreground = np.zeros((self._partitions, bins), dtype=np.complex64)
+        self._spectra = np.zeros((self._partitions, bins), dtype=np.complex64)
+        self._power = np.zeros(bins, dtype=np.float32)
+        self._padded = np.zeros(2 * block, dtype=np.float32)
+        self._delay = None
+        self._candidate = None
+        self._until_estimate = self._interval
+        self._mic_power = self._background_power = self._foreground_power = 0.0
+        self._power_decay = float(np.exp(-block / (self.POWER_TIME * rate)))
+        self._error_decay = float(np.exp(-block / (self.ERROR_TIME * rate)))
+        self._out = np.zeros(block, dtype=np.float32)
+
+    @property
+    def delay(self) -> int | None:
+        """Estimated playback-to-capture delay in samples, or None before one is found."""
+        return self._delay
+
+    @property
+    def erle(self) -> float:
+        """Echo return loss enhancement of the output in dB, smoothed over recent blocks."""
+        ratio = (self._mic_power + 1.0) / (self._foreground_power + 1.0)
+        return float(10.0 * np.log10(ratio))
+
+    def process(self, mic: np.ndarray, ref: np.ndarray) -> np.ndarray:
+        """Remove the echo of ``ref`` from ``mic``.
+
+        Args:
+            mic: int16 capture samples; the length must be a multiple of the block.
+            ref: Reference samples played over the same period, same length.
+
+        Returns:
+            Echo-cancelled int16 samples. Before the first delay estimate the
+            microphone signal is returned unchanged.
+        """
+        if len(mic) % self._block or len(ref) != len(mic):
+            raise ValueError("mic and ref must be equal multiples of the block size")
+        out = np.empty(len(mic), dtype=np.int16)
+        for start in range(0, len(mic), self._block):
+            end = start + self._block
+            self._mic.write(mic[start:end])
+            self._ref.write(ref[start:end])
+            self._until_estimate -= self._block
+            if self._until_estimate <= 0:
+                self._until_estimate = self._interval
+                self._update_delay()
+            if self._delay is None:
+                out[start:end] = mic[start:end]
+                continue
+            np.rint(self._filter_block(), out=self._out)
+            np.clip(self._out, -32768, 32767, out=self._out)
+            out[start:end] = self._out
+        return out
+
+    def reset(self) -> None:
+        """Forget the learned echo path (the delay estimate is kept)."""
+        self._background[:] = 0
+        self._foreground[:] = 0
+        self._spectra[:] = 0
+        self._power[:] = 0
+        self._mic_power = self._background_power = self._foreground_power = 0.0
+
+    def _update_delay(self) -> None:
+        ref = self._ref.latest(self._window)
+        if float(np.mean(np.square(ref))) < self.SILENCE:
+            return
+        lag, confidence = estimate_delay(self._mic.latest(self._window), ref, self._max_delay)
+        if confidence < self.CONFIDENCE:
+            return
+        if self._delay is not None and 0 <= lag - self._delay < self._partitions * self._block // 2:
+            self._candidate = None
+            return  # The peak lies well inside the span the filter already models
+        # Re-align only on two agreeing estimates; a reset loses the learned path, and
+        # during double talk the peak can briefly jump to another reflection
+        if self._candidate is None or abs(lag - self._candidate) > self._block // 4:
+            self._candidate = lag
+            if self._delay is not None:
+                return
+        self._candidate = None
+        # Start the filter a little early so energy just before the peak is modelled
+        self._delay = max(0, lag - self._block // 4)
+        self.reset()
+
+    def _filter_block(self) -> np.ndarray:
+        assert self._delay is not None
+        b = self._block
+        # Overlap-save: the previous and current reference blocks at the estimated delay
+        frame = self._ref.latest(2 * b, lag=self._delay)
+        spectrum = np.fft.rfft(frame)
+        self._spectra[1:] = self._spectra[:-1]
+        self._spectra[0] = spectrum
+        mic = self._mic.latest(b)
+        error = mic - np.fft.irfft((self._foreground * self._spectra).sum(axis=0), 2 * b)[b:]
+        if float(np.mean(np.square(frame[b:]))) < self.SILENCE:
+            return error  # Nothing playing: nothing to learn
+
+        trial = mic - np.fft.irfft((self._background * self._spectra).sum(axis=0), 2 * b)[b:]
+        self._adapt(trial, spectrum)
+
+        # Hand the better filter to the output, and restart a diverged background
+        a = self._error_decay
+        self._mic_power += (1 - a) * (float(np.mean(np.square(mic))) - self._mic_power)
+        power = float(np.mean(np.square(trial)))
+        self._background_power += (1 - a) * (power - self._background_power)
+        power = float(np.mean(np.square(error)))
+        self._foreground_power += (1 - a) * (power - self._foreground_power)
+        if self._background_power < self.TAKEOVER * self._foreground_power:
+            self._foreground[:] = self._background
+            self._foreground_power = self._background_power
+        elif self._background_power > self.DIVERGED * self._foreground_power:
+            self._background[:] = self._foreground
+            self._background_power = self._foreground_power
+        return error
+
+    def _adapt(self, error: np.ndarray, spectrum: np.ndarray) -> None:
+        b = self._block
+        a = self._power_decay
+        self._power *= a
+        self._power += (1.0 - a) * (spectrum.real**2 + spectrum.imag**2)
+        self._padded[b:] = error
+        norm = self._step / (self._partitions * self._power + 1.0)
+        gradient = np.conj(self._spectra) * (np.fft.rfft(self._padded) * norm)
+        # Constrain each partition to a linear (not circular) convolution
+        taps = np.fft.irfft(gradient, 2 * b, axis=1)
+        taps[:, b:] = 0
+        self._background += np.fft.rfft(taps, axis=1)
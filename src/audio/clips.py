@@ -0,0 +1,176 @@
+"""Content-addressed cache of short playback clips, stored in the output format."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+import wave
+from collections import OrderedDict
+from math import gcd
+from pathlib import Path
+
+import numpy as np
+from scipy.signal import resample_poly
+
+from .player import OUTPUT_CHANNELS, OUTPUT_RATE
+
+logger = logging.getLogger(__name__)
+
+
+class ClipCache:
+    """Earcons and canned replies, ready for ``AudioPlayer.play_clip()``.
+
+    Each clip is converted once to 48 kHz stereo int16 and stored as raw PCM
+    named by the SHA-256 of its source audio, so adding the same sound again
+    under any name reuses the file. Clips are played from read-only memory maps,
+    so nothing is decoded, resampled or copied when one is needed.
+
+    Two LRU tiers bound the footprint: mapped clips are kept (and their pages
+    touched once) up to ``memory_bytes``, and files on disk up to ``max_bytes``.
+    """
+
+    _directory: Path
+    _max_bytes: int
+    _memory_bytes: int
+    _names: dict[str, str]
+    _mapped: OrderedDict[str, np.ndarray]
+
+    def __init__(self, directory: Path, *, max_bytes: int, memory_bytes: int) -> None:
+        """Open cache, creating ``directory`` if needed.
+
+        Args:
+            directory: Where clip files are stored.
+            max_bytes: Disk budget; least recently used files are deleted beyond it.
+            memory_bytes: Budget for mapped clips; least recently used ones are unmapped.
+        """
+        self._directory = directory
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._memory_bytes = memory_bytes
+        self._names = {}
+        self._mapped = OrderedDict()
+
+    def __contains__(self, name: str) -> bool:
+        """Whether ``name`` (or a content key) resolves to a stored clip."""
+        return self._path(self._names.get(name, name)).exists()
+
+    def add(self, name: str, path: Path) -> str:
+        """Register a WAV file under ``name``, converting it unless already stored.
+
+        Args:
+            name: Name to play the clip by, e.g. ``"wake"``.
+            path: 16-bit mono or stereo WAV at any sample rate.
+
+        Returns:
+            Content key of the stored clip.
+
+        Raises:
+            ValueError: If the WAV is not 16-bit or has more than two channels.
+        """
+        with wave.open(str(path), "rb") as wav_file:
+            if wav_file.getsampwidth() != 2:
+                raise ValueError(f"{path}: clips must be 16-bit WAV")
+            rate = wav_file.getframerate()
+            channels = wav_file.getnchannels()
+            data = wav_file.readframes(wav_file.getnframes())
+        samples = np.frombuffer(data, dtype="<i2").reshape(-1, channels)
+        return self.put(name, samples, rate)
+
+    def put(self, name: str, samples: np.ndarray, rate: int) -> str:
+        """Register PCM under ``name``, converting it unless already stored.
+
+        Args:
+            name: Name to play the clip by.
+            samples: int16 samples, 1-D mono or shaped ``(frames, channels)``.
+            rate: Sample rate of ``samples`` in Hz.
+
+        Returns:
+            Content key of the stored clip.
+
+        Raises:
+            ValueError: If ``samples`` has more than two channels.
+        """
+        frames = samples.reshape(len(samples), -1)
+        if frames.shape[1] > OUTPUT_CHANNELS:
+            raise ValueError(f"Clips must be mono or stereo, got {frames.shape[1]} channels")
+        digest = hashlib.sha256(f"{rate}:{frames.shape[1]}:".encode())
+        digest.update(np.ascontiguousarray(frames, dtype="<i2").tobytes())
+        key = digest.hexdigest()
+        path = self._path(key)
+        if path.exists():
+            _touch(path)
+        else:
+            self._write(path, _to_output(frames, rate))
+            self._evict(keep=path)
+        self._names[name] = key
+        return key
+
+    def get(self, name: str) -> np.ndarray:
+        """Mapped clip for a name or content key.
+
+        Returns:
+            Read-only int16 array shaped ``(frames, 2)`` at 48 kHz.
+
+        Raises:
+            KeyError: If nothing is stored under ``name``.
+        """
+        key = self._names.get(name, name)
+        clip = self._mapped.get(key)
+        if clip is not None:
+            self._mapped.move_to_end(key)
+            return clip
+        path = self._path(key)
+        try:
+            mapped = np.memmap(path, dtype="<i2", mode="r")
+        except FileNotFoundError:
+            raise KeyError(name) from None
+        _touch(path)
+        clip = mapped.reshape(-1, OUTPUT_CHANNELS)
+        int(clip.max(initial=0))  # Fault the pages in now, not in the audio callback
+        self._mapped[key] = clip
+        while sum(c.nbytes for c in self._mapped.values()) > self._memory_bytes:
+            if len(self._mapped) == 1:
+                break  # Never unmap the clip being returned
+            self._mapped.popitem(last=False)
+        return clip
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.pcm"
+
+    def _write(self, path: Path, frames: np.ndarray) -> None:
+        tmp = path.with_suffix(".tmp")
+        frames.astype("<i2").tofile(tmp)
+        os.replace(tmp, path)
+        _touch(path)
+        logger.debug("Stored clip %s (%.2f s)", path.name, len(frames) / OUTPUT_RATE)
+
+    def _evict(self, keep: Path) -> None:
+        files = sorted(self._directory.glob("*.pcm"), key=lambda p: p.stat().st_mtime_ns)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self._max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= path.stat().st_size
+            path.unlink()  # A mapping of it stays valid until dropped
+            logger.debug("Evicted clip %s", path.name)
+
+
+def _touch(path: Path) -> None:
+    """Mark a clip as just used; file times are too coarse for back-to-back use."""
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+def _to_output(frames: np.ndarray, rate: int) -> np.ndarray:
+    """Resample ``(frames, channels)`` int16 to 48 kHz and duplicate mono to stereo."""
+    if rate != OUTPUT_RATE:
+        g = gcd(rate, OUTPUT_RATE)
+        resampled = resample_poly(frames.astype(np.float64), OUTPUT_RATE // g, rate // g, axis=0)
+        frames = np.clip(np.rint(resampled), -32768, 32767).astype(np.int16)
+    if frames.shape[1] == 1:
+        frames = np.repeat(frames, OUTPUT_CHANNELS, axis=1)
+    return frames
@@ -0,0 +1,62 @@
+"""Capture clock: how fast the input device really runs against the host clock."""
+
+from __future__ import annotations
+
+
+class CaptureClock:
+    """Estimate the capture device's actual sample rate from block arrival times.
+
+    A sound card's crystal runs slightly off its nominal rate, so timestamps
+    that merely count captured samples drift against the host clock (and the
+    far end's jitter buffer) by the same ratio. The estimate is the samples
+    captured since the first block over the host time elapsed since then:
+    arrival jitter is bounded, so its error shrinks as the span grows. Until
+    ``warmup`` seconds have passed the nominal rate is assumed, and the result
+    is clamped to ``max_drift`` so a stall or a faster-than-realtime replay
+    cannot skew timestamps much.
+
+    ``observe()`` runs on the capture thread and ``ratio`` is read on the loop;
+    each publishes a single float, so neither side locks.
+    """
+
+    _rate: int
+    _warmup: float
+    _max_drift: float
+    _origin: tuple[int, float] | None
+    _ratio: float
+
+    def __init__(self, rate: int, *, warmup: float = 10.0, max_drift: float = 500e-6) -> None:
+        """Create clock.
+
+        Args:
+            rate: Nominal sample rate of the device in Hz.
+            warmup: Host seconds observed before the estimate is used.
+            max_drift: Largest accepted deviation from the nominal rate (fraction).
+        """
+        self._rate = rate
+        self._warmup = warmup
+        self._max_drift = max_drift
+        self._origin = None
+        self._ratio = 1.0
+
+    @property
+    def ratio(self) -> float:
+        """Measured over nominal sample rate; 1.0 until warmed up."""
+        return self._ratio
+
+    def observe(self, index: int, now: float) -> None:
+        """Record that capture sample ``index`` arrived at host time ``now``.
+
+        Args:
+            index: Capture samples written so far.
+            now: Monotonic host time in seconds.
+        """
+        if self._origin is None:
+            self._origin = (index, now)
+            return
+        first, start = self._origin
+        elapsed = now - start
+        if elapsed < self._warmup:
+            return
+        ratio = (index - first) / (elapsed * self._rate)
+        self._ratio = min(max(ratio, 1.0 - self._max_drift), 1.0 + self._max_drift)
@@ -0,0 +1,75 @@
+"""On-device end-of-utterance detection from per-block levels."""
+
+from __future__ import annotations
+
+import math
+
+
+class Endpointer:
+    """Decide when the user has finished speaking.
+
+    Blocks louder than the noise threshold count as speech once enough of them
+    arrive in a row, so clicks and short bumps are ignored. After speech, a run
+    of quiet blocks ends the utterance. Without any speech the turn is given up
+    after ``no_speech`` seconds, and every turn ends after ``max_duration``.
+    """
+
+    _speech_blocks: int
+    _silence_blocks: int
+    _no_speech_blocks: int
+    _max_blocks: int
+    _speech_run: int
+    _silence_run: int
+    _blocks: int
+    heard_speech: bool
+
+    def __init__(
+        self,
+        block_duration: float,
+        *,
+        silence: float = 0.4,
+        min_speech: float = 0.1,
+        no_speech: float = 5.0,
+        max_duration: float = 15.0,
+    ) -> None:
+        """Create endpointer.
+
+        Args:
+            block_duration: Seconds of audio per ``update()``.
+            silence: Trailing silence that ends an utterance (seconds).
+            min_speech: Continuous loud audio that counts as speech (seconds).
+            no_speech: Give up if no speech starts within this time (seconds).
+            max_duration: Longest utterance before it is cut off (seconds).
+        """
+        self._speech_blocks = max(1, math.ceil(min_speech / block_duration))
+        self._silence_blocks = max(1, math.ceil(silence / block_duration))
+        self._no_speech_blocks = math.ceil(no_speech / block_duration)
+        self._max_blocks = math.ceil(max_duration / block_duration)
+        self._speech_run = 0
+        self._silence_run = 0
+        self._blocks = 0
+        self.heard_speech = False
+
+    def update(self, rms: float, threshold: float) -> bool:
+        """Feed one block level.
+
+        Args:
+            rms: Block RMS in int16 units.
+            threshold: Level above which a block counts as sound.
+
+        Returns:
+            True once the utterance is over.
+        """
+        self._blocks += 1
+        if rms > threshold:
+            self._speech_run += 1
+            self._silence_run = 0
+            if self._speech_run >= self._speech_blocks:
+                self.heard_speech = True
+        else:
+            self._speech_run = 0
+            self._silence_run += 1
+
+        if self.heard_speech:
+            return self._silence_run >= self._silence_blocks or self._blocks >= self._max_blocks
+        return self._blocks >= self._no_speech_blocks
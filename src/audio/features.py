@@ -0,0 +1,40 @@
+"""Per-frame audio features computed once and shared through the stream."""
+
+from __future__ import annotations
+
+import numpy as np
+
+FULL_SCALE = 32768.0
+
+# One record per captured block
+FEATURE_DTYPE = np.dtype(
+    [
+        ("rms", np.float32),  # Root mean square in int16 units
+        ("peak", np.float32),  # Largest absolute sample in int16 units
+        ("dbfs", np.float32),  # RMS relative to full scale (dB, >= -90.3)
+        ("zcr", np.float32),  # Fraction of adjacent samples changing sign
+    ]
+)
+
+
+def compute_features(frames: np.ndarray) -> np.ndarray:
+    """Compute features for a batch of equally sized frames.
+
+    The batch is converted to float32 once and every feature is vectorized across
+    frames, so the cost per frame shrinks as more frames arrive together.
+
+    Args:
+        frames: int16 array shaped ``(frames, samples)``.
+
+    Returns:
+        Array of ``FEATURE_DTYPE`` records, one per frame.
+    """
+    x = frames.astype(np.float32)
+    out = np.empty(len(frames), dtype=FEATURE_DTYPE)
+    rms = np.sqrt(np.square(x).sum(axis=1) / x.shape[1])
+    out["rms"] = rms
+    out["peak"] = np.abs(x).max(axis=1)
+    out["dbfs"] = 20.0 * np.log10(np.maximum(rms, 1.0) / FULL_SCALE)
+    signs = np.signbit(x)
+    out["zcr"] = (signs[:, 1:] != signs[:, :-1]).sum(axis=1) / max(1, x.shape[1] - 1)
+    return out
@@ -0,0 +1,76 @@
+"""Fixed-size frame assembly for PCM streams."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class FrameAccumulator:
+    """Cut arbitrary-length int16 chunks into exact ``frame_length`` frames.
+
+    Leftover samples are carried to the next ``push()`` in a preallocated buffer,
+    so no per-sample Python work is done. Returned frames are views into either
+    the pushed chunk or the carry buffer and are only valid until the next push.
+    """
+
+    _frame_length: int
+    _carry: np.ndarray
+    _spare: np.ndarray
+    _fill: int
+
+    def __init__(self, frame_length: int) -> None:
+        """Create accumulator.
+
+        Args:
+            frame_length: Samples per output frame.
+        """
+        if frame_length <= 0:
+            raise ValueError("frame_length must be positive")
+        self._frame_length = frame_length
+        self._carry = np.zeros(frame_length, dtype=np.int16)
+        self._spare = np.zeros(frame_length, dtype=np.int16)
+        self._fill = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of carried samples not yet emitted as a frame."""
+        return self._fill
+
+    def push(self, samples: np.ndarray) -> list[np.ndarray]:
+        """Add samples and return every frame they complete.
+
+        Args:
+            samples: 1-D int16 samples of any length.
+
+        Returns:
+            Frames of exactly ``frame_length`` samples, oldest first.
+        """
+        n = self._frame_length
+        frames: list[np.ndarray] = []
+        start = 0
+        if self._fill:
+            take = min(n - self._fill, len(samples))
+            self._carry[self._fill : self._fill + take] = samples[:take]
+            self._fill += take
+            start = take
+            if self._fill < n:
+                return frames
+            self._fill = 0
+            # Swap buffers so the emitted frame survives the leftover copy below.
+            frames.append(self._carry)
+            self._carry, self._spare = self._spare, self._carry
+
+        whole = (len(samples) - start) // n
+        if whole:
+            frames.extend(samples[start : start + whole * n].reshape(whole, n))
+            start += whole * n
+
+        rest = len(samples) - start
+        if rest:
+            self._carry[:rest] = samples[start:]
+            self._fill = rest
+        return frames
+
+    def reset(self) -> None:
+        """Discard carried samples."""
+        self._fill = 0
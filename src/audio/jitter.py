@@ -0,0 +1,267 @@
+"""Adaptive jitter buffer for network audio playback."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..tracing import tracer
+from .ring import SpscRing
+
+
+@dataclass(slots=True, frozen=True)
+class JitterStats:
+    """Snapshot of jitter buffer health."""
+
+    depth: int  # Buffered samples per channel
+    target: int  # Depth the buffer steers towards
+    jitter: float  # Smoothed arrival jitter in seconds
+    underruns: int  # Times playback ran dry
+    overruns: int  # Times incoming audio did not fit and was dropped
+    concealed: int  # Samples synthesized to cover gaps
+
+
+@dataclass(slots=True, frozen=True)
+class _StretchTable:
+    """Precomputed linear interpolation from ``consumed`` input samples to one block."""
+
+    consumed: int
+    lo: np.ndarray
+    hi: np.ndarray
+    w_lo: np.ndarray
+    w_hi: np.ndarray
+
+    @classmethod
+    def build(cls, block: int, consumed: int, channels: int) -> _StretchTable:
+        positions = np.linspace(0, consumed - 1, block)
+        lo = np.floor(positions).astype(np.intp)
+        hi = np.minimum(lo + 1, consumed - 1)
+        # Full-shape weights: broadcasting would make ufuncs allocate iteration buffers
+        w_hi = np.repeat((positions - lo)[:, None], channels, axis=1).astype(np.float32)
+        return cls(consumed, lo, hi, 1.0 - w_hi, w_hi)
+
+
+class JitterBuffer:
+    """Buffer between bursty network arrival and the fixed-rate output callback.
+
+    Frames of any size go in; the callback takes exactly the block size it needs.
+    The target depth follows the measured arrival jitter (RFC 3550 estimator).
+    Playback is time-stretched by ~2% to drift towards the target instead of
+    jumping, and short gaps are concealed by repeating the last 10 ms with a
+    fade-out before falling back to silence and re-buffering.
+
+    ``write()`` and ``clear()`` belong to the event loop, ``read()`` to the audio
+    callback. The two sides share only an ``SpscRing`` and single-writer fields,
+    and ``read()`` works entirely in preallocated scratch buffers: it never locks,
+    allocates sample memory or calls into asyncio.
+    """
+
+    _channels: int
+    _rate: int
+    _block: int
+    _ring: SpscRing
+    _min_target: int
+    _max_target: int
+    _target: int
+    _jitter: float
+    _last_arrival: float | None
+    _last_duration: float
+    _flush_to: int
+    _primed: bool
+    _in_gap: bool
+    _history: np.ndarray
+    _history_pos: int
+    _fade: np.ndarray
+    _conceal_limit: int
+    _conceal_pos: int
+    _faster: _StretchTable
+    _slower: _StretchTable
+    _source: np.ndarray
+    _mix_a: np.ndarray
+    _mix_b: np.ndarray
+    _underruns: int
+    _overruns: int
+    _concealed: int
+
+    STRETCH = 50  # Time-stretch by 1/STRETCH of a block when off target
+    HISTORY = 0.01  # Seconds of audio repeated for concealment
+
+    def __init__(
+        self,
+        *,
+        rate: int = 48_000,
+        channels: int = 2,
+        block: int = 960,
+        min_delay: float = 0.04,
+        max_delay: float = 0.3,
+        capacity: float = 1.0,
+        conceal: float = 0.06,
+    ) -> None:
+        """Create buffer.
+
+        Args:
+            rate: Sample rate in Hz.
+            channels: Interleaved channel count.
+            block: Output callback block size; larger reads are served in pieces.
+            min_delay: Lowest target depth in seconds.
+            max_delay: Highest target depth in seconds.
+            capacity: Storage in seconds; audio arriving beyond it is dropped.
+            conceal: Longest gap in seconds bridged by concealment.
+        """
+        self._channels = channels
+        self._rate = rate
+        self._block = block
+        self._ring = SpscRing(int(capacity * rate), channels)
+        self._min_target = int(min_delay * rate)
+        self._max_target = int(max_delay * rate)
+        self._target = self._min_target
+        self._jitter = 0.0
+        self._last_arrival = None
+        self._last_duration = 0.0
+        self._flush_to = 0
+        self._primed = False
+        self._in_gap = False
+        self._history = np.zeros((int(self.HISTORY * rate), channels), dtype=np.float32)
+        self._history_pos = 0
+        self._conceal_limit = int(conceal * rate)
+        fade = 1.0 - np.arange(self._conceal_limit) / max(1, self._conceal_limit)
+        self._fade = np.repeat(fade[:, None], channels, axis=1).astype(np.float32)
+        self._conceal_pos = 0
+        step = block // self.STRETCH
+        self._faster = _StretchTable.build(block, block + step, channels)
+        self._slower = _StretchTable.build(block, block - step, channels)
+        self._source = np.zeros((block + step, channels), dtype=np.float32)
+        scratch = max(block, len(self._history))
+        self._mix_a = np.zeros((scratch, channels), dtype=np.float32)
+        self._mix_b = np.zeros((scratch, channels), dtype=np.float32)
+        self._underruns = 0
+        self._overruns = 0
+        self._concealed = 0
+
+    @property
+    def stats(self) -> JitterStats:
+        """Current depth, target and counters."""
+        return JitterStats(
+            depth=self._ring.available(),
+            target=self._target,
+            jitter=self._jitter,
+            underruns=self._underruns,
+            overruns=self._overruns,
+            concealed=self._concealed,
+        )
+
+    def write(self, audio: np.ndarray, arrival: float | None = None) -> None:
+        """Queue a frame of any length. Event loop side.
+
+        Args:
+            audio: int16 samples, interleaved or shaped ``(samples, channels)``.
+            arrival: Arrival time in seconds (monotonic). Defaults to now.
+        """
+        frames = audio.reshape(-1, self._channels)
+        self._update_jitter(time.monotonic() if arrival is None else arrival, len(frames))
+        # The callback owns the read index, so a full ring refuses the newest audio
+        if self._ring.write(frames) < len(frames):
+            self._overruns += 1
+            tracer.count("player.overruns")
+
+    def clear(self) -> None:
+        """Drop buffered audio and re-prime; applied by the next ``read()``."""
+        self._flush_to = self._ring.written
+
+    def read(self, out: np.ndarray) -> None:
+        """Fill an output block completely. Audio callback side.
+
+        Args:
+            out: Writable int16 array shaped ``(frames, channels)``.
+        """
+        flush = self._flush_to - self._ring.consumed
+        if flush > 0:
+            self._ring.skip(flush)
+            self._primed = False
+        for start in range(0, len(out), self._block):
+            self._read_block(out[start : start + self._block])
+
+    def _read_block(self, out: np.ndarray) -> None:
+        n = len(out)
+        depth = self._ring.available()
+        if not self._primed:
+            if depth < max(self._target, n):
+                out.fill(0)
+                return
+            self._primed = True
+
+        if depth >= n:
+            self._in_gap = False
+            self._conceal_pos = 0
+            full = n == self._block
+            if full and depth > self._target + n and depth >= self._faster.consumed:
+                self._stretch(out, self._faster)  # Play slightly faster
+            elif full and depth < self._target - n:
+                self._stretch(out, self._slower)  # Play slightly slower
+            else:
+                self._ring.read(out)
+        else:
+            if not self._in_gap:
+                self._underruns += 1
+                tracer.count("player.underruns")
+                self._in_gap = True
+            got = self._ring.read(out)
+            self._conceal(out[got:])
+        self._remember(out)
+
+    def _update_jitter(self, arrival: float, samples: int) -> None:
+        if self._last_arrival is not None:
+            transit = (arrival - self._last_arrival) - self._last_duration
+            self._jitter += (abs(transit) - self._jitter) / 16
+            target = self._min_target + int(4 * self._jitter * self._rate)
+            self._target = min(self._max_target, max(self._min_target, target))
+        self._last_arrival = arrival
+        self._last_duration = samples / self._rate
+
+    def _stretch(self, out: np.ndarray, table: _StretchTable) -> None:
+        source = self._source[: table.consumed]
+        a, b = self._mix_a[: len(out)], self._mix_b[: len(out)]
+        self._ring.read(source)
+        # mode="clip" writes straight into ``out``; the default copies first
+        np.take(source, table.lo, axis=0, out=a, mode="clip")
+        np.take(source, table.hi, axis=0, out=b, mode="clip")
+        np.multiply(a, table.w_lo, out=a)
+        np.multiply(b, table.w_hi, out=b)
+        np.add(a, b, out=a)
+        np.rint(a, out=a)
+        out[:] = a
+
+    def _conceal(self, out: np.ndarray) -> None:
+        n = len(out)
+        count = min(n, self._conceal_limit - self._conceal_pos)
+        period = len(self._history)
+        done = 0
+        while done < count:
+            # Repeat the remembered period from its oldest sample, fading out
+            h = (self._history_pos + self._conceal_pos) % period
+            seg = min(count - done, period - h)
+            fade = self._fade[self._conceal_pos : self._conceal_pos + seg]
+            mix = self._mix_a[:seg]
+            np.multiply(self._history[h : h + seg], fade, out=mix)
+            out[done : done + seg] = mix
+            done += seg
+            self._conceal_pos += seg
+        self._concealed += done
+        out[done:] = 0
+        if done < n:
+            # Gap too long to hide: re-buffer up to the target before resuming
+            self._primed = False
+
+    def _remember(self, out: np.ndarray) -> None:
+        if self._conceal_pos:
+            return  # Keep repeating the last real audio, not the concealment
+        period = len(self._history)
+        keep = min(len(out), period)
+        tail = out[len(out) - keep :]
+        pos = self._history_pos
+        first = min(keep, period - pos)
+        self._history[pos : pos + first] = tail[:first]
+        self._history[: keep - first] = tail[first:]
+        self._history_pos = (pos + keep) % period
@@ -1,12 +1,92 @@
 from __future__ import annotations
 
-import time
-
-import numpy as np
+import logging
+import math
 
 from ..settings import settings
 from .stream import AudioStream
-from .utils import calculate_rms
+
+logger = logging.getLogger(__name__)
+
+
+class NoiseFloorEstimator:
+    """Constant-memory streaming noise floor.
+
+    A stochastic low-percentile tracker follows frame levels in dB: it steps up
+    by a small amount when a frame is above the estimate and down by a larger
+    one when below, so it settles where ``percentile`` of frames are quieter.
+    Frames more than ``speech_gate`` dB above the estimate are treated as speech
+    and only raise it at ``speech_rate``, so pauses in speech pull it back and
+    even long stretches of unbroken speech move it by a few dB; a lasting
+    change of room level is followed within seconds. An exponential moving
+    average smooths the estimate.
+    """
+
+    _up: float
+    _speech_up: float
+    _gate: float
+    _down: float
+    _alpha: float
+    _quantile: float | None
+    _floor: float
+
+    def __init__(
+        self,
+        frame_duration: float,
+        *,
+        percentile: float = 0.2,
+        adapt_rate: float = 40.0,
+        speech_gate: float = 10.0,
+        speech_rate: float = 2.0,
+        smoothing: float = 0.15,
+    ) -> None:
+        """Create estimator.
+
+        Args:
+            frame_duration: Seconds of audio per ``update()``.
+            percentile: Fraction of frames expected below the floor (0-1).
+            adapt_rate: Upward tracking speed in dB per second.
+            speech_gate: dB above the estimate from which a frame counts as speech.
+            speech_rate: Upward tracking speed during speech in dB per second.
+            smoothing: EMA time constant in seconds.
+        """
+        if not 0.0 < percentile < 1.0:
+            raise ValueError("percentile must be between 0 and 1")
+        self._up = adapt_rate * frame_duration
+        self._speech_up = speech_rate * frame_duration
+        self._gate = speech_gate
+        self._down = self._up * (1.0 - percentile) / percentile
+        self._alpha = 1.0 - math.exp(-frame_duration / smoothing)
+        self._quantile = None
+        self._floor = 0.0
+
+    @property
+    def floor(self) -> float | None:
+        """Noise floor as linear RMS, or None before the first frame."""
+        if self._quantile is None:
+            return None
+        return math.pow(10.0, self._floor / 20.0)
+
+    def update(self, rms: float) -> float:
+        """Feed one frame level.
+
+        Args:
+            rms: Frame RMS in int16 units.
+
+        Returns:
+            Updated noise floor as linear RMS.
+        """
+        level = 20.0 * math.log10(max(rms, 1.0))
+        if self._quantile is None:
+            self._quantile = self._floor = level
+        elif level < self._quantile:
+            self._quantile -= self._down
+        elif level > self._quantile + self._gate:
+            self._quantile += self._speech_up
+        else:
+            self._quantile += self._up
+        self._floor += self._alpha * (self._quantile - self._floor)
+        return math.pow(10.0, self._floor / 20.0)
 
 
 class NoiseSampler:
@@ -14,7 +94,7 @@ class NoiseSampler:
 
     _stream: AudioStream
     _threshold: int
-    _last_noise_sample_time: float
+    _last_report_time: float
 
     def __init__(self, stream: AudioStream) -> None:
         """Initialize noise sampler.
@@ -24,22 +104,34 @@ class NoiseSampler:
         """
         self._stream = stream
         self._threshold = 0
-        self._last_noise_sample_time = 0.0
+        self._last_report_time = float("-inf")
 
     async def start(self) -> None:
         """Start noise sampling coroutine."""
-        buf: list[float] = []
-        queue = self._stream.subscribe()
-        async for frame in self._stream.frames(queue):
-            rms_level = calculate_rms(frame)
-            buf.append(rms_level)
-            if time.time() - self._last_noise_sample_time >= settings.NOISE_MEASURE_INTERVAL:
-                avg = np.mean(buf)
-                self._threshold = int(avg + settings.NOISE_MARGIN)
-                print("[Noise] threshold =", self._threshold)
-                buf.clear()
-                self._last_noise_sample_time = time.time()
+        reader = self._stream.subscribe_features()
+        estimator: NoiseFloorEstimator | None = None
+        try:
+            async for features in self._stream.frames(reader):
+                block_duration = self._stream._chunk / self._stream._rate
+                if estimator is None:
+                    estimator = NoiseFloorEstimator(
+                        block_duration,
+                        percentile=settings.NOISE_PERCENTILE,
+                        adapt_rate=settings.NOISE_ADAPT_RATE,
+                        speech_gate=settings.NOISE_SPEECH_GATE,
+                        speech_rate=settings.NOISE_SPEECH_ADAPT_RATE,
+                        smoothing=settings.NOISE_SMOOTHING,
+                    )
+                floor = estimator.update(float(features["rms"][0]))
+                self._threshold = int(floor + settings.NOISE_MARGIN)
+                # Stream time (not wall clock) so file replays behave like the mic
+                current_time = reader.position * block_duration
+                if current_time - self._last_report_time >= settings.NOISE_MEASURE_INTERVAL:
+                    logger.info("Threshold = %d", self._threshold)
+                    self._last_report_time = current_time
+        finally:
+            self._stream.unsubscribe(reader)
 
     def current_threshold(self) -> int:
         """Get current noise threshold."""
-        return self._threshold or 1000  # Default fallback
+        return self._threshold or 1000  # Default fallback before the first frame
@@ -1,43 +1,92 @@
 import asyncio
+import logging
 
 import numpy as np
 import sounddevice as sd
 
+from ..settings import settings
+from ..tracing import tracer
+from .aec import EchoReference
 from .device import AudioDevice
+from .jitter import JitterBuffer, JitterStats
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_RATE = 48_000  # Fixed to match OpenAI Realtime API
+OUTPUT_CHANNELS = 2
+OUTPUT_BLOCK = 960  # Samples per output callback (20 ms)
 
 
 class AudioPlayer:
-    """Audio player for real-time playback."""
+    """Audio player for real-time playback.
+
+    Network audio goes through a jitter buffer. Local clips (earcons, canned
+    replies) bypass it: ``play_clip()`` hands the callback an array that is
+    mixed over whatever else plays from the next block on.
+    """
 
     _device: AudioDevice
-    _queue: asyncio.Queue[np.ndarray]
+    _jitter: JitterBuffer
+    _reference: EchoReference | None
     _is_playing: bool
-
-    def __init__(self, device: AudioDevice | None = None) -> None:
+    _clip: np.ndarray | None  # Written by the loop only
+    _clip_serial: int  # Bumped by the loop for every play_clip()
+    _clip_started: int  # Last serial the callback picked up
+    _clip_pos: int  # Written by the callback only
+    _mix: np.ndarray
+
+    def __init__(
+        self, device: AudioDevice | None = None, reference: EchoReference | None = None
+    ) -> None:
         """Initialize audio player.
 
         Args:
             device: Output device. If None, uses AudioDevice.default().
+            reference: Receives every block sent to the device, for echo cancellation.
         """
         self._device = device or AudioDevice.default_output()
-        self._queue = asyncio.Queue(maxsize=100)
+        self._reference = reference
+        self._jitter = JitterBuffer(
+            rate=OUTPUT_RATE,
+            channels=OUTPUT_CHANNELS,
+            min_delay=settings.PLAYER_MIN_DELAY,
+            max_delay=settings.PLAYER_MAX_DELAY,
+            conceal=settings.PLAYER_CONCEAL,
+        )
         self._is_playing = False
+        self._clip = None
+        self._clip_serial = 0
+        self._clip_started = 0
+        self._clip_pos = 0
+        self._mix = np.zeros((OUTPUT_BLOCK, OUTPUT_CHANNELS), dtype=np.int32)
+
+    @property
+    def stats(self) -> JitterStats:
+        """Jitter buffer depth and underrun/overrun counters."""
+        return self._jitter.stats
 
     async def play_audio(self, audio_data: np.ndarray) -> None:
         """Queue audio data for playback.
 
         Args:
-            audio_data: Audio data as numpy array.
+            audio_data: Interleaved stereo int16 samples of any length.
         """
-        try:
-            self._queue.put_nowait(audio_data)
-        except asyncio.QueueFull:
-            # Drop oldest frame if queue is full
-            try:
-                self._queue.get_nowait()
-                self._queue.put_nowait(audio_data)
-            except asyncio.QueueEmpty:
-                pass
+        self._jitter.write(audio_data)
+
+    async def play_clip(self, clip: np.ndarray) -> None:
+        """Play a local clip from the next output block, starting playback if needed.
+
+        Audio still queued from an earlier response is dropped; a clip that is
+        still playing is replaced.
+
+        Args:
+            clip: int16 samples shaped ``(frames, 2)`` at 48 kHz, e.g. from ``ClipCache``.
+        """
+        self._jitter.clear()
+        self._clip = clip
+        self._clip_serial += 1  # Published last: the callback reads serial, then clip
+        tracer.count("player.clips")
+        await self.start()
 
     async def start(self) -> None:
         """Start the audio playback loop."""
@@ -53,41 +102,51 @@ class AudioPlayer:
 
     async def _playback_loop(self) -> None:
         """Main playback loop."""
-        current_frame: np.ndarray | None = None
 
         def _cb(outdata: np.ndarray, _frames: int, _time: float, _status: sd.CallbackFlags) -> None:
-            nonlocal current_frame
+            start = tracer.now()
             try:
-                if current_frame is None or current_frame.shape[0] == 0:
-                    # Get next frame from queue
-                    try:
-                        current_frame = self._queue.get_nowait()
-                    except asyncio.QueueEmpty:
-                        # No audio data available, output silence
-                        outdata.fill(0)
-                        return
-
-                # Fill output buffer using reshape approach like reference code
-                if current_frame is not None:
-                    outdata[:] = current_frame.reshape(outdata.shape)
-                    current_frame = None
-
+                self._jitter.read(outdata)
+                if self._clip is not None:
+                    self._mix_clip(outdata)
             except Exception as e:
-                print(f"Audio playback error: {e}")
+                logger.error("Audio playback error: %s", e)
                 outdata.fill(0)
+            if self._reference is not None:
+                self._reference.write(outdata)
+            tracer.tally("player.callback", start)
 
         try:
             with sd.OutputStream(
-                samplerate=48000,  # Fixed to match OpenAI Realtime API
-                channels=2,
+                samplerate=OUTPUT_RATE,
+                channels=OUTPUT_CHANNELS,
                 dtype="int16",
-                blocksize=960,
+                blocksize=OUTPUT_BLOCK,
                 callback=_cb,
                 device=self._device.id,
             ):
                 while self._is_playing:
                     await asyncio.sleep(1)
         except Exception as e:
-            print(f"Audio output stream error: {e}")
+            logger.error("Audio output stream error: %s", e)
         finally:
             self._is_playing = False
+            self._jitter.clear()
+
+    def _mix_clip(self, out: np.ndarray) -> None:
+        """Add the next piece of the current clip to ``out``; audio callback side."""
+        serial = self._clip_serial
+        if serial != self._clip_started:
+            self._clip_started = serial
+            self._clip_pos = 0
+        clip = self._clip
+        if clip is None:
+            return
+        n = min(len(out), len(clip) - self._clip_pos)
+        if n <= 0:
+            return  # Finished; only the loop ever replaces the clip
+        mix = self._mix[:n]
+        np.add(out[:n], clip[self._clip_pos : self._clip_pos + n], out=mix, dtype=np.int32)
+        np.clip(mix, -32768, 32767, out=mix)
+        out[:n] = mix
+        self._clip_pos += n
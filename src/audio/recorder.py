@@ -1,20 +1,77 @@
 from __future__ import annotations
 
-import io
-import time
-import wave
+import logging
+import struct
 from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import numpy as np
 
 from ..settings import settings
-from .utils import calculate_rms
 
 if TYPE_CHECKING:
     from .noise import NoiseSampler
     from .stream import AudioStream
 
+logger = logging.getLogger(__name__)
+
+STREAMING_SIZE = 0xFFFFFFFF  # RIFF size for a WAV stream whose length is not known yet
+
+
+def wav_header(sample_rate: int, samples: int | None = None) -> bytes:
+    """Build a 44-byte mono 16-bit PCM WAV header.
+
+    Args:
+        sample_rate: Sample rate in Hz.
+        samples: Number of samples that follow, or None for a stream of unknown length.
+
+    Returns:
+        Header bytes.
+    """
+    data_size = STREAMING_SIZE - 36 if samples is None else samples * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        1,  # Mono
+        sample_rate,
+        sample_rate * 2,  # Byte rate
+        2,  # Block align
+        16,  # Bits per sample
+        b"data",
+        data_size,
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class Recording:
+    """A finished recording backed by the recorder's preallocated buffer.
+
+    ``samples`` is a read-only view that stays valid until the recorder starts its
+    next recording; copy it to keep it longer.
+    """
+
+    samples: np.ndarray
+    sample_rate: int
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    def wav(self) -> tuple[bytes, memoryview]:
+        """WAV file as a header and a zero-copy view of the PCM data.
+
+        Send both parts in order, or ``b"".join()`` them if one buffer is required.
+        """
+        return wav_header(self.sample_rate, len(self.samples)), self.samples.data.cast("B")
+
 
 class Recorder:
     """Record until silence (or timeout) and return WAV bytes for STT processing."""
@@ -22,6 +79,8 @@ class Recorder:
     _stream: AudioStream
     _noise: NoiseSampler
     _rms_window: deque[float]
+    _buffer: np.ndarray
+    _length: int
 
     def __init__(self, stream: AudioStream, noise: NoiseSampler) -> None:
         """Initialize recorder.
@@ -33,80 +92,123 @@ class Recorder:
         self._stream = stream
         self._noise = noise
         self._rms_window = deque(maxlen=5)
+        self._buffer = np.empty(self._capacity_for(settings.MAX_RECORD_DURATION), dtype=np.int16)
+        self._length = 0
 
-    async def record_until_silence(self, timeout: float | None = None) -> list[np.ndarray]:
+    async def record_until_silence(
+        self, timeout: float | None = None, start: int | None = None
+    ) -> Recording:
         """Record audio until silence is detected or timeout occurs.
 
         Args:
             timeout: Maximum recording duration in seconds.
+            start: Capture sample index to record from (e.g. the end of the wake
+                word). Defaults to the newest audio.
 
         Returns:
-            List of audio frames (numpy arrays) recorded until silence.
+            Recording backed by the preallocated capture buffer.
+        """
+        async for _ in self._capture(timeout, start):
+            pass
+        if not self._length:
+            logger.warning("No frames recorded")
+        recording = self._recording()
+        logger.info(
+            "Recorded %d samples, %.2fs @ %dHz",
+            len(recording.samples),
+            recording.duration,
+            recording.sample_rate,
+        )
+        return recording
+
+    async def stream_until_silence(
+        self, timeout: float | None = None, *, wav: bool = True, start: int | None = None
+    ) -> AsyncIterator[bytes | memoryview]:
+        """Yield audio as it is captured, stopping like ``record_until_silence``.
+
+        Lets an upload start before the utterance ends. PCM chunks are zero-copy
+        views into the capture buffer; after the stream ends, ``last_recording()``
+        returns the whole utterance.
+
+        Args:
+            timeout: Maximum recording duration in seconds.
+            wav: Start with a streaming WAV header (unknown length) before the PCM.
+            start: Capture sample index to record from. Defaults to the newest audio.
+
+        Yields:
+            Optional WAV header, then little-endian int16 PCM chunks.
         """
+        if wav:
+            yield wav_header(self._stream._rate)
+        async for chunk in self._capture(timeout, start):
+            yield chunk.data.cast("B")
+
+    def last_recording(self) -> Recording:
+        """Audio captured by the most recent (or in-progress) recording."""
+        return self._recording()
+
+    async def _capture(
+        self, timeout: float | None, start: int | None
+    ) -> AsyncIterator[np.ndarray]:
+        """Copy frames into the buffer until silence or timeout, yielding each new slice."""
         max_duration = timeout or settings.MAX_RECORD_DURATION
         silence_duration = settings.SILENCE_DURATION
         threshold = self._noise.current_threshold()
+        capacity = self._capacity_for(max_duration)
+        if capacity > len(self._buffer):
+            self._buffer = np.empty(capacity, dtype=np.int16)
+        self._length = 0
 
-        frames: list[np.ndarray] = []
-        start_time = time.time()
-        last_sound_time = start_time
+        logger.info("Recording... (threshold=%s, max=%ss)", threshold, max_duration)
 
-        print(f"[Recorder] Recording... (threshold={threshold}, max={max_duration}s)")
-
-        queue = self._stream.subscribe()
-        async for frame in self._stream.frames(queue):
-            frames.append(frame)
-            current_time = time.time()
-
-            # Check maximum duration
-            if current_time - start_time >= max_duration:
-                print(f"[Recorder] Stopped: max duration ({max_duration}s) reached")
-                break
-
-            # Check audio level using RMS with moving average
-            rms_level = calculate_rms(frame)
-            self._rms_window.append(rms_level)
-
-            # Use moving average of RMS values
-            avg_rms = sum(self._rms_window) / len(self._rms_window)
-            if avg_rms > threshold:
-                last_sound_time = current_time
-
-            # Check Minimum recording duration
-            if current_time - start_time < settings.MIN_RECORD_DURATION:
-                continue
-
-            # Check silence duration
-            silence_time = current_time - last_sound_time
-            if silence_time >= silence_duration:
-                print(f"[Recorder] Stopped: silence detected ({silence_time:.1f}s)")
-                break
-
-        # Convert frames to WAV bytes
-        if not frames:
-            print("[Recorder] Warning: No frames recorded")
-            return []
-
-        return frames
-
-    def frames_to_wav(self, frames: list[np.ndarray]) -> bytes:
-        """Convert audio frames to WAV format bytes."""
-        # Concatenate all frames
-        audio_data = np.concatenate(frames)
-
-        # Create WAV file in memory
-        buffer = io.BytesIO()
-        with wave.open(buffer, "wb") as wav_file:
-            wav_file.setnchannels(1)  # Mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(self._stream._rate)
-            wav_file.writeframes(audio_data.tobytes())
-
-        wav_bytes = buffer.getvalue()
-        duration_seconds = len(audio_data) / self._stream._rate
-        print(
-            f"[Recorder] Created WAV: {len(wav_bytes)} bytes, "
-            f"{len(audio_data)} samples, {duration_seconds:.2f}s duration "
-            f"@ {self._stream._rate}Hz"
-        )
-        return wav_bytes
+        reader = self._stream.subscribe(start=start)
+        features = self._stream.subscribe_features(start=start)
+        # Durations use stream time (samples read), so file replays behave like the mic
+        start_time = reader.position / self._stream._rate
+        last_sound_time = start_time
+        try:
+            async for frame in self._stream.frames(reader):
+                start, end = self._length, self._length + len(frame)
+                chunk = self._buffer[start:end]
+                chunk[:] = frame
+                self._length = end
+                yield chunk
+                current_time = reader.position / self._stream._rate
+
+                # Check maximum duration
+                if current_time - start_time >= max_duration:
+                    logger.info("Stopped: max duration (%ss) reached", max_duration)
+                    break
+
+                # Check audio level using RMS with moving average
+                while (block_features := features.read()) is not None:
+                    self._rms_window.append(float(block_features["rms"][0]))
+                if not self._rms_window:
+                    continue
+
+                # Use moving average of RMS values
+                avg_rms = sum(self._rms_window) / len(self._rms_window)
+                if avg_rms > threshold:
+                    last_sound_time = current_time
+
+                # Check Minimum recording duration
+                if current_time - start_time < settings.MIN_RECORD_DURATION:
+                    continue
+
+                # Check silence duration
+                silence_time = current_time - last_sound_time
+                if silence_time >= silence_duration:
+                    logger.info("Stopped: silence detected (%.1fs)", silence_time)
+                    break
+        finally:
+            self._stream.unsubscribe(reader)
+            self._stream.unsubscribe(features)
+
+    def _capacity_for(self, duration: float) -> int:
+        # One extra block: the frame that crosses the limit is still kept
+        return int(duration * self._stream._rate) + self._stream._chunk
+
+    def _recording(self) -> Recording:
+        samples = self._buffer[: self._length]
+        samples.flags.writeable = False
+        return Recording(samples, self._stream._rate)
@@ -0,0 +1,118 @@
+"""Stateful streaming polyphase resampler."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+from scipy.signal import firwin
+
+
+@lru_cache(maxsize=None)
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    """Design the anti-aliasing filter for ``up/down`` and split it into phases.
+
+    Uses the same Kaiser-windowed FIR as ``scipy.signal.resample_poly``.
+
+    Returns:
+        Read-only array ``H`` of shape ``(up, taps_per_phase)`` where
+        ``H[p, j] = h[p + j * up]``.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+    taps = -(-len(h) // up)
+    h = np.concatenate((h, np.zeros(taps * up - len(h))))
+    phases = h.reshape(taps, up).T.copy()
+    phases.flags.writeable = False
+    return phases
+
+
+class StreamingResampler:
+    """Resample an int16 stream block by block without boundary transients.
+
+    The filter is designed once per rate pair and shared between instances; the
+    last input samples and the output phase are carried between blocks, so the
+    concatenated output equals resampling the whole signal at once (up to the
+    constant filter delay).
+    """
+
+    _src_rate: int
+    _dst_rate: int
+    _up: int
+    _down: int
+    _phases: np.ndarray
+    _history: np.ndarray
+    _offset: int
+
+    def __init__(self, src_rate: int, dst_rate: int) -> None:
+        """Create resampler.
+
+        Args:
+            src_rate: Input sample rate in Hz.
+            dst_rate: Output sample rate in Hz.
+        """
+        g = gcd(src_rate, dst_rate)
+        self._src_rate = src_rate
+        self._dst_rate = dst_rate
+        self._up = dst_rate // g
+        self._down = src_rate // g
+        self._phases = _polyphase_filter(self._up, self._down)
+        self._history = np.zeros(self._phases.shape[1] - 1, dtype=np.float64)
+        # Position of the next output sample in upsampled units, relative to the
+        # first sample of the next input block.
+        self._offset = 0
+
+    @property
+    def src_rate(self) -> int:
+        """Input sample rate in Hz."""
+        return self._src_rate
+
+    @property
+    def dst_rate(self) -> int:
+        """Output sample rate in Hz."""
+        return self._dst_rate
+
+    @property
+    def delay(self) -> float:
+        """Constant filter delay in output samples."""
+        if self._up == self._down:
+            return 0.0
+        # The filter is 2 * half_len + 1 taps long at the upsampled rate.
+        return 10 * max(self._up, self._down) / self._down
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample the next block of the stream.
+
+        Args:
+            block: 1-D int16 input samples.
+
+        Returns:
+            Resampled int16 samples; their count varies by at most one between blocks.
+        """
+        if self._up == self._down:
+            return block
+        up, down = self._up, self._down
+        n = len(block)
+        end = n * up
+        taps = self._phases.shape[1]
+        ext = np.concatenate((self._history, block))
+        if self._offset >= end:
+            self._offset -= end
+            self._history = ext[len(ext) - (taps - 1) :]
+            return np.empty(0, dtype=np.int16)
+
+        positions = np.arange(self._offset, end, down)
+        self._offset = int(positions[-1]) + down - end
+
+        index = (positions // up + taps - 1)[:, None] - np.arange(taps)
+        out: np.ndarray = np.einsum("ij,ij->i", ext[index], self._phases[positions % up])
+        self._history = ext[len(ext) - (taps - 1) :]
+        result: np.ndarray = np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+        return result
+
+    def reset(self) -> None:
+        """Forget the carried filter state."""
+        self._history[:] = 0
+        self._offset = 0
@@ -0,0 +1,382 @@
+"""PCM ring buffers: shared with per-reader cursors, and SPSC for real-time threads."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+
+class AudioRingBuffer:
+    """Preallocated ring (int16 PCM by default) written by one producer and read by many cursors.
+
+    The producer may run on any thread (e.g. the PortAudio callback); readers and
+    ``notify()`` must stay on the event loop thread. Blocks handed to readers are
+    read-only views into the ring and stay valid until the writer laps them, so
+    consumers that keep audio longer than the ring depth must copy it.
+    """
+
+    _buffer: np.ndarray
+    _capacity: int
+    _block: int
+    _written: int
+    _waiter: asyncio.Future[None] | None
+    _readers: set[RingReader]
+
+    def __init__(self, capacity: int, block: int, dtype: npt.DTypeLike = np.int16) -> None:
+        """Allocate the ring.
+
+        Args:
+            capacity: Minimum number of samples kept in the ring.
+            block: Default read size in samples; capacity is rounded up to a multiple of it.
+            dtype: Element type; int16 for PCM, a structured dtype for per-frame records.
+        """
+        if block <= 0:
+            raise ValueError("block must be positive")
+        blocks = max(2, -(-capacity // block))
+        self._capacity = blocks * block
+        self._block = block
+        self._buffer = np.zeros(self._capacity, dtype=dtype)
+        self._written = 0
+        self._waiter = None
+        self._readers = set()
+
+    @property
+    def capacity(self) -> int:
+        """Ring size in samples."""
+        return self._capacity
+
+    @property
+    def block(self) -> int:
+        """Default block size in samples."""
+        return self._block
+
+    @property
+    def has_readers(self) -> bool:
+        """Whether any reader is still attached."""
+        return bool(self._readers)
+
+    @property
+    def backlogged(self) -> bool:
+        """Whether any reader has at least one complete block left to read."""
+        return any(reader.available() >= reader._block for reader in self._readers)
+
+    @property
+    def written(self) -> int:
+        """Total number of samples written since creation."""
+        return self._written
+
+    def write(self, samples: np.ndarray) -> None:
+        """Copy samples into the ring without allocating.
+
+        Args:
+            samples: 1-D int16 samples. Only the newest ``capacity`` samples are kept.
+        """
+        n = len(samples)
+        if n > self._capacity:
+            samples = samples[-self._capacity :]
+            self._written += n - self._capacity
+            n = self._capacity
+        start = self._written % self._capacity
+        first = min(n, self._capacity - start)
+        self._buffer[start : start + first] = samples[:first]
+        if first < n:
+            self._buffer[: n - first] = samples[first:]
+        # Publish only after the copy so readers never see a half-written block.
+        self._written += n
+
+    @property
+    def oldest(self) -> int:
+        """Index of the oldest sample a new reader can still start from."""
+        return max(0, self._written - (self._capacity - self._block))
+
+    def reader(self, block: int | None = None, start: int | None = None) -> RingReader:
+        """Create a cursor positioned at the current write head or in the retained history.
+
+        Args:
+            block: Samples per read. Defaults to the ring block size.
+            start: Absolute sample index to start from. Rounded down to a block
+                boundary and clamped to the retained history. Defaults to the write head.
+
+        Returns:
+            New reader registered on this ring.
+        """
+        reader = RingReader(self, block or self._block, start)
+        self._readers.add(reader)
+        return reader
+
+    def notify(self) -> None:
+        """Wake every reader waiting for data. Must be called on the loop thread."""
+        waiter, self._waiter = self._waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def wait(self) -> None:
+        """Wait until the next ``notify()``."""
+        if self._waiter is None:
+            self._waiter = asyncio.get_running_loop().create_future()
+        # Shield so a cancelled reader does not cancel the wake-up for the others.
+        await asyncio.shield(self._waiter)
+
+    def _view(self, position: int, size: int) -> np.ndarray:
+        start = position % self._capacity
+        end = start + size
+        if end <= self._capacity:
+            view = self._buffer[start:end]
+        else:
+            # Only readers whose block does not divide the ring ever wrap.
+            view = np.concatenate((self._buffer[start:], self._buffer[: end - self._capacity]))
+        view.flags.writeable = False
+        return view
+
+
+class RingReader:
+    """Independent cursor over an ``AudioRingBuffer``."""
+
+    _ring: AudioRingBuffer
+    _block: int
+    _position: int
+    dropped: int
+
+    def __init__(self, ring: AudioRingBuffer, block: int, start: int | None = None) -> None:
+        """Create reader; use ``AudioRingBuffer.reader()`` instead of calling this directly.
+
+        Args:
+            ring: Ring to read from.
+            block: Samples per read.
+            start: Absolute sample index to start from. Defaults to the write head.
+        """
+        if block > ring.capacity // 2:
+            raise ValueError("block must be at most half the ring capacity")
+        self._ring = ring
+        self._block = block
+        oldest = max(0, ring.written - (ring.capacity - block))
+        position = ring.written if start is None else min(max(start, oldest), ring.written)
+        position -= position % block
+        if position < oldest:
+            position += block  # Rounding down must not reach audio already lapped
+        self._position = position
+        self.dropped = 0
+
+    @property
+    def position(self) -> int:
+        """Absolute index of the next sample to be read."""
+        return self._position
+
+    def available(self) -> int:
+        """Number of unread samples currently in the ring."""
+        return self._ring.written - self._position
+
+    def read(self) -> np.ndarray | None:
+        """Return the next block as a read-only view, or None if not yet written.
+
+        If the writer has lapped this reader, the oldest samples are skipped and
+        counted in ``dropped`` (drop-oldest, like a full queue).
+        """
+        if self._catch_up() < self._block:
+            return None
+        view = self._ring._view(self._position, self._block)
+        self._position += self._block
+        return view
+
+    def read_all(self) -> np.ndarray | None:
+        """Return every complete pending block as one read-only ``(blocks, block)`` view.
+
+        Stops at the end of the ring so the result never needs a copy; the rest
+        comes with the next call. Returns None if no block is complete.
+        """
+        ring = self._ring
+        lag = self._catch_up()
+        if lag < self._block:
+            return None
+        start = self._position % ring.capacity
+        if ring.capacity % self._block:
+            count = 1
+        else:
+            count = min(lag, ring.capacity - start) // self._block
+        size = count * self._block
+        view = ring._view(self._position, size).reshape(count, self._block)
+        self._position += size
+        return view
+
+    def _catch_up(self) -> int:
+        """Apply drop-oldest if lapped; return the number of unread samples."""
+        ring = self._ring
+        lag = ring.written - self._position
+        limit = ring.capacity - self._block
+        if lag > limit:
+            skip = -(-(lag - limit) // self._block) * self._block
+            self._position += skip
+            self.dropped += skip
+            lag -= skip
+        return lag
+
+    async def get(self) -> np.ndarray:
+        """Wait for and return the next block."""
+        while True:
+            block = self.read()
+            if block is not None:
+                return block
+            await self._ring.wait()
+
+    def close(self) -> None:
+        """Detach this reader from its ring."""
+        self._ring._readers.discard(self)
+
+
+class SpscRing:
+    """Preallocated single-producer/single-consumer PCM ring.
+
+    Exactly one thread writes and exactly one thread reads. Each side owns one
+    monotonic index and publishes it only after its copy, so neither side locks,
+    allocates sample buffers or touches asyncio. The producer never moves the
+    read index: audio that does not fit is refused and reported to the caller.
+    Index publication relies on the GIL ordering attribute stores.
+    """
+
+    _buffer: np.ndarray
+    _capacity: int
+    _write_pos: int
+    _read_pos: int
+
+    def __init__(self, capacity: int, channels: int = 1) -> None:
+        """Allocate the ring.
+
+        Args:
+            capacity: Samples per channel the ring holds.
+            channels: Interleaved channel count; each sample is one row.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        self._buffer = np.zeros((capacity, channels), dtype=np.int16)
+        self._write_pos = 0
+        self._read_pos = 0
+
+    @property
+    def capacity(self) -> int:
+        """Ring size in samples per channel."""
+        return self._capacity
+
+    @property
+    def written(self) -> int:
+        """Total samples written; owned by the producer."""
+        return self._write_pos
+
+    @property
+    def consumed(self) -> int:
+        """Total samples read or skipped; owned by the consumer."""
+        return self._read_pos
+
+    def available(self) -> int:
+        """Samples ready for the consumer."""
+        return self._write_pos - self._read_pos
+
+    def free(self) -> int:
+        """Samples the producer can write without refusal."""
+        return self._capacity - (self._write_pos - self._read_pos)
+
+    def write(self, samples: np.ndarray) -> int:
+        """Copy as many samples as fit. Producer side only.
+
+        Args:
+            samples: int16 rows shaped ``(samples, channels)``.
+
+        Returns:
+            Number of samples written; the remainder did not fit.
+        """
+        n = min(len(samples), self.free())
+        start = self._write_pos % self._capacity
+        first = min(n, self._capacity - start)
+        self._buffer[start : start + first] = samples[:first]
+        self._buffer[: n - first] = samples[first:n]
+        self._write_pos += n
+        return n
+
+    def peek(self, out: np.ndarray, count: int) -> None:
+        """Copy the next ``count`` samples into ``out`` without consuming them.
+
+        Consumer side only; ``count`` must not exceed ``available()``.
+        """
+        start = self._read_pos % self._capacity
+        first = min(count, self._capacity - start)
+        out[:first] = self._buffer[start : start + first]
+        out[first:count] = self._buffer[: count - first]
+
+    def read(self, out: np.ndarray) -> int:
+        """Copy up to ``len(out)`` samples into ``out``. Consumer side only.
+
+        Returns:
+            Number of samples copied.
+        """
+        n = min(len(out), self.available())
+        self.peek(out, n)
+        self._read_pos += n
+        return n
+
+    def skip(self, count: int) -> None:
+        """Consume ``count`` samples without copying. Consumer side only."""
+        self._read_pos += min(count, self.available())
+
+
+class LoopWakeup:
+    """Wake an event loop from any thread with a single non-blocking pipe write.
+
+    Unlike ``call_soon_threadsafe`` this neither allocates a handle nor takes a
+    lock on the calling thread, so it is safe from real-time audio callbacks.
+    Repeated ``set()`` calls before the loop runs ``callback`` coalesce into one.
+    """
+
+    _loop: asyncio.AbstractEventLoop
+    _callback: Callable[[], None]
+    _read_fd: int
+    _write_fd: int
+    _pending: bool
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+        """Register the pipe with the loop.
+
+        Args:
+            loop: Loop to wake.
+            callback: Run on the loop thread after each wake-up.
+        """
+        self._loop = loop
+        self._callback = callback
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+        self._pending = False
+        loop.add_reader(self._read_fd, self._on_readable)
+
+    @property
+    def pending(self) -> bool:
+        """Whether a wake-up is in flight."""
+        return self._pending
+
+    def set(self) -> None:
+        """Request a wake-up; callable from any thread."""
+        if self._pending:
+            return
+        self._pending = True
+        try:
+            os.write(self._write_fd, b"\0")
+        except BlockingIOError:
+            pass  # Pipe already full of wake-ups
+
+    def close(self) -> None:
+        """Unregister from the loop and close the pipe."""
+        self._loop.remove_reader(self._read_fd)
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+
+    def _on_readable(self) -> None:
+        try:
+            os.read(self._read_fd, 4096)
+        except BlockingIOError:
+            pass
+        # Clear before the callback so a write made meanwhile re-arms the wake-up.
+        self._pending = False
+        self._callback()
@@ -0,0 +1,309 @@
+"""Input sources that feed AudioStream: microphone, files and synthetic signals."""
+
+from __future__ import annotations
+
+import asyncio
+import wave
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import sounddevice as sd
+
+from .device import AudioDevice
+
+if TYPE_CHECKING:
+    from .stream import AudioStream
+
+
+class AudioSource(ABC):
+    """Producer of mono int16 PCM blocks for ``AudioStream``."""
+
+    @property
+    @abstractmethod
+    def sample_rate(self) -> int:
+        """Sample rate of the produced audio in Hz."""
+        ...
+
+    @abstractmethod
+    async def run(self, stream: AudioStream) -> None:
+        """Deliver blocks through ``stream.push()`` until exhausted or cancelled."""
+        ...
+
+
+class SoundDeviceSource(AudioSource):
+    """Live capture from a PortAudio input device."""
+
+    _device: AudioDevice
+    _chunk: int
+
+    def __init__(self, device: AudioDevice | None = None, chunk: int = 512) -> None:
+        """Create microphone source.
+
+        Args:
+            device: Input device. If None, uses AudioDevice.default().
+            chunk: Block size in samples.
+        """
+        self._device = device or AudioDevice.default()
+        self._chunk = chunk
+
+    @property
+    def sample_rate(self) -> int:
+        """Device sample rate in Hz."""
+        return self._device.sample_rate
+
+    async def run(self, stream: AudioStream) -> None:
+        """Capture until cancelled."""
+
+        def _cb(indata: np.ndarray, _frames: int, _time: float, _status: sd.CallbackFlags) -> None:
+            stream.push(indata[:, 0])
+
+        with sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="int16",
+            blocksize=self._chunk,
+            callback=_cb,
+            device=self._device.id,
+        ):
+            while True:
+                await asyncio.sleep(1)  # Keep stream alive
+
+
+class ReplaySource(AudioSource):
+    """Base for sources that generate audio themselves instead of waiting for hardware.
+
+    With ``realtime=True`` blocks are paced by the loop clock like a microphone.
+    Otherwise they are pushed as fast as the subscribers drain them, which makes
+    replays deterministic and faster than real time.
+    """
+
+    _rate: int
+    _chunk: int
+    _realtime: bool
+
+    def __init__(self, sample_rate: int, *, chunk: int = 512, realtime: bool = True) -> None:
+        """Create replay source.
+
+        Args:
+            sample_rate: Sample rate of the produced audio in Hz.
+            chunk: Block size in samples.
+            realtime: Pace blocks at the sample rate instead of as fast as possible.
+        """
+        self._rate = sample_rate
+        self._chunk = chunk
+        self._realtime = realtime
+
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of the produced audio in Hz."""
+        return self._rate
+
+    @abstractmethod
+    def _blocks(self) -> Iterator[np.ndarray]:
+        """Yield int16 blocks of ``chunk`` samples (the last one may be shorter)."""
+        ...
+
+    async def run(self, stream: AudioStream) -> None:
+        """Push every block, then return."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        sent = 0
+        for block in self._blocks():
+            stream.push(block)
+            sent += len(block)
+            if self._realtime:
+                await asyncio.sleep(max(0.0, start + sent / self._rate - loop.time()))
+            else:
+                await stream.drain()
+
+
+class FileSource(ReplaySource):
+    """Replay a WAV file or headerless little-endian int16 PCM file."""
+
+    _path: Path
+    _loop: bool
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        sample_rate: int | None = None,
+        chunk: int = 512,
+        realtime: bool = True,
+        loop: bool = False,
+    ) -> None:
+        """Open file source.
+
+        Args:
+            path: ``.wav`` file, or raw mono int16 PCM for any other suffix.
+            sample_rate: Rate of raw PCM files; ignored for WAV.
+            chunk: Block size in samples.
+            realtime: Pace blocks at the sample rate instead of as fast as possible.
+            loop: Restart from the beginning when the file ends.
+
+        Raises:
+            ValueError: If a raw file has no sample rate or the WAV is not 16-bit.
+        """
+        self._path = Path(path)
+        self._loop = loop
+        if self._path.suffix.lower() == ".wav":
+            with wave.open(str(self._path), "rb") as wav_file:
+                if wav_file.getsampwidth() != 2:
+                    raise ValueError(f"Unsupported sample width: {wav_file.getsampwidth()}")
+                sample_rate = wav_file.getframerate()
+        elif sample_rate is None:
+            raise ValueError("sample_rate is required for raw PCM files")
+        super().__init__(sample_rate, chunk=chunk, realtime=realtime)
+
+    def _blocks(self) -> Iterator[np.ndarray]:
+        while True:
+            if self._path.suffix.lower() == ".wav":
+                yield from self._wav_blocks()
+            else:
+                yield from self._raw_blocks()
+            if not self._loop:
+                return
+
+    def _wav_blocks(self) -> Iterator[np.ndarray]:
+        with wave.open(str(self._path), "rb") as wav_file:
+            channels = wav_file.getnchannels()
+            while data := wav_file.readframes(self._chunk):
+                block = np.frombuffer(data, dtype="<i2")
+                if channels > 1:
+                    block = block.reshape(-1, channels).mean(axis=1).astype(np.int16)
+                yield block
+
+    def _raw_blocks(self) -> Iterator[np.ndarray]:
+        with open(self._path, "rb") as raw_file:
+            while data := raw_file.read(self._chunk * 2):
+                yield np.frombuffer(data[: len(data) // 2 * 2], dtype="<i2")
+
+
+class SyntheticSource(ReplaySource):
+    """Generate sine tones plus white noise."""
+
+    _tones: Sequence[tuple[float, float]]
+    _noise: float
+    _duration: float | None
+    _seed: int
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 16_000,
+        tones: Sequence[tuple[float, float]] = ((440.0, 0.1),),
+        noise: float = 0.0,
+        duration: float | None = None,
+        seed: int = 0,
+        chunk: int = 512,
+        realtime: bool = True,
+    ) -> None:
+        """Create synthetic source.
+
+        Args:
+            sample_rate: Output rate in Hz.
+            tones: ``(frequency Hz, amplitude 0..1 of full scale)`` pairs.
+            noise: White-noise standard deviation as a fraction of full scale.
+            duration: Seconds to generate; None runs until cancelled.
+            seed: Noise generator seed, so runs are reproducible.
+            chunk: Block size in samples.
+            realtime: Pace blocks at the sample rate instead of as fast as possible.
+        """
+        super().__init__(sample_rate, chunk=chunk, realtime=realtime)
+        self._tones = tones
+        self._noise = noise
+        self._duration = duration
+        self._seed = seed
+
+    def _blocks(self) -> Iterator[np.ndarray]:
+        rng = np.random.default_rng(self._seed)
+        total = None if self._duration is None else int(self._duration * self._rate)
+        position = 0
+        while total is None or position < total:
+            size = self._chunk if total is None else min(self._chunk, total - position)
+            t = (position + np.arange(size)) / self._rate
+            signal = np.zeros(size)
+            for freq, amplitude in self._tones:
+                signal += amplitude * np.sin(2 * np.pi * freq * t)
+            if self._noise:
+                signal += rng.normal(0.0, self._noise, size)
+            yield np.clip(signal * 32767, -32768, 32767).astype(np.int16)
+            position += size
+
+
+class CorpusSource(ReplaySource):
+    """Replay many PCM files back to back through read-only memory maps.
+
+    Files are never loaded into memory, so hour-long corpora can be replayed
+    on small machines. ``segments`` records where each file starts in the
+    stream, for scoring detections against ground truth.
+    """
+
+    _clips: list[np.ndarray]
+    _gap: int
+    segments: list[tuple[Path, int]]
+
+    def __init__(
+        self,
+        paths: Sequence[str | Path],
+        *,
+        sample_rate: int,
+        gap: float = 0.0,
+        chunk: int = 512,
+        realtime: bool = False,
+    ) -> None:
+        """Map corpus files.
+
+        Args:
+            paths: Mono 16-bit WAV or raw int16 PCM files, all at ``sample_rate``.
+            sample_rate: Rate shared by every file.
+            gap: Seconds of silence inserted between files.
+            chunk: Block size in samples.
+            realtime: Pace blocks at the sample rate instead of as fast as possible.
+
+        Raises:
+            ValueError: If a WAV file is not mono 16-bit PCM at ``sample_rate``.
+        """
+        super().__init__(sample_rate, chunk=chunk, realtime=realtime)
+        self._gap = int(gap * sample_rate)
+        self._clips = [self._map(Path(p)) for p in paths]
+        self.segments = []
+        position = 0
+        for path, clip in zip(paths, self._clips):
+            self.segments.append((Path(path), position))
+            position += len(clip) + self._gap
+
+    def _map(self, path: Path) -> np.ndarray:
+        if path.suffix.lower() != ".wav":
+            return np.memmap(path, dtype="<i2", mode="r")
+        with wave.open(str(path), "rb") as wav_file:
+            if (wav_file.getnchannels(), wav_file.getsampwidth()) != (1, 2):
+                raise ValueError(f"{path}: corpus WAV files must be mono 16-bit")
+            if wav_file.getframerate() != self._rate:
+                raise ValueError(f"{path}: expected {self._rate} Hz")
+            frames = wav_file.getnframes()
+        return np.memmap(path, dtype="<i2", mode="r", offset=_wav_data_offset(path), shape=frames)
+
+    def _blocks(self) -> Iterator[np.ndarray]:
+        silence = np.zeros(self._chunk, dtype=np.int16)
+        for clip in self._clips:
+            for start in range(0, len(clip), self._chunk):
+                yield clip[start : start + self._chunk]
+            for start in range(0, self._gap, self._chunk):
+                yield silence[: min(self._chunk, self._gap - start)]
+
+
+def _wav_data_offset(path: Path) -> int:
+    """Byte offset of the ``data`` chunk payload in a RIFF/WAVE file."""
+    with open(path, "rb") as f:
+        if f.read(12)[8:12] != b"WAVE":
+            raise ValueError(f"{path}: not a WAVE file")
+        while header := f.read(8):
+            size = int.from_bytes(header[4:8], "little")
+            if header[:4] == b"data":
+                return f.tell()
+            f.seek(size + (size & 1), 1)
+    raise ValueError(f"{path}: no data chunk")
@@ -1,76 +1,359 @@
 import asyncio
+import math
+import time
 from collections.abc import AsyncIterator
+from dataclasses import dataclass
 
 import numpy as np
-import sounddevice as sd
 
+from ..settings import settings
+from ..tracing import tracer
+from .aec import EchoCanceller, EchoReference
+from .clock import CaptureClock
 from .device import AudioDevice
+from .features import FEATURE_DTYPE, compute_features
+from .resample import StreamingResampler
+from .ring import AudioRingBuffer, LoopWakeup, RingReader
+from .sources import AudioSource, SoundDeviceSource
+
+
+@dataclass(slots=True)
+class _RateTap:
+    """Resampled copy of the capture ring, shared by all subscribers of one rate."""
+
+    source: RingReader
+    resampler: StreamingResampler
+    ring: AudioRingBuffer
+    origin: int  # Capture index of the first resampled sample
+
+    def to_native(self, index: int) -> int:
+        """Capture index matching a sample index of this tap, net of filter delay."""
+        ratio = self.resampler.src_rate / self.resampler.dst_rate
+        # Capture audio the tap was lapped on never reached the resampler
+        return self.origin + self.source.dropped + round((index - self.resampler.delay) * ratio)
+
+    def from_native(self, index: int) -> int:
+        """Tap sample index matching a capture index."""
+        ratio = self.resampler.dst_rate / self.resampler.src_rate
+        offset = index - self.origin - self.source.dropped
+        return round(offset * ratio + self.resampler.delay)
+
+    def pump(self) -> None:
+        """Resample every captured block not yet converted."""
+        while (block := self.source.read()) is not None:
+            self.ring.write(self.resampler.process(block))
+        self.ring.notify()
+
+
+@dataclass(slots=True)
+class _FeatureTap:
+    """Per-block features of the capture ring, shared by all feature subscribers."""
+
+    source: RingReader
+    ring: AudioRingBuffer
+    origin: int  # Capture index of the first block with features
+
+    def pump(self) -> None:
+        """Compute features for every captured block, one batch per contiguous run."""
+        while (blocks := self.source.read_all()) is not None:
+            self.ring.write(compute_features(blocks))
+        self.ring.notify()
+
+
+@dataclass(slots=True)
+class _EchoTap:
+    """Echo-cancelled copy of the raw capture ring, which subscribers read instead."""
+
+    source: RingReader
+    canceller: EchoCanceller
+    reference: EchoReference
+    ring: AudioRingBuffer
+    rate: int
+
+    def pump(self) -> None:
+        """Cancel echo in every captured block, keeping capture indices aligned."""
+        dropped = self.source.dropped
+        while (blocks := self.source.read_all()) is not None:
+            if self.source.dropped != dropped:
+                # Lapped during a stall: fill with silence so indices still match capture
+                self.ring.write(np.zeros(self.source.dropped - dropped, dtype=np.int16))
+                dropped = self.source.dropped
+            mic = blocks.reshape(-1)
+            self.ring.write(self.canceller.process(mic, self.reference.take(len(mic), self.rate)))
 
 
 class AudioStream:
-    """Async microphone reader."""
+    """Async microphone reader.
 
-    _subscribers: list[asyncio.Queue[np.ndarray]]
-    _device: AudioDevice
+    Audio comes from an ``AudioSource``: the microphone by default, or a file or
+    synthetic source for hardware-free replay. The source copies each block into
+    one shared ring buffer and wakes
+    the event loop at most once per batch; every subscriber reads the same memory
+    through its own cursor. Subscribers asking for another sample rate share one
+    resampled ring per rate, converted on the event loop once per batch.
+    Per-block features (RMS, peak, dBFS, zero-crossing rate) are likewise
+    computed once per batch and published on their own ring.
+
+    The ring doubles as a pre-roll history: subscribers may start from any
+    capture index still retained (``oldest`` onwards), e.g. where a wake word
+    ended, and read the backlog as fast as they can.
+
+    With echo cancellation enabled the source writes into a separate raw ring,
+    and each batch is passed through an ``EchoCanceller`` on the event loop
+    before any subscriber, tap or feature sees it. The reference is whatever
+    players created with ``echo_reference`` actually sent to the speaker.
+    """
+
+    _ring: AudioRingBuffer
+    _capture: AudioRingBuffer
+    _echo: _EchoTap | None
+    _taps: dict[int, _RateTap]
+    _features: _FeatureTap | None
+    _buffer_blocks: int
+    _source: AudioSource
     _rate: int
     _chunk: int
+    _batch: int
+    _wakeup: LoopWakeup | None
+    _notified: int
+    _clock: CaptureClock
 
     def __init__(
         self,
         *,
         device: AudioDevice | None = None,
+        source: AudioSource | None = None,
         chunk: int = 512,
+        buffer_blocks: int = 200,
+        batch: int = 1,
+        echo_cancellation: bool = False,
     ) -> None:
         """Create stream.
 
         Args:
             device: Input device. If None, uses AudioDevice.default().
+            source: Audio source. If None, captures from ``device``.
             chunk: Block size in samples.
+            buffer_blocks: Ring depth in blocks; slower subscribers lose the oldest audio.
+            batch: Minimum number of new blocks before the event loop is woken.
+            echo_cancellation: Remove the echo of ``echo_reference`` playback.
         """
-        self._device = device or AudioDevice.default()
-        self._rate = self._device.sample_rate
+        self._source = source or SoundDeviceSource(device, chunk)
+        self._rate = self._source.sample_rate
         self._chunk = chunk
-        self._subscribers = []
+        self._batch = batch
+        self._buffer_blocks = buffer_blocks
+        self._ring = AudioRingBuffer(chunk * buffer_blocks, chunk)
+        self._capture = self._ring
+        self._echo = None
+        if echo_cancellation:
+            self._capture = AudioRingBuffer(chunk * buffer_blocks, chunk)
+            canceller = EchoCanceller(
+                self._rate,
+                block=math.gcd(chunk, 256),
+                filter_length=settings.AEC_FILTER_LENGTH,
+                max_delay=settings.AEC_MAX_DELAY,
+                step=settings.AEC_STEP,
+            )
+            self._echo = _EchoTap(
+                source=self._capture.reader(),
+                canceller=canceller,
+                reference=EchoReference(),
+                ring=self._ring,
+                rate=self._rate,
+            )
+        self._taps = {}
+        self._features = None
+        self._wakeup = None
+        self._notified = 0
+        self._clock = CaptureClock(
+            self._rate,
+            warmup=settings.CAPTURE_CLOCK_WARMUP,
+            max_drift=settings.CAPTURE_MAX_DRIFT_PPM * 1e-6,
+        )
+
+    @property
+    def echo_reference(self) -> EchoReference | None:
+        """Where players report what they play, if echo cancellation is enabled."""
+        return self._echo.reference if self._echo is not None else None
+
+    @property
+    def clock(self) -> CaptureClock:
+        """Drift estimate of the capture device against the host clock."""
+        return self._clock
+
+    @property
+    def oldest(self) -> int:
+        """Oldest capture sample index a new subscriber can start from."""
+        return self._ring.oldest
+
+    def subscribe(
+        self, rate: int | None = None, start: int | None = None, block: int | None = None
+    ) -> RingReader:
+        """Subscribe to audio frames.
 
-    def subscribe(self, maxsize: int = 200) -> "asyncio.Queue[np.ndarray]":
-        """Subscribe to audio frames."""
-        queue: asyncio.Queue[np.ndarray] = asyncio.Queue(maxsize=maxsize)
-        self._subscribers.append(queue)
-        return queue
+        Args:
+            rate: Sample rate the subscriber wants. Defaults to the device rate.
+            start: Capture sample index to start from, clamped to the retained
+                history. Defaults to the newest audio.
+            block: Samples per read, e.g. a codec frame. Defaults to one capture
+                block at ``rate``.
+
+        Returns:
+            Reader positioned at ``start`` or the newest audio. Call ``unsubscribe()`` when done.
+        """
+        if rate is None or rate == self._rate:
+            return self._ring.reader(block, start=start)
+        tap = self._taps.get(rate)
+        if tap is None:
+            # A new tap resamples the retained history right away
+            tap_block = max(1, self._chunk * rate // self._rate)
+            source = self._ring.reader(start=start)
+            tap = _RateTap(
+                source=source,
+                resampler=StreamingResampler(self._rate, rate),
+                ring=AudioRingBuffer(tap_block * self._buffer_blocks, tap_block),
+                origin=source.position,
+            )
+            self._taps[rate] = tap
+            if start is not None:
+                tap.pump()
+                return tap.ring.reader(block, start=0)
+        position = None if start is None else max(0, tap.from_native(start))
+        return tap.ring.reader(block, start=position)
+
+    def subscribe_features(self, start: int | None = None) -> RingReader:
+        """Subscribe to per-block features without receiving PCM.
+
+        Each read yields one ``FEATURE_DTYPE`` record per captured block of
+        ``chunk`` samples; the reader's position therefore counts blocks.
+
+        Args:
+            start: Capture sample index to start from, as for ``subscribe()``.
+
+        Returns:
+            Reader positioned at ``start`` or the newest block. Call ``unsubscribe()`` when done.
+        """
+        if self._features is None:
+            source = self._ring.reader(start=start)
+            self._features = _FeatureTap(
+                source=source,
+                ring=AudioRingBuffer(self._buffer_blocks, 1, dtype=FEATURE_DTYPE),
+                origin=source.position,
+            )
+            if start is not None:
+                self._features.pump()
+                return self._features.ring.reader(start=0)
+        tap = self._features
+        if start is None:
+            return tap.ring.reader()
+        offset = start - tap.origin - tap.source.dropped
+        return tap.ring.reader(start=max(0, offset // self._chunk))
+
+    def native_index(self, index: int, rate: int | None = None) -> int:
+        """Convert a sample index of a ``rate`` subscription to a capture sample index.
+
+        Args:
+            index: Sample index as counted by a reader of ``subscribe(rate)``.
+            rate: Rate of that subscription. Defaults to the device rate.
+
+        Returns:
+            Matching capture sample index, usable as ``start`` for any subscription.
+        """
+        if rate is None or rate == self._rate:
+            return index
+        return self._taps[rate].to_native(index)
+
+    def feature_native_index(self, position: int) -> int:
+        """Convert a block position of ``subscribe_features()`` to a capture sample index.
+
+        Args:
+            position: Block index as counted by a features reader.
+
+        Returns:
+            Capture sample index where that block starts.
+        """
+        assert self._features is not None, "no feature subscription"
+        tap = self._features
+        return tap.origin + tap.source.dropped + position * self._chunk
+
+    def unsubscribe(self, reader: RingReader) -> None:
+        """Stop delivering frames to a subscriber."""
+        reader.close()
+
+    def push(self, samples: np.ndarray) -> None:
+        """Write captured samples and wake the loop if a batch is complete.
+
+        Called by the source; safe to call from the PortAudio thread, where it
+        neither locks nor calls into asyncio.
+        """
+        start = tracer.now()
+        self._capture.write(samples)
+        self._clock.observe(self._capture.written, time.monotonic())
+        wakeup = self._wakeup
+        if wakeup is not None and not wakeup.pending:
+            if self._capture.written - self._notified >= self._batch * self._chunk:
+                wakeup.set()
+        tracer.tally("audio.push", start)
+
+    def _attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._wakeup = LoopWakeup(loop, self._notify)
+
+    def _detach(self) -> None:
+        wakeup, self._wakeup = self._wakeup, None
+        if wakeup is not None:
+            wakeup.close()
+
+    def _notify(self) -> None:
+        start = tracer.now()
+        self._notified = self._capture.written
+        if self._echo is not None:
+            self._echo.pump()
+        self._ring.notify()
+        for rate, tap in list(self._taps.items()):
+            if not tap.ring.has_readers:
+                tap.source.close()
+                del self._taps[rate]
+                continue
+            tap.pump()
+        if self._features is not None:
+            if self._features.ring.has_readers:
+                self._features.pump()
+            else:
+                self._features.source.close()
+                self._features = None
+        tracer.tally("audio.notify", start)
+
+    async def drain(self, max_spins: int = 8) -> None:
+        """Yield to the loop until subscribers have read every complete block.
+
+        Used by faster-than-realtime sources as backpressure. The wait is bounded so
+        an idle subscriber cannot stall the source; it simply falls behind.
+
+        Args:
+            max_spins: Maximum number of loop iterations to wait.
+        """
+        for _ in range(max_spins):
+            rings = [self._capture, self._ring, *(tap.ring for tap in self._taps.values())]
+            if self._features is not None:
+                rings.append(self._features.ring)
+            if not any(ring.backlogged for ring in rings):
+                return
+            await asyncio.sleep(0)
 
     async def run(self) -> None:
-        """Run audio stream capturing."""
-        loop = asyncio.get_running_loop()
-
-        def _cb(indata: np.ndarray, _frames: int, _time: float, _status: sd.CallbackFlags) -> None:
-            frame = indata.flatten().copy()
-
-            def _enqueue() -> None:
-                for queue in list(self._subscribers):
-                    try:
-                        queue.put_nowait(frame)
-                    except asyncio.QueueFull:
-                        # Drop oldest frame and add new one
-                        try:
-                            _ = queue.get_nowait()
-                            queue.put_nowait(frame)
-                        except asyncio.QueueEmpty:
-                            pass  # Queue became empty, ignore
-
-            loop.call_soon_threadsafe(_enqueue)
-
-        with sd.InputStream(
-            samplerate=self._rate,
-            channels=1,
-            dtype="int16",
-            blocksize=self._chunk,
-            callback=_cb,
-        ):
-            while True:
-                await asyncio.sleep(1)  # Keep stream alive
-
-    async def frames(self, queue: asyncio.Queue[np.ndarray]) -> AsyncIterator[np.ndarray]:
-        """Iterate over audio frames from queue."""
+        """Run audio stream capturing until the source ends or the task is cancelled."""
+        self._attach(asyncio.get_running_loop())
+        try:
+            await self._source.run(self)
+        finally:
+            self._detach()
+
+    async def frames(self, reader: RingReader) -> AsyncIterator[np.ndarray]:
+        """Iterate over audio frames from a subscription.
+
+        Frames are read-only views into the shared ring; copy them to keep them
+        longer than the ring depth.
+        """
         while True:
-            frame = await queue.get()
-            yield frame
+            yield await reader.get()
@@ -0,0 +1,5 @@
+"""Home Assistant integration."""
+
+from .executor import TOOLS, ActionExecutor, ActionResult
+
+__all__ = ["ActionExecutor", "ActionResult", "TOOLS"]
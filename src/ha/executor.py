@@ -0,0 +1,279 @@
+"""Run a response's function calls against the Home Assistant REST API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from aiohttp import ClientError
+
+from ..http_client import HttpClient
+from ..realtime.types import FunctionCall
+from ..settings import settings
+from ..tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Go into URL paths, so only Home Assistant's own slug syntax is accepted
+_SLUG = re.compile(r"[a-z0-9_]+")
+_ENTITY_ID = re.compile(r"[a-z0-9_]+\.[a-z0-9_]+")
+
+# Tool definitions announced to the Realtime session when Home Assistant is configured
+TOOLS: list[dict[str, Any]] = [
+    {
+        "type": "function",
+        "name": "call_service",
+        "description": "Call a Home Assistant service, e.g. light.turn_off for light.kitchen.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "domain": {"type": "string", "description": "Service domain, e.g. light"},
+                "service": {"type": "string", "description": "Service, e.g. turn_off"},
+                "entity_id": {
+                    "type": ["string", "array"],
+                    "items": {"type": "string"},
+                    "description": "Target entity or entities",
+                },
+                "data": {"type": "object", "description": "Extra service data"},
+            },
+            "required": ["domain", "service"],
+        },
+    },
+    {
+        "type": "function",
+        "name": "get_state",
+        "description": "Read the current state and attributes of a Home Assistant entity.",
+        "parameters": {
+            "type": "object",
+            "properties": {"entity_id": {"type": "string"}},
+            "required": ["entity_id"],
+        },
+    },
+]
+
+
+@dataclass(slots=True, frozen=True)
+class ActionResult:
+    """Outcome of one function call, as sent back in a ``function_call_output`` item."""
+
+    call_id: str
+    output: str  # JSON text for the model
+    ok: bool
+
+
+class ActionExecutor:
+    """Execute the function calls of one response, concurrently where they are independent.
+
+    "Turn off the AC and the lights" arrives as several calls in one response.
+    Calls on different entities run at the same time over the pooled keep-alive
+    connections of ``HttpClient``; calls sharing an entity run in the order the
+    model gave them, so "turn on the light, then dim it" still means that. Each
+    call has its own timeout, and a failing call only fails itself.
+
+    Calls in ``HA_SPECULATIVE_ACTIONS`` may be started with ``speculate()`` as
+    soon as their arguments are streamed, instead of when the response is done.
+    They run even if the response is then cancelled, so only safe, idempotent
+    actions belong there. Speculation tracks one response at a time.
+    """
+
+    _base_url: str
+    _token: str
+    _timeout: float
+    _speculative: frozenset[str]
+    _tails: dict[str, asyncio.Task[ActionResult]]  # Last call per entity
+    _early: dict[str, asyncio.Task[ActionResult]]  # Speculated calls of this response, by call_id
+    _held: set[str]  # Entities of this response's calls left for execute()
+
+    def __init__(
+        self, base_url: str | None = None, token: str | None = None, timeout: float | None = None
+    ) -> None:
+        """Create executor.
+
+        Args:
+            base_url: Home Assistant URL. Defaults to HA_URL.
+            token: Long-lived access token. Defaults to HA_TOKEN.
+            timeout: Seconds allowed per call. Defaults to HA_CALL_TIMEOUT.
+
+        Raises:
+            RuntimeError: If no token is configured.
+        """
+        token = token or settings.HA_TOKEN
+        if not token:
+            raise RuntimeError("HA_TOKEN not set in environment")
+        self._base_url = (base_url or settings.HA_URL).rstrip("/")
+        self._token = token
+        self._timeout = settings.HA_CALL_TIMEOUT if timeout is None else timeout
+        self._speculative = frozenset(settings.HA_SPECULATIVE_ACTIONS)
+        self._tails = {}
+        self._early = {}
+        self._held = set()
+
+    def speculate(self, call: FunctionCall) -> bool:
+        """Start a call of the current response now, if it is whitelisted.
+
+        A call is held for ``execute()`` instead if it is not in
+        ``HA_SPECULATIVE_ACTIONS``, has invalid arguments, or shares an entity
+        with a held call, which must run first.
+
+        Args:
+            call: Call whose arguments just completed.
+
+        Returns:
+            Whether the call was started.
+        """
+        entities = _entities(call)
+        action = call.name
+        if call.name == "call_service":
+            action = f"{call.arguments.get('domain')}.{call.arguments.get('service')}"
+        if (
+            action not in self._speculative
+            or _problem(call) is not None
+            or not self._held.isdisjoint(entities)
+        ):
+            self._held.update(entities)
+            return False
+        logger.debug("Speculatively executing %s", action)
+        tracer.count("ha.speculative")
+        self._early[call.call_id] = self._submit(call)
+        return True
+
+    async def execute(self, calls: Sequence[FunctionCall]) -> list[ActionResult]:
+        """Run every call and collect the results.
+
+        Calls already started by ``speculate()`` are not run again; their
+        results are awaited like the others.
+
+        Args:
+            calls: Function calls of one response, in the model's order.
+
+        Returns:
+            One result per call, in the same order.
+        """
+        early, self._early = self._early, {}
+        self._held = set()
+        if not calls and not early:
+            return []
+        with tracer.span("ha.batch", calls=len(calls), speculative=len(early)):
+            tasks = [
+                early.pop(call.call_id) if call.call_id in early else self._submit(call)
+                for call in calls
+            ]
+            if early:
+                logger.warning("%d speculated call(s) missing from the response", len(early))
+            return list(await asyncio.gather(*tasks))
+
+    async def abandon(self) -> list[ActionResult]:
+        """End the current response without running its held calls, e.g. when it was cancelled.
+
+        Calls already started by ``speculate()`` cannot be taken back; they are
+        awaited so the next response starts from their outcome.
+
+        Returns:
+            Results of the speculated calls.
+        """
+        early, self._early = self._early, {}
+        self._held = set()
+        if early:
+            logger.info("Response cancelled after %d speculated call(s)", len(early))
+        return list(await asyncio.gather(*early.values()))
+
+    def _submit(self, call: FunctionCall) -> asyncio.Task[ActionResult]:
+        """Start a call once the previous calls on its entities have finished."""
+        entities = _entities(call)
+        after = {self._tails[e] for e in entities if e in self._tails}
+        task = asyncio.create_task(self._run(call, after))
+        for entity in entities:
+            self._tails[entity] = task
+        task.add_done_callback(lambda done: self._release(entities, done))
+        return task
+
+    def _release(self, entities: list[str], task: asyncio.Task[ActionResult]) -> None:
+        for entity in entities:
+            if self._tails.get(entity) is task:
+                del self._tails[entity]
+
+    async def _run(
+        self, call: FunctionCall, after: set[asyncio.Task[ActionResult]]
+    ) -> ActionResult:
+        if after:
+            await asyncio.wait(after)
+        problem = _problem(call)
+        if problem is not None:
+            return _failed(call, problem)
+        try:
+            with tracer.span("ha.call", function=call.name):
+                async with asyncio.timeout(self._timeout):
+                    payload = await self._call(call)
+        except (ClientError, asyncio.TimeoutError, ValueError) as e:
+            return _failed(call, "timeout" if isinstance(e, asyncio.TimeoutError) else str(e))
+        return ActionResult(call.call_id, json.dumps(payload, ensure_ascii=False), ok=True)
+
+    async def _call(self, call: FunctionCall) -> object:
+        """Send a call that passed ``_problem()``."""
+        args = call.arguments
+        headers = {"Authorization": f"Bearer {self._token}"}
+        session = HttpClient.session()
+        if call.name == "call_service":
+            data = dict(args.get("data") or {})
+            if "entity_id" in args:
+                data["entity_id"] = args["entity_id"]
+            url = f"{self._base_url}/api/services/{args['domain']}/{args['service']}"
+            async with session.post(url, headers=headers, json=data) as response:
+                response.raise_for_status()
+                return await response.json()
+        url = f"{self._base_url}/api/states/{args['entity_id']}"
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+def _entities(call: FunctionCall) -> list[str]:
+    """Entities a call touches; calls without one never wait for others."""
+    entity = call.arguments.get("entity_id")
+    data = call.arguments.get("data")
+    if entity is None and isinstance(data, dict):
+        entity = data.get("entity_id")
+    if isinstance(entity, str):
+        return [entity]
+    if isinstance(entity, list):
+        return [e for e in entity if isinstance(e, str)]
+    return []
+
+
+def _problem(call: FunctionCall) -> str | None:
+    """Why the model's arguments cannot be sent, or None if they can."""
+    args = call.arguments
+    if call.name == "call_service":
+        if not isinstance(args.get("domain"), str) or not isinstance(args.get("service"), str):
+            return "call_service needs domain and service strings"
+        if not _SLUG.fullmatch(args["domain"]) or not _SLUG.fullmatch(args["service"]):
+            return "domain and service must be lowercase letters, digits and underscores"
+        entity = args.get("entity_id")
+        if entity is not None and not (
+            isinstance(entity, str)
+            or (isinstance(entity, list) and all(isinstance(e, str) for e in entity))
+        ):
+            return "entity_id must be a string or a list of strings"
+        if any(not _ENTITY_ID.fullmatch(e) for e in _entities(call)):
+            return "entity_id must look like domain.object_id"
+        if args.get("data") is not None and not isinstance(args["data"], dict):
+            return "data must be an object"
+        return None
+    if call.name == "get_state":
+        if not isinstance(args.get("entity_id"), str):
+            return "get_state needs an entity_id string"
+        if not _ENTITY_ID.fullmatch(args["entity_id"]):
+            return "entity_id must look like domain.object_id"
+        return None
+    return f"Unknown function: {call.name}"
+
+
+def _failed(call: FunctionCall, reason: str) -> ActionResult:
+    logger.warning("Home Assistant call %s failed: %s", call.name, reason)
+    tracer.count("ha.errors")
+    return ActionResult(call.call_id, json.dumps({"error": reason}), ok=False)
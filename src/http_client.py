@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from .settings import settings
+
+
+class HttpClient:
+    """Process-wide pooled HTTP client.
+
+    One ``aiohttp.ClientSession`` is shared by every control-plane request so
+    keep-alive connections, TLS sessions and DNS lookups are reused across turns.
+    aiohttp speaks HTTP/1.1 only; reuse comes from keep-alive pooling. The
+    application owns its lifetime and must ``close()`` it on shutdown.
+    """
+
+    _session: ClientSession | None = None
+    _loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def session(cls) -> ClientSession:
+        """Return the shared session, creating it on first use.
+
+        Must be called from a running event loop. A session left over from a
+        closed loop is replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._session is None or cls._session.closed or cls._loop is not loop:
+            connector = TCPConnector(
+                limit=settings.HTTP_POOL_LIMIT,
+                ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            )
+            timeout = ClientTimeout(
+                total=settings.HTTP_TIMEOUT, sock_connect=settings.HTTP_CONNECT_TIMEOUT
+            )
+            cls._session = ClientSession(connector=connector, timeout=timeout)
+            cls._loop = loop
+        return cls._session
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close pooled connections. The next ``session()`` call opens a new pool."""
+        session, cls._session, cls._loop = cls._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
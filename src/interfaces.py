@@ -1,12 +1,26 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class WakeEvent:
+    """A detected wake word."""
+
+    keyword: str  # Which keyword fired
+    sample_index: int  # Capture sample index where it ended
 
 
 class WakeWordDetector(ABC):
     """Wake word detector interface."""
 
     @abstractmethod
-    async def wait_for_wake(self) -> None:
-        """Wait for wake word detection."""
+    async def wait_for_wake(self) -> WakeEvent:
+        """Wait for wake word detection.
+
+        Returns:
+            The keyword and the capture sample index (see ``AudioStream.native_index``)
+            where it ended; pass the index as ``start`` to pick up speech that follows it.
+        """
         ...
 
 
@@ -0,0 +1,119 @@
+"""Queued, rate-limited logging so console I/O never blocks audio or the event loop."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
+
+from .settings import settings
+from .tracing import tracer
+
+FORMAT = "%(asctime)s %(levelname)-7s [%(name)s] %(message)s"
+
+_listener: QueueListener | None = None
+_handler: QueueHandler | None = None
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per logger; drops records below WARNING once a module is too chatty.
+
+    The next record that gets through carries the number of records dropped
+    since the previous one, so suppression is visible in the log.
+    """
+
+    _rate: float
+    _burst: float
+    _buckets: dict[str, tuple[float, float, int]]  # name -> (tokens, last refill, dropped)
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Create filter.
+
+        Args:
+            rate: Sustained records per second allowed per logger.
+            burst: Records a quiet logger may emit back to back.
+        """
+        super().__init__()
+        self._rate = rate
+        self._burst = float(burst)
+        self._buckets = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Whether ``record`` is within its logger's budget."""
+        if record.levelno >= logging.WARNING:
+            return True
+        now = time.monotonic()
+        tokens, last, dropped = self._buckets.get(record.name, (self._burst, now, 0))
+        tokens = min(self._burst, tokens + (now - last) * self._rate)
+        if tokens < 1.0:
+            self._buckets[record.name] = (tokens, now, dropped + 1)
+            tracer.count("log.suppressed")
+            return False
+        if dropped:
+            record.msg = f"{record.getMessage()} ({dropped} earlier messages suppressed)"
+            record.args = None
+        self._buckets[record.name] = (tokens - 1.0, now, 0)
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records when the writer thread falls behind."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue without blocking; a full queue loses the record."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            tracer.count("log.dropped")
+
+
+def setup_logging(
+    level: str | int | None = None,
+    stream: TextIO | None = None,
+    *,
+    rate: float | None = None,
+    burst: int | None = None,
+) -> None:
+    """Route all logging through a bounded queue written by a background thread.
+
+    Callers only format the record and enqueue it; the write to the console or
+    journald pipe happens on the listener thread. Idempotent: a second call
+    replaces the previous configuration.
+
+    Args:
+        level: Root log level. Defaults to LOG_LEVEL.
+        stream: Destination. Defaults to ``sys.stderr``.
+        rate: Records per second per logger below WARNING. Defaults to LOG_RATE.
+        burst: Burst allowance per logger. Defaults to LOG_BURST.
+    """
+    global _listener, _handler
+    shutdown_logging()
+    records: queue.Queue[logging.LogRecord] = queue.Queue(settings.LOG_QUEUE_SIZE)
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(logging.Formatter(FORMAT))
+    _handler = _DroppingQueueHandler(records)
+    _handler.addFilter(
+        RateLimitFilter(
+            settings.LOG_RATE if rate is None else rate,
+            settings.LOG_BURST if burst is None else burst,
+        )
+    )
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL if level is None else level)
+    root.addHandler(_handler)
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Write every queued record and stop the writer thread."""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()  # Drains the queue before returning
+        _listener = None
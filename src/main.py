@@ -1,67 +1,184 @@
 import asyncio
+import logging
 
-from src.audio import AudioStream
-from src.realtime.realtime import RealtimeSessionManager
+import numpy as np
+
+from src.audio import AudioPlayer, AudioStream, ClipCache, NoiseSampler
+from src.ha import ActionExecutor
+from src.http_client import HttpClient
+from src.interfaces import WakeWordDetector
+from src.log import setup_logging, shutdown_logging
+from src.realtime.events import FunctionCallReady, ResponseDone
+from src.realtime.realtime import RealtimeSession, RealtimeSessionManager
+from src.settings import settings
+from src.tracing import tracer
 from src.wake.porcupine_wake import PorcupineWakeWordDetector
 
+logger = logging.getLogger(__name__)
+
+# Running run_actions() tasks; the event loop only keeps weak references to tasks
+_action_tasks: set[asyncio.Task[None]] = set()
+
+
+async def run_actions(session: RealtimeSession, executor: ActionExecutor) -> None:
+    """Execute the function calls of each response and hand the results back.
+
+    Whitelisted calls start as soon as their arguments are complete, while the
+    model is still generating; the rest start when the response is done, unless
+    it was cancelled. Ends when the session disconnects.
+    """
+    async for event in session.events():
+        if isinstance(event, FunctionCallReady):
+            executor.speculate(event.call)
+        elif isinstance(event, ResponseDone) and event.status == "cancelled":
+            # Barge-in: the user no longer wants these; only wait for what already started
+            await executor.abandon()
+        elif isinstance(event, ResponseDone):
+            if event.function_calls:
+                logger.info("Executing %d function call(s)", len(event.function_calls))
+            results = await executor.execute(event.function_calls)
+            if results:
+                session.send_function_outputs(results)
+
+
+def _actions_done(task: asyncio.Task[None]) -> None:
+    """Forget a finished run_actions() task and log why it stopped, if it failed."""
+    _action_tasks.discard(task)
+    if not task.cancelled() and (error := task.exception()) is not None:
+        logger.error("Function call handling stopped: %r", error, exc_info=error)
+
+
+async def run_cycle(
+    stream: AudioStream,
+    wake_detector: WakeWordDetector,
+    player: AudioPlayer | None = None,
+    noise: NoiseSampler | None = None,
+    earcon: np.ndarray | None = None,
+    executor: ActionExecutor | None = None,
+) -> RealtimeSession:
+    """Run one wake → response cycle.
+
+    Args:
+        stream: Live audio stream.
+        wake_detector: Detector to wait on.
+        player: Output for response audio. If None, plays on the default device.
+        noise: Enables local endpointing; if None, the server VAD ends the turn.
+        earcon: Clip acknowledging the wake word, played on ``player`` before
+            the session is even requested.
+        executor: Runs the function calls of the responses against Home Assistant.
+
+    Returns:
+        The session of this cycle; it stays connected until the next cycle replaces it.
+    """
+    # Wake word detection
+    logger.info("Waiting for the wake word...")
+    wake = await wake_detector.wait_for_wake()
+    if earcon is not None and player is not None:
+        await player.play_clip(earcon)
+    logger.info("Wake word detected: %s", wake.keyword)
+
+    # Create Realtime API session; audio since the wake word comes from the pre-roll
+    session = await RealtimeSessionManager.get_session(stream, player, noise)
+    await session.connect(audio_enabled=True, start=wake.sample_index)
+
+    # Start the audio player
+    await session._player.start()
+
+    # Start streaming audio player
+    async def stream_audio_player() -> None:
+        """Stream audio from session to player."""
+        try:
+            async for audio_chunk in session.get_audio_stream():
+                await session._player.play_audio(audio_chunk)
+        except Exception as e:
+            logger.info("Audio streaming ended: %s", e)
+
+    # Start audio streaming task
+    asyncio.create_task(stream_audio_player())
+    if executor is not None:
+        actions = asyncio.create_task(run_actions(session, executor))
+        _action_tasks.add(actions)
+        actions.add_done_callback(_actions_done)
+
+    # Wait for user speech to stop before proceeding to next wake word
+    await session.wait_for_speech_stopped()
+    return session
+
 
 async def main() -> None:
     """Main entry point."""
+    setup_logging()
+
     # Initialize components
-    stream = AudioStream()
-    wake_detector = PorcupineWakeWordDetector(stream)
+    stream = AudioStream(echo_cancellation=settings.AEC_ENABLED)
+    needs_noise = settings.REALTIME_LOCAL_ENDPOINTING or settings.WAKE_GATE_ENABLED
+    noise = NoiseSampler(stream) if needs_noise else None
+    endpointing = noise if settings.REALTIME_LOCAL_ENDPOINTING else None
+    wake_detector = PorcupineWakeWordDetector(
+        stream, gate=noise if settings.WAKE_GATE_ENABLED else None
+    )
+
+    # One player for every session, already running when an earcon must play
+    player = AudioPlayer(reference=stream.echo_reference)
+    earcon = None
+    if settings.WAKE_EARCON_PATH is not None:
+        clips = ClipCache(
+            settings.CLIP_CACHE_DIR,
+            max_bytes=settings.CLIP_CACHE_MAX_BYTES,
+            memory_bytes=settings.CLIP_MEMORY_BYTES,
+        )
+        clips.add("wake", settings.WAKE_EARCON_PATH)
+        earcon = clips.get("wake")
+
+    executor = ActionExecutor() if settings.HA_TOKEN else None
 
     # Start background tasks
+    await player.start()
     stream_task = asyncio.create_task(stream.run())
+    noise_task = asyncio.create_task(noise.start()) if noise is not None else None
+    RealtimeSessionManager.start_standby(stream, noise=endpointing)
+    export_task = None
+    if settings.TRACE_EXPORT_DIR is not None:
+        export_task = asyncio.create_task(
+            tracer.run_exporter(settings.TRACE_EXPORT_DIR, settings.TRACE_EXPORT_INTERVAL)
+        )
 
     try:
         while True:
-            # Wake word detection
-            print("--- [Realtime] Starting a new cycle ---")
-            print("[Realtime] Waiting for the wake word...")
-            await wake_detector.wait_for_wake()
-            print("[Realtime] Wake word detected!")
-
-            # Create Realtime API session
-            session = await RealtimeSessionManager.get_session(stream)
-            await session.connect(audio_enabled=True)
-
-            # Start the audio player
-            await session._player.start()
-
-            # Start streaming audio player
-            async def stream_audio_player() -> None:
-                """Stream audio from session to player."""
-                try:
-                    async for audio_chunk in session.get_audio_stream():
-                        await session._player.play_audio(audio_chunk)
-                except Exception as e:
-                    print(f"Audio streaming ended: {e}")
-
-            # Start audio streaming task
-            asyncio.create_task(stream_audio_player())
-
-            # Wait for user speech to stop before proceeding to next wake word
-            await session.wait_for_speech_stopped()
+            logger.info("--- Starting a new cycle ---")
+            await run_cycle(
+                stream, wake_detector, player, endpointing, earcon=earcon, executor=executor
+            )
 
             # Wait for the next wake word
-            print("[Realtime] Wait for the next Wake Word...")
-            print("--- [Realtime] Cycle completed ---")
-            print()
+            logger.info("Wait for the next Wake Word...")
+            logger.info("--- Cycle completed ---")
     except KeyboardInterrupt:
-        print("Shutting down...")
+        logger.info("Shutting down...")
     finally:
         # Clean up background tasks
-        print("Cancelling background tasks...")
+        logger.info("Cancelling background tasks...")
+        await RealtimeSessionManager.stop_standby()
+        await player.stop()
         stream_task.cancel()
+        if noise_task is not None:
+            noise_task.cancel()
+        if export_task is not None:
+            export_task.cancel()  # Writes the export files one last time
 
         # Wait for tasks to complete cancellation
-        try:
-            await stream_task
-        except asyncio.CancelledError:
-            pass
+        for task in (stream_task, export_task):
+            if task is None:
+                continue
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
-        print("Cleanup complete.")
+        wake_detector.close()
+        await HttpClient.close()
+        logger.info("Cleanup complete.")
+        shutdown_logging()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""Assemble function calls from streamed argument deltas."""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any
+
+from .events import (
+    FunctionCallArgumentsDelta,
+    FunctionCallArgumentsDone,
+    OutputItemAdded,
+    decode,
+)
+from .types import FunctionCall
+
+logger = logging.getLogger(__name__)
+
+# Escape pairs and the characters that change nesting or string state; the rest is skipped
+_STRUCTURE = re.compile(r'\\.|["\\{}\[\]]', re.DOTALL)
+
+
+class ArgumentsParser:
+    """Incremental parser for one streamed JSON object.
+
+    Each delta is scanned once for quotes, escapes and brackets, so the parser
+    knows the object is complete as soon as its closing brace arrives, without
+    re-parsing the text received so far. The text is decoded once, then.
+    """
+
+    _chunks: list[str]
+    _depth: int
+    _in_string: bool
+    _escaped: bool
+    value: dict[str, Any] | None  # Decoded object, once complete
+
+    def __init__(self) -> None:
+        """Start before the opening brace."""
+        self._chunks = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.value = None
+
+    def feed(self, delta: str) -> dict[str, Any] | None:
+        """Add the next piece of the arguments.
+
+        Returns:
+            The decoded object if this delta completed it, otherwise None.
+
+        Raises:
+            ValueError: If the completed text is not a JSON object.
+        """
+        if self.value is not None:
+            return None  # Complete; anything after is trailing whitespace
+        self._chunks.append(delta)
+        position = 0
+        if self._escaped and delta:
+            self._escaped = False
+            position = 1
+        for match in _STRUCTURE.finditer(delta, position):
+            char = match.group()
+            if char[0] == "\\":
+                self._escaped = len(char) == 1  # Lone backslash: escapes the next delta's start
+            elif self._in_string:
+                if char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._complete()
+        return None
+
+    def _complete(self) -> dict[str, Any]:
+        value = decode("".join(self._chunks))
+        if not isinstance(value, dict):
+            raise ValueError("Function call arguments are not a JSON object")
+        self.value = value
+        return value
+
+
+class CallAssembler:
+    """Build ``FunctionCall`` objects from the argument deltas of a response.
+
+    Each call is returned once: by ``feed()`` when the delta closing its
+    arguments arrives, or by ``finish()`` if the deltas did not parse.
+    """
+
+    _names: dict[str, str]
+    _parsers: dict[str, ArgumentsParser]
+
+    def __init__(self) -> None:
+        """Start with no calls in progress."""
+        self._names = {}
+        self._parsers = {}
+
+    def start(self, event: OutputItemAdded) -> None:
+        """Begin tracking a function call item; other items are ignored."""
+        if event.item_type == "function_call":
+            self._names[event.item_id] = event.name
+            self._parsers[event.item_id] = ArgumentsParser()
+
+    def feed(self, event: FunctionCallArgumentsDelta) -> FunctionCall | None:
+        """Add an argument delta.
+
+        Returns:
+            The call, if this delta completed its arguments.
+        """
+        parser = self._parsers.get(event.item_id)
+        if parser is None:
+            return None
+        try:
+            arguments = parser.feed(event.delta)
+        except ValueError as e:
+            logger.warning("Unparsable streamed arguments for %s: %s", event.call_id, e)
+            del self._parsers[event.item_id]  # finish() decodes the complete text instead
+            return None
+        if arguments is None:
+            return None
+        return FunctionCall(self._names.get(event.item_id, ""), arguments, event.call_id)
+
+    def finish(self, event: FunctionCallArgumentsDone) -> FunctionCall | None:
+        """End a call's arguments.
+
+        Returns:
+            The call, unless ``feed()`` already returned it or the arguments are
+            not a JSON object.
+        """
+        name = self._names.pop(event.item_id, event.name)
+        parser = self._parsers.pop(event.item_id, None)
+        if parser is not None and parser.value is not None:
+            return None
+        try:
+            arguments = decode(event.arguments)
+        except ValueError as e:
+            logger.warning("Unparsable arguments for %s: %s", event.call_id, e)
+            return None
+        if not isinstance(arguments, dict):
+            return None
+        return FunctionCall(event.name or name, arguments, event.call_id)
+
+    def reset(self) -> None:
+        """Drop calls in progress, e.g. when their response ended."""
+        self._names.clear()
+        self._parsers.clear()
@@ -0,0 +1,385 @@
+"""Typed Realtime API server events and a dispatcher built once per session."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Self, TypeVar
+
+from .types import ConversationResult, FunctionCall
+
+logger = logging.getLogger(__name__)
+
+decode: Callable[[str | bytes], Any]
+try:
+    import orjson
+
+    decode = orjson.loads
+except ImportError:  # Optional: orjson decodes data channel messages several times faster
+    decode = json.loads
+
+
+@dataclass(slots=True)
+class RealtimeEvent:
+    """Server event; subclasses add typed fields for the events the session acts on.
+
+    Events without a subclass are delivered as plain ``RealtimeEvent`` with the raw
+    payload in ``data``.
+    """
+
+    type: str
+    data: dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        return cls(data["type"], data)
+
+
+@dataclass(slots=True)
+class SpeechStarted(RealtimeEvent):
+    """Server VAD heard the user start speaking."""
+
+    audio_start_ms: int
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        return cls(data["type"], data, data.get("audio_start_ms", 0))
+
+
+@dataclass(slots=True)
+class SpeechStopped(RealtimeEvent):
+    """Server VAD heard the user stop speaking."""
+
+    audio_end_ms: int
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        return cls(data["type"], data, data.get("audio_end_ms", 0))
+
+
+@dataclass(slots=True)
+class TranscriptDelta(RealtimeEvent):
+    """Next piece of the response transcript (audio) or text."""
+
+    response_id: str
+    delta: str
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        return cls(data["type"], data, data.get("response_id", ""), data.get("delta", ""))
+
+
+@dataclass(slots=True)
+class TranscriptDone(RealtimeEvent):
+    """Complete response transcript (audio) or text."""
+
+    response_id: str
+    transcript: str
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        # Text responses carry "text", audio transcripts "transcript"
+        text = data.get("transcript", data.get("text", ""))
+        return cls(data["type"], data, data.get("response_id", ""), text)
+
+
+@dataclass(slots=True)
+class ResponseDone(RealtimeEvent):
+    """The response finished, was cancelled or failed."""
+
+    response_id: str
+    status: str
+    function_calls: list[FunctionCall]
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        response = data.get("response", {})
+        calls = [
+            call
+            for item in response.get("output", [])
+            if item.get("type") == "function_call" and (call := _function_call(item)) is not None
+        ]
+        return cls(data["type"], data, response.get("id", ""), response.get("status", ""), calls)
+
+
+def _function_call(item: dict[str, Any]) -> FunctionCall | None:
+    """Call of a ``response.done`` output item; None if its arguments are not a JSON object.
+
+    Arguments of an ``incomplete`` or ``cancelled`` response can be cut off
+    mid-string. Such a call is dropped so the rest of the event still arrives.
+    """
+    call_id = item.get("call_id", "")
+    try:
+        arguments = decode(item.get("arguments") or "{}")
+    except ValueError as e:
+        logger.warning("Dropping function call %s with malformed arguments: %s", call_id, e)
+        return None
+    if not isinstance(arguments, dict):
+        logger.warning("Dropping function call %s: arguments are not an object", call_id)
+        return None
+    return FunctionCall(name=item.get("name", ""), arguments=arguments, call_id=call_id)
+
+
+@dataclass(slots=True)
+class OutputItemAdded(RealtimeEvent):
+    """The response started a new output item: a message or a function call."""
+
+    response_id: str
+    item_id: str
+    item_type: str
+    name: str  # Function name; empty for messages
+    call_id: str
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        item = data.get("item", {})
+        return cls(
+            data["type"],
+            data,
+            data.get("response_id", ""),
+            item.get("id", ""),
+            item.get("type", ""),
+            item.get("name", ""),
+            item.get("call_id", ""),
+        )
+
+
+@dataclass(slots=True)
+class FunctionCallArgumentsDelta(RealtimeEvent):
+    """Next piece of a function call's JSON arguments."""
+
+    item_id: str
+    call_id: str
+    delta: str
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        return cls(
+            data["type"],
+            data,
+            data.get("item_id", ""),
+            data.get("call_id", ""),
+            data.get("delta", ""),
+        )
+
+
+@dataclass(slots=True)
+class FunctionCallArgumentsDone(RealtimeEvent):
+    """Complete JSON arguments of a function call."""
+
+    item_id: str
+    call_id: str
+    name: str
+    arguments: str
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        return cls(
+            data["type"],
+            data,
+            data.get("item_id", ""),
+            data.get("call_id", ""),
+            data.get("name", ""),
+            data.get("arguments") or "{}",
+        )
+
+
+@dataclass(slots=True)
+class FunctionCallReady(RealtimeEvent):
+    """A function call's arguments are complete, before its response is done.
+
+    Published by the session itself (type ``"function_call.ready"``), not decoded
+    from a server message, so it cannot be routed with ``EventDispatcher.on()``.
+    """
+
+    call: FunctionCall
+
+
+@dataclass(slots=True)
+class OutputAudioStopped(RealtimeEvent):
+    """The server finished sending response audio."""
+
+    response_id: str
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        return cls(data["type"], data, data.get("response_id", ""))
+
+
+@dataclass(slots=True)
+class ErrorEvent(RealtimeEvent):
+    """The server rejected a client event or the session failed."""
+
+    message: str
+    code: str | None
+
+    @classmethod
+    def parse(cls, data: dict[str, Any]) -> Self:
+        """Build the event from a decoded message."""
+        error = data.get("error", {})
+        return cls(data["type"], data, error.get("message", ""), error.get("code"))
+
+
+EVENT_TYPES: dict[str, type[RealtimeEvent]] = {
+    "input_audio_buffer.speech_started": SpeechStarted,
+    "input_audio_buffer.speech_stopped": SpeechStopped,
+    "response.audio_transcript.delta": TranscriptDelta,
+    "response.text.delta": TranscriptDelta,
+    "response.audio_transcript.done": TranscriptDone,
+    "response.text.done": TranscriptDone,
+    "response.output_item.added": OutputItemAdded,
+    "response.function_call_arguments.delta": FunctionCallArgumentsDelta,
+    "response.function_call_arguments.done": FunctionCallArgumentsDone,
+    "response.done": ResponseDone,
+    "output_audio_buffer.stopped": OutputAudioStopped,
+    "error": ErrorEvent,
+}
+
+E = TypeVar("E", bound=RealtimeEvent)
+Handler = Callable[[Any], None]
+
+
+class EventDispatcher:
+    """Decode data channel messages into typed events and route them to handlers.
+
+    Routes are resolved when handlers are registered, so dispatching a message
+    is one decode, one dict lookup and the handler calls.
+    """
+
+    _routes: dict[str, tuple[Callable[[dict[str, Any]], RealtimeEvent], list[Handler]]]
+    _fallback: list[Handler]
+    _listeners: list[Handler]
+
+    def __init__(self) -> None:
+        """Create a dispatcher with a route for every known event type."""
+        self._routes = {name: (cls.parse, []) for name, cls in EVENT_TYPES.items()}
+        self._fallback = []
+        self._listeners = []
+
+    def on(self, event_type: type[E], handler: Callable[[E], None]) -> None:
+        """Call ``handler`` with every event of ``event_type``.
+
+        Args:
+            event_type: Event class. ``RealtimeEvent`` itself matches only events
+                without a typed subclass.
+            handler: Called synchronously from ``dispatch()``.
+        """
+        if event_type is RealtimeEvent:
+            self._fallback.append(handler)
+            return
+        names = [name for name, cls in EVENT_TYPES.items() if cls is event_type]
+        if not names:
+            raise ValueError(f"Unknown event type: {event_type.__name__}")
+        for name in names:
+            self._routes[name][1].append(handler)
+
+    def on_any(self, handler: Handler) -> None:
+        """Call ``handler`` with every event, after its type-specific handlers."""
+        self._listeners.append(handler)
+
+    def dispatch(self, message: str | bytes) -> RealtimeEvent:
+        """Decode one message and call its handlers.
+
+        Raises:
+            ValueError: If the message is not a JSON object with a ``type``.
+        """
+        data = decode(message)
+        try:
+            route = self._routes.get(data["type"])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid event format: missing {e}") from e
+        if route is None:
+            event = RealtimeEvent.parse(data)
+            handlers = self._fallback
+        else:
+            event = route[0](data)
+            handlers = route[1]
+        for handler in handlers:
+            handler(event)
+        for handler in self._listeners:
+            handler(event)
+        return event
+
+
+class TurnAccumulator:
+    """Collect one turn's transcript, audio and function calls into a ``ConversationResult``.
+
+    Deltas and audio frames are appended to lists and joined once when the
+    response is done.
+    """
+
+    _transcript: list[str]
+    _audio: list[bytes]
+    _started: float | None
+    _interrupted: bool
+
+    def __init__(self) -> None:
+        """Start an empty turn."""
+        self._reset()
+
+    def _reset(self) -> None:
+        self._transcript = []
+        self._audio = []
+        self._started = None
+        self._interrupted = False
+
+    def start(self) -> None:
+        """Mark the start of the turn, if not already marked."""
+        if self._started is None:
+            self._started = time.perf_counter()
+
+    def add_text(self, delta: str) -> None:
+        """Append a transcript or text delta."""
+        self._transcript.append(delta)
+
+    def add_audio(self, pcm: bytes) -> None:
+        """Append received response audio."""
+        self._audio.append(pcm)
+
+    @property
+    def has_output(self) -> bool:
+        """Whether any response text or audio has arrived this turn."""
+        return bool(self._transcript or self._audio)
+
+    @property
+    def has_audio(self) -> bool:
+        """Whether any response audio has arrived this turn."""
+        return bool(self._audio)
+
+    def interrupt(self) -> None:
+        """Mark the response as cut short by the user."""
+        self._interrupted = True
+
+    def finish(self, done: ResponseDone, transcript: str | None = None) -> ConversationResult:
+        """Build the result and reset for the next turn.
+
+        Args:
+            done: The ``response.done`` event ending the turn.
+            transcript: Final transcript, if the server sent one; otherwise the
+                deltas are joined.
+        """
+        duration = None
+        if self._started is not None:
+            duration = round((time.perf_counter() - self._started) * 1e3)
+        result = ConversationResult(
+            audio_data=b"".join(self._audio),
+            transcript=transcript if transcript is not None else "".join(self._transcript),
+            function_calls=done.function_calls or None,
+            is_interrupted=self._interrupted or done.status == "cancelled",
+            duration_ms=duration,
+        )
+        self._reset()
+        return result
@@ -1,18 +1,50 @@
+from __future__ import annotations
+
 import asyncio
 import fractions
 import json
+import logging
 import time
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Callable, Sequence
 
 import numpy as np
-from aiohttp import ClientError, ClientSession
+from aiohttp import ClientError
 from aiortc import MediaStreamTrack, RTCPeerConnection
 from av import AudioFrame
 
+from ..audio.endpoint import Endpointer
+from ..audio.noise import NoiseSampler
 from ..audio.player import AudioPlayer
+from ..audio.ring import RingReader
 from ..audio.stream import AudioStream
+from ..ha.executor import TOOLS, ActionResult
+from ..http_client import HttpClient
 from ..interfaces import RealtimeAPIClient
 from ..settings import settings
+from ..tracing import tracer
+from .arguments import CallAssembler
+from .events import (
+    ErrorEvent,
+    EventDispatcher,
+    FunctionCallArgumentsDelta,
+    FunctionCallArgumentsDone,
+    FunctionCallReady,
+    OutputAudioStopped,
+    OutputItemAdded,
+    RealtimeEvent,
+    ResponseDone,
+    SpeechStarted,
+    SpeechStopped,
+    TranscriptDelta,
+    TranscriptDone,
+    TurnAccumulator,
+)
+from .types import ConversationResult, FunctionCall
+
+logger = logging.getLogger(__name__)
+
+OPUS_SAMPLE_RATE = 48_000  # Opus encodes at 48 kHz; resample once in AudioStream, not per track
+FRAME_DURATION_MS = 20  # Audio per uplink frame: one Opus packet
 
 
 class RealtimeSession(RealtimeAPIClient):
@@ -20,28 +52,90 @@ class RealtimeSession(RealtimeAPIClient):
 
     _stream: AudioStream
     _player: AudioPlayer
+    _owns_player: bool
+    _noise: NoiseSampler | None
     _pc: RTCPeerConnection | None
     _dc: Any | None
+    _dc_open: asyncio.Event
+    _endpoint_task: asyncio.Task[None] | None
     _start_time: float
     _audio_track: MediaStreamTrack | None
     _is_recieving: bool = False
     _speech_stopped_event: asyncio.Event
-
-    def __init__(self, stream: AudioStream) -> None:
+    _send_track: AudioStreamTrack | None
+    _audio_enabled: bool
+    _key_expires_at: float | None
+    _dispatcher: EventDispatcher
+    _subscribers: list[asyncio.Queue[RealtimeEvent | None]]
+    _turn: TurnAccumulator
+    _calls: CallAssembler
+    _transcript: str | None
+    _pending_done: ResponseDone | None
+    _last_result: ConversationResult | None
+    _result_ready: asyncio.Event
+    timings: dict[str, float]
+
+    def __init__(
+        self,
+        stream: AudioStream,
+        player: AudioPlayer | None = None,
+        noise: NoiseSampler | None = None,
+    ) -> None:
         """Initialize the Realtime API session.
 
         Args:
             stream: AudioStream instance to read audio frames from.
+            player: Output for response audio. If None, plays on the default device.
+            noise: Threshold source for on-device end-of-utterance detection. If
+                given, server VAD is turned off and the session commits the input
+                buffer itself as soon as local silence is confirmed.
 
         """
         self._stream = stream
-        self._player = AudioPlayer()
+        self._player = player or AudioPlayer(reference=stream.echo_reference)
+        self._owns_player = True
+        self._noise = noise
+        # perf_counter() timestamps of turn milestones, for latency measurement
+        self.timings = {}
         self._pc = None
         self._dc = None
+        self._dc_open = asyncio.Event()
+        self._endpoint_task = None
         self._start_time = 0.0
         self._audio_track = None
+        self._send_track = None
+        self._audio_enabled = True
+        self._key_expires_at = None
         self._speech_stopped_event = asyncio.Event()
-        print("Realtime API session initialized.")
+        self._subscribers = []
+        self._turn = TurnAccumulator()
+        self._calls = CallAssembler()
+        self._transcript = None
+        self._pending_done = None
+        self._last_result = None
+        self._result_ready = asyncio.Event()
+        self._dispatcher = self._build_dispatcher()
+        logger.debug("Realtime API session initialized")
+
+    @property
+    def is_prepared(self) -> bool:
+        """Whether signaling is done and the peer connection is still usable."""
+        return self._pc is not None and self._pc.connectionState not in ("failed", "closed")
+
+    @property
+    def local_endpointing(self) -> bool:
+        """Whether turns end on-device rather than by server VAD."""
+        return self._noise is not None
+
+    @property
+    def key_expires_at(self) -> float | None:
+        """Unix time the ephemeral key used for signaling expires, if reported."""
+        return self._key_expires_at
+
+    @property
+    def last_result(self) -> ConversationResult | None:
+        """Result of the most recently completed turn."""
+        return self._last_result
 
     async def _initialize_api_session(
         self, modalities: list[str] = ["audio", "text"], default_prompt: str = ""
@@ -56,62 +150,108 @@ class RealtimeSession(RealtimeAPIClient):
             str: Ephemeral key for WebRTC connection.
         """
         # Simulate fetching an ephemeral key from OpenAI API
-        print("Fetching ephemeral key...")
+        logger.debug("Fetching ephemeral key...")
         url = settings.REALTIME_API_NEW_SESSION_URL
         headers = {
             "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
             "Content-Type": "application/json",
         }
-        payload = {
+        payload: dict[str, Any] = {
             "model": settings.REALTIME_MODEL,
             "modalities": modalities,
             "instructions": default_prompt,
         }
+        if self.local_endpointing:
+            # The client commits the input buffer and requests the response itself
+            payload["turn_detection"] = None
+        if settings.HA_TOKEN:
+            payload["tools"] = TOOLS
+            payload["tool_choice"] = "auto"
         try:
-            async with ClientSession() as session:
+            session = HttpClient.session()
+            with tracer.span("realtime.session_key"):
                 async with session.post(url, headers=headers, json=payload) as response:
                     response.raise_for_status()
                     data = await response.json()
-                    return str(data["client_secret"]["value"])
-        except ClientError as e:
+            expires_at = data["client_secret"].get("expires_at")
+            self._key_expires_at = float(expires_at) if expires_at else None
+            return str(data["client_secret"]["value"])
+        except (ClientError, asyncio.TimeoutError) as e:
             raise ConnectionError(f"API request failed: {e}") from e
         except KeyError as e:
             raise ValueError(f"Invalid response format: missing {e}") from e
 
-    async def connect(self, audio_enabled: bool) -> None:
-        """Establish WebRTC connection."""
-        print("Connecting to OpenAI")
+    async def connect(self, audio_enabled: bool, start: int | None = None) -> None:
+        """Establish WebRTC connection and start sending microphone audio.
+
+        A session already prepared as a standby only starts its audio track here.
+
+        Args:
+            audio_enabled: Whether to negotiate audio output.
+            start: Capture sample index to send from, e.g. where the wake word
+                ended. The retained backlog is sent faster than real time.
+        """
+        if self.is_prepared and self._audio_enabled != audio_enabled:
+            await self.disconnect()
+        if not self.is_prepared:
+            await self._negotiate(audio_enabled, standby=False, start=start)
+        if self._send_track is not None:
+            self._send_track.activate(start)
+        self._turn.start()
+        self._start_time = time.perf_counter()  # Local endpointing sees no speech_started
+        if self._noise is not None and self._endpoint_task is None:
+            self._endpoint_task = asyncio.create_task(self._endpoint(self._noise, start))
+
+    async def prepare_standby(self, audio_enabled: bool = True) -> None:
+        """Negotiate the connection up to the point of sending audio.
+
+        The outgoing track stays silent (no RTP) until ``connect()`` is called.
+        """
+        await self._negotiate(audio_enabled, standby=True)
+
+    async def _negotiate(
+        self, audio_enabled: bool, standby: bool, start: int | None = None
+    ) -> None:
+        """Fetch an ephemeral key and run the SDP exchange."""
+        logger.info("Connecting to OpenAI")
+        self._audio_enabled = audio_enabled
         modalities = ["audio", "text"] if audio_enabled else ["text"]
         ephemeral_key = await self._initialize_api_session(
             modalities, default_prompt="日本語で答えてください"
         )
-        print(f"Ephemeral key obtained: {ephemeral_key}")
+        self.timings["ephemeral_key"] = time.perf_counter()
+        logger.debug("Ephemeral key obtained")
         self._pc = RTCPeerConnection()
 
         @self._pc.on("track")
         def on_track(track: MediaStreamTrack) -> None:
             if track.kind != "audio":
-                print(f"Unexpected track kind: {track.kind}, ignoring.")
+                logger.warning("Unexpected track kind: %s, ignoring", track.kind)
                 return
 
-            print(f"Received track: {track.kind}")
+            logger.debug("Received track: %s", track.kind)
             self._audio_track = track
 
-        self._pc.addTrack(AudioStreamTrack(self._stream))
+        self._send_track = AudioStreamTrack(self._stream, sample_rate=OPUS_SAMPLE_RATE)
+        if not standby:
+            # Subscribe now so audio spoken during signaling is still sent
+            self._send_track.activate(start)
+        self._pc.addTrack(self._send_track)
 
         self._dc = self._pc.createDataChannel("oai-events")
 
         @self._dc.on("open")
         def on_open() -> None:
-            print("Data channel opened")
+            logger.debug("Data channel opened")
+            self._dc_open.set()
 
         @self._dc.on("message")
         def on_message(message: str) -> None:
-            self._handle_message(message, audio_enabled)
+            self._handle_message(message)
 
         offer = await self._pc.createOffer()
         await self._pc.setLocalDescription(offer)
-        print("Local description set")
+        logger.debug("Local description set")
 
         # Send SDP offer to OpenAI and get answer
         base_url = settings.REALTIME_API_SIGNALING_URL
@@ -123,110 +263,231 @@ class RealtimeSession(RealtimeAPIClient):
         }
 
         try:
-            async with ClientSession() as session:
+            session = HttpClient.session()
+            with tracer.span("realtime.sdp"):
                 async with session.post(url, data=offer.sdp, headers=headers) as response:
                     response.raise_for_status()
                     answer_sdp = await response.text()
 
-                    answer = type(
-                        "RTCSessionDescription", (), {"type": "answer", "sdp": answer_sdp}
-                    )()
+                answer = type("RTCSessionDescription", (), {"type": "answer", "sdp": answer_sdp})()
 
-                    await self._pc.setRemoteDescription(answer)
-                    print("Remote description set successfully")
+                await self._pc.setRemoteDescription(answer)
+            self.timings["sdp_answer"] = time.perf_counter()
+            logger.info("Remote description set successfully")
 
-        except ClientError as e:
+        except (ClientError, asyncio.TimeoutError) as e:
             raise ConnectionError(f"SDP exchange failed: {e}") from e
 
     async def disconnect(self) -> None:
         """Close WebRTC connection and cleanup resources."""
-        print("Disconnecting and cleaning up resources.")
+        logger.debug("Disconnecting and cleaning up resources")
         self._is_recieving = False
-        await self._player.stop()
+        if self._endpoint_task is not None:
+            self._endpoint_task.cancel()
+            self._endpoint_task = None
+        if self._owns_player:
+            await self._player.stop()
         if self._dc is not None:
             self._dc.close()
             self._dc = None
+            self._dc_open.clear()
         if self._pc is not None:
             for sender in self._pc.getSenders():
                 if sender.track and sender.track.kind == "audio":
-                    print(f"Stopping sender track: {sender.track.kind}")
+                    logger.debug("Stopping sender track: %s", sender.track.kind)
                     await sender.stop()
             for receiver in self._pc.getReceivers():
                 if receiver.track and receiver.track.kind == "audio":
-                    print(f"Stopping receiver track: {receiver.track.kind}")
+                    logger.debug("Stopping receiver track: %s", receiver.track.kind)
                     await receiver.stop()
-            _pc = None
-
-    def _handle_message(self, message: str, audio_enabled: bool) -> None:
+            await self._pc.close()
+            self._pc = None
+        if self._send_track is not None:
+            self._send_track.stop()
+            self._send_track = None
+        for queue in self._subscribers:
+            queue.put_nowait(None)  # Ends every events() iterator
+
+    def _build_dispatcher(self) -> EventDispatcher:
+        """Route server events to this session's handlers; built once per session."""
+        dispatcher = EventDispatcher()
+        dispatcher.on(SpeechStarted, self._on_speech_started)
+        dispatcher.on(SpeechStopped, self._on_speech_stopped)
+        dispatcher.on(TranscriptDelta, self._on_delta)
+        dispatcher.on(TranscriptDone, self._on_transcript_done)
+        dispatcher.on(OutputItemAdded, self._calls.start)
+        dispatcher.on(FunctionCallArgumentsDelta, self._on_arguments_delta)
+        dispatcher.on(FunctionCallArgumentsDone, self._on_arguments_done)
+        dispatcher.on(ResponseDone, self._on_response_done)
+        dispatcher.on(OutputAudioStopped, self._on_output_audio_stopped)
+        dispatcher.on(ErrorEvent, self._on_error)
+        dispatcher.on(RealtimeEvent, self._on_unhandled)
+        dispatcher.on_any(self._publish)
+        return dispatcher
+
+    def _handle_message(self, message: str | bytes) -> None:
         """Handle incoming WebRTC data channel messages."""
+        try:
+            self._dispatcher.dispatch(message)
+        except ValueError as e:
+            # Includes JSONDecodeError from either decoder
+            logger.warning("Failed to decode message: %s", e)
+
+    def _elapsed(self) -> float:
+        """Seconds since the user last started speaking."""
+        return time.perf_counter() - self._start_time if self._start_time > 0 else 0
+
+    def _on_speech_started(self, _: SpeechStarted) -> None:
+        # ユーザーの発話開始処理
+        logger.info("%.2fs User speech started", self._elapsed())
+        self._start_time = time.perf_counter()
+        # Reset speech stopped event for new speech
+        self._speech_stopped_event.clear()
+        if self._turn.has_output or self._pending_done is not None:
+            # Barge-in: the user talked over the response
+            self._turn.interrupt()
+            self._finish_turn()
+        self._turn.start()
+        self._result_ready.clear()
+
+    def _on_speech_stopped(self, _: SpeechStopped) -> None:
+        # ユーザーの発話停止処理
+        self.timings["speech_stopped"] = time.perf_counter()
+        logger.info("%.2fs User speech stopped", self._elapsed())
+
+        # Set event to notify speech stopped
+        self._speech_stopped_event.set()
+        self._stop_uplink()
+
+    def _on_delta(self, event: TranscriptDelta) -> None:
+        # delta処理
+        logger.debug("%.2fs Delta: %s", self._elapsed(), event.delta)
+        self._turn.add_text(event.delta)
+
+    def _on_transcript_done(self, event: TranscriptDone) -> None:
+        logger.info("%.2fs Done: %s", self._elapsed(), event.transcript)
+        self._transcript = event.transcript
+
+    def _on_arguments_delta(self, event: FunctionCallArgumentsDelta) -> None:
+        call = self._calls.feed(event)
+        if call is not None:
+            self._publish_call(event, call)
+
+    def _on_arguments_done(self, event: FunctionCallArgumentsDone) -> None:
+        call = self._calls.finish(event)
+        if call is not None:
+            self._publish_call(event, call)
+
+    def _publish_call(self, source: RealtimeEvent, call: FunctionCall) -> None:
+        """Announce a call whose arguments are complete, ahead of ``response.done``."""
+        logger.info("%.2fs Function call ready: %s", self._elapsed(), call.name)
+        self._publish(FunctionCallReady("function_call.ready", source.data, call))
+
+    def _on_response_done(self, event: ResponseDone) -> None:
+        # done処理
+        logger.info("%.2fs Response %s", self._elapsed(), event.status or "done")
+        self._calls.reset()
+        self._pending_done = event
+        # Response audio keeps arriving after generation is done; wait for it to end
+        if not (self._audio_enabled and self._turn.has_audio):
+            self._finish_turn()
+        if not self._audio_enabled:
+            logger.info("%.2fs Disconnecting after text response", self._elapsed())
+            asyncio.create_task(self.disconnect())
+
+    def _on_output_audio_stopped(self, _: OutputAudioStopped) -> None:
+        # 出力オーディオバッファ停止処理
+        logger.info("%.2fs Output audio buffer stopped", self._elapsed())
+        self._is_recieving = False  # Stop receiving audio
+        self._finish_turn()
+
+    def _on_error(self, event: ErrorEvent) -> None:
+        logger.error("Server error (%s): %s", event.code, event.message)
+
+    def _on_unhandled(self, event: RealtimeEvent) -> None:
+        logger.debug("%.2fs Unhandled event type: %s", self._elapsed(), event.type)
+
+    def _publish(self, event: RealtimeEvent) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def _finish_turn(self) -> None:
+        """Turn what the current turn collected into ``last_result``."""
+        done, self._pending_done = self._pending_done, None
+        if done is None:
+            return
+        transcript, self._transcript = self._transcript, None
+        self._last_result = self._turn.finish(done, transcript)
+        self._result_ready.set()
 
-        def handle_user_speech_started(_: dict[str, Any]) -> None:
-            # ユーザーの発話開始処理
-            elapsed = time.perf_counter() - self._start_time if self._start_time > 0 else 0
-            print(f"{elapsed:.2f}s User speech started")
-            self._start_time = time.perf_counter()
-            # Reset speech stopped event for new speech
-            self._speech_stopped_event.clear()
-
-        def handle_user_speech_stopped(_: dict[str, Any]) -> None:
-            # ユーザーの発話停止処理
-            elapsed = time.perf_counter() - self._start_time if self._start_time > 0 else 0
-            print(f"{elapsed:.2f}s User speech stopped")
+    def _stop_uplink(self) -> None:
+        """Stop sending microphone audio, if still connected."""
+        if self._pc is None:
+            return
+        for sender in self._pc.getSenders():
+            if sender.track and sender.track.kind == "audio":
+                logger.debug("Stopping sender track: %s", sender.track.kind)
+                asyncio.create_task(sender.stop())
 
-            # Set event to notify speech stopped
-            self._speech_stopped_event.set()
+    async def _endpoint(self, noise: NoiseSampler, start: int | None) -> None:
+        """Watch the level from ``start`` and end the turn on local silence.
 
-            # Stop sender tracks if already connected
-            if self._pc is None:
-                return
-            for sender in self._pc.getSenders():
-                if sender.track and sender.track.kind == "audio":
-                    print(f"Stopping sender track: {sender.track.kind}")
-                    asyncio.create_task(sender.stop())
-
-        def handle_response_delta(data: dict[str, Any]) -> None:
-            # delta処理
-            elapsed = time.perf_counter() - self._start_time if self._start_time > 0 else 0
-            print(f"{elapsed:.2f}s Delta: {data.get('delta', '')}")
-
-        def handle_response_done(data: dict[str, Any]) -> None:
-            # done処理
-            elapsed = time.perf_counter() - self._start_time if self._start_time > 0 else 0
-            print(f"{elapsed:.2f}s Done: {data.get('transcript', '')}")
-            if not audio_enabled:
-                print(f"{elapsed:.2f}s Disconnecting after text response")
-                asyncio.create_task(self.disconnect())
-
-        def handle_output_audio_buffer_stopped(_: dict[str, Any]) -> None:
-            # 出力オーディオバッファ停止処理
-            elapsed = time.perf_counter() - self._start_time if self._start_time > 0 else 0
-            print(f"{elapsed:.2f}s Output audio buffer stopped")
-            if audio_enabled:
-                print(f"{elapsed:.2f}s Disconnecting after audio playback")
-                # asyncio.create_task(self.disconnect())
-            self._is_recieving = False  # Stop receiving audio
-
-        handlers = {
-            "input_audio_buffer.speech_started": handle_user_speech_started,
-            "input_audio_buffer.speech_stopped": handle_user_speech_stopped,
-            "response.audio_transcript.delta": handle_response_delta,
-            "response.audio_transcript.done": handle_response_done,
-            "response.text.delta": handle_response_delta,
-            "response.done": handle_response_done,
-            "output_audio_buffer.stopped": handle_output_audio_buffer_stopped,
-        }
+        Args:
+            noise: Source of the speech/silence threshold.
+            start: Capture sample index the uplink started from.
+        """
+        endpointer = Endpointer(
+            self._stream._chunk / self._stream._rate,
+            silence=settings.REALTIME_ENDPOINT_SILENCE,
+            min_speech=settings.REALTIME_ENDPOINT_MIN_SPEECH,
+            no_speech=settings.REALTIME_ENDPOINT_NO_SPEECH,
+            max_duration=settings.REALTIME_ENDPOINT_MAX_DURATION,
+        )
+        reader = self._stream.subscribe_features(start=start)
         try:
-            data = json.loads(message)
-            event_type = data.get("type")
-            if event_type in handlers:
-                handlers[event_type](data)
+            async for features in self._stream.frames(reader):
+                if endpointer.update(float(features["rms"][0]), noise.current_threshold()):
+                    break
             else:
-                elapsed = time.perf_counter() - self._start_time if self._start_time > 0 else 0
-                print(f"{elapsed:.2f}s Unhandled event type: {event_type}")
-        except json.JSONDecodeError as e:
-            print(f"Failed to decode JSON message: {e}")
-        except KeyError as e:
-            raise ValueError(f"Invalid response format: missing {e}") from e
+                return  # Stream ended
+        finally:
+            self._stream.unsubscribe(reader)
+
+        self.timings["speech_stopped"] = time.perf_counter()
+        if endpointer.heard_speech:
+            logger.info("Local end of speech")
+        else:
+            logger.info("No speech after the wake word")
+        self._speech_stopped_event.set()
+        self._stop_uplink()
+        if not endpointer.heard_speech:
+            return
+        # RTP and the data channel are not ordered; anything still in flight
+        # after the commit is trailing silence, so losing it is harmless
+        await self._dc_open.wait()
+        self._send_event({"type": "input_audio_buffer.commit"})
+        self._send_event({"type": "response.create"})
+
+    def send_function_outputs(self, results: Sequence[ActionResult]) -> None:
+        """Return executed function calls to the model and ask it to respond to them.
+
+        Args:
+            results: One result per function call of the last response.
+        """
+        for result in results:
+            item = {
+                "type": "function_call_output",
+                "call_id": result.call_id,
+                "output": result.output,
+            }
+            self._send_event({"type": "conversation.item.create", "item": item})
+        if results:
+            self._send_event({"type": "response.create"})
+
+    def _send_event(self, event: dict[str, Any]) -> None:
+        """Send a client event over the data channel."""
+        if self._dc is not None:
+            self._dc.send(json.dumps(event))
 
     async def get_audio_stream(self) -> AsyncIterator[np.ndarray]:
         """Get audio stream from the session.
@@ -243,11 +504,23 @@ class RealtimeSession(RealtimeAPIClient):
                 frame = await self._audio_track.recv()
                 if isinstance(frame, AudioFrame):
                     audio_data = frame.to_ndarray()
+                    if "first_audio_frame" not in self.timings:
+                        self._trace_first_audio()
+                    self._turn.add_audio(audio_data.tobytes())
                     yield audio_data
         except Exception as e:
-            print(f"Audio stream ended: {e}")
+            logger.info("Audio stream ended: %s", e)
             return
 
+    def _trace_first_audio(self) -> None:
+        """Record the first response frame and the wait for it since end of speech."""
+        self.timings["first_audio_frame"] = time.perf_counter()
+        tracer.mark("realtime.first_audio")
+        stopped = self.timings.get("speech_stopped")
+        if stopped is not None:
+            # perf_counter() and perf_counter_ns() share a clock
+            tracer.record("realtime.response_wait", int(stopped * 1e9))
+
     async def wait_for_speech_stopped(self) -> None:
         """Wait for user speech to stop.
         
@@ -255,18 +528,62 @@ class RealtimeSession(RealtimeAPIClient):
         """
         await self._speech_stopped_event.wait()
 
+    async def wait_for_result(self) -> ConversationResult:
+        """Wait until the current turn's response is complete.
+
+        Returns:
+            Transcript, received audio and function calls of the turn.
+        """
+        await self._result_ready.wait()
+        assert self._last_result is not None
+        return self._last_result
+
+    async def events(self) -> AsyncIterator[RealtimeEvent]:
+        """Iterate over server events from now until the session disconnects.
+
+        Each iterator gets every event; events are typed where the session knows
+        them (``SpeechStarted``, ``TranscriptDelta``, ``ResponseDone``, ...) and
+        plain ``RealtimeEvent`` otherwise. A ``FunctionCallReady`` precedes the
+        argument event that completed each function call.
+        """
+        queue: asyncio.Queue[RealtimeEvent | None] = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            self._subscribers.remove(queue)
+
 
 class RealtimeSessionManager:
-    """Singleton manager for Realtime API sessions."""
+    """Singleton manager for Realtime API sessions.
+
+    Optionally keeps pre-negotiated standby sessions so a wake word only has to
+    start the audio track instead of fetching a key and running signaling.
+    """
 
     _current_session: RealtimeSession | None = None
+    _standby: list[tuple[RealtimeSession, float]] = []
+    _standby_task: asyncio.Task[None] | None = None
+    _standby_wakeup: asyncio.Event | None = None
 
     @classmethod
-    async def get_session(cls, stream: AudioStream) -> RealtimeSession:
+    async def get_session(
+        cls,
+        stream: AudioStream,
+        player: AudioPlayer | None = None,
+        noise: NoiseSampler | None = None,
+    ) -> RealtimeSession:
         """Get or create Realtime API session.
 
+        Hands over a fresh standby session when one is ready.
+
         Args:
             stream: AudioStream instance for the session.
+            player: Output for response audio. The caller keeps it running across
+                sessions; disconnecting does not stop it. If None, keeps the
+                session's own player.
+            noise: Enables local endpointing with this threshold source.
 
         Returns:
             RealtimeSession instance.
@@ -275,44 +592,203 @@ class RealtimeSessionManager:
         if cls._current_session is not None:
             await cls._current_session.disconnect()
 
-        # Create new session (connection is done separately)
-        cls._current_session = RealtimeSession(stream)
-        return cls._current_session
+        session = cls._take_standby(stream, noise)
+        if session is None:
+            # Create new session (connection is done separately)
+            session = RealtimeSession(stream, player, noise)
+        elif player is not None:
+            session._player = player
+        if player is not None:
+            session._owns_player = False
+        cls._current_session = session
+        if cls._standby_wakeup is not None:
+            cls._standby_wakeup.set()  # Refill the pool in the background
+        return session
+
+    @classmethod
+    def _take_standby(
+        cls, stream: AudioStream, noise: NoiseSampler | None
+    ) -> RealtimeSession | None:
+        now = time.time()
+        while cls._standby:
+            session, refresh_at = cls._standby.pop(0)
+            # Turn detection is fixed at signaling, so the endpointing mode must match
+            usable = session._stream is stream and session._noise is noise
+            if usable and session.is_prepared and now < refresh_at:
+                logger.info("Using pre-warmed session")
+                return session
+            asyncio.create_task(session.disconnect())
+        return None
+
+    @classmethod
+    def start_standby(
+        cls,
+        stream: AudioStream,
+        size: int | None = None,
+        player_factory: Callable[[], AudioPlayer] | None = None,
+        noise: NoiseSampler | None = None,
+    ) -> None:
+        """Keep ``size`` negotiated sessions ready in the background.
+
+        Args:
+            stream: AudioStream the standby sessions will send.
+            size: Number of standby sessions. Defaults to REALTIME_STANDBY_SESSIONS.
+            player_factory: Creates each session's player. Defaults to an AudioPlayer
+                reporting to the stream's echo reference.
+            noise: Enables local endpointing on the standby sessions.
+        """
+        size = settings.REALTIME_STANDBY_SESSIONS if size is None else size
+        if size <= 0 or cls._standby_task is not None:
+            return
+        cls._standby_wakeup = asyncio.Event()
+        if player_factory is None:
+            reference = stream.echo_reference
+
+            def player_factory() -> AudioPlayer:
+                return AudioPlayer(reference=reference)
+
+        cls._standby_task = asyncio.create_task(
+            cls._maintain_standby(stream, size, player_factory, noise)
+        )
+
+    @classmethod
+    async def stop_standby(cls) -> None:
+        """Stop refreshing and disconnect every standby session."""
+        if cls._standby_task is not None:
+            cls._standby_task.cancel()
+            try:
+                await cls._standby_task
+            except asyncio.CancelledError:
+                pass
+        cls._standby_task = None
+        cls._standby_wakeup = None
+        standby, cls._standby = cls._standby, []
+        for session, _ in standby:
+            await session.disconnect()
+
+    @classmethod
+    async def _maintain_standby(
+        cls,
+        stream: AudioStream,
+        size: int,
+        player_factory: Callable[[], AudioPlayer],
+        noise: NoiseSampler | None,
+    ) -> None:
+        assert cls._standby_wakeup is not None
+        retry_delay = 1.0
+        while True:
+            # Drop sessions that are about to expire or whose connection died
+            now = time.time()
+            for entry in list(cls._standby):
+                session, refresh_at = entry
+                if now >= refresh_at or not session.is_prepared:
+                    cls._standby.remove(entry)
+                    await session.disconnect()
+
+            while len(cls._standby) < size:
+                session = RealtimeSession(stream, player_factory(), noise)
+                try:
+                    await session.prepare_standby()
+                except (ConnectionError, ValueError) as e:
+                    logger.warning("Standby session failed: %s", e)
+                    await session.disconnect()
+                    break
+                cls._standby.append((session, cls._refresh_deadline(session)))
+
+            full = len(cls._standby) >= size
+            retry_delay = 1.0 if full else min(retry_delay * 2, 30.0)
+            delay = retry_delay
+            if full:
+                delay = max(0.0, min(deadline for _, deadline in cls._standby) - time.time())
+            cls._standby_wakeup.clear()
+            try:
+                await asyncio.wait_for(cls._standby_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    def _refresh_deadline(session: RealtimeSession) -> float:
+        """Unix time at which a standby session must be replaced."""
+        deadline = time.time() + settings.REALTIME_STANDBY_MAX_AGE
+        if session.key_expires_at is not None:
+            margin = settings.REALTIME_STANDBY_REFRESH_MARGIN
+            deadline = min(deadline, session.key_expires_at - margin)
+        return deadline
 
 
 class AudioStreamTrack(MediaStreamTrack):
-    """Audio stream track for WebRTC."""
+    """Audio stream track for WebRTC.
+
+    Sends one 20 ms frame per ``recv()``, the size of an Opus packet, so the
+    encoder neither regroups nor buffers samples. Each frame's samples are
+    copied once, from the ring straight into the frame's own buffer. The
+    ``pts`` follows the capture clock: it advances by the capture samples
+    between frames (so audio lost to a lapped subscription shows up as a gap,
+    not as compressed time), scaled by the device's measured drift.
+    """
 
     kind: str = "audio"
     _stream: AudioStream
-    _queue: asyncio.Queue[np.ndarray]
-    _timestamp: int
-
-    def __init__(self, audio_stream: AudioStream) -> None:
+    _reader: RingReader | None
+    _active: asyncio.Event
+    _rate: int
+    _frame: int
+    _captured: int | None
+    _pts: float
+
+    def __init__(self, audio_stream: AudioStream, sample_rate: int | None = None) -> None:
         """Initialize audio stream track.
 
         Args:
             audio_stream: AudioStream instance to read audio frames from.
+            sample_rate: Rate to send at. Defaults to the capture device rate.
         """
         super().__init__()
         self._stream = audio_stream
-        self._queue = audio_stream.subscribe()
-        self._timestamp = 0
+        self._rate = sample_rate or audio_stream._rate
+        self._frame = self._rate * FRAME_DURATION_MS // 1000
+        self._reader = None
+        self._active = asyncio.Event()
+        self._captured = None
+        self._pts = 0.0
+
+    def activate(self, start: int | None = None) -> None:
+        """Start sending microphone audio. Idempotent.
+
+        Args:
+            start: Capture sample index to start from. Defaults to the newest audio.
+        """
+        if self._reader is None:
+            self._reader = self._stream.subscribe(rate=self._rate, start=start, block=self._frame)
+            self._active.set()
 
     async def recv(self) -> AudioFrame:
         """Receive audio frame from the stream.
 
         Returns:
-            AudioFrame: Audio frame with PCM data.
+            AudioFrame: 20 ms of PCM data.
         """
-        # get the next audio data from AudioStream
-        audio_data = await self._queue.get()
-
-        frame = AudioFrame(format="s16", layout="mono", samples=len(audio_data))
-        frame.planes[0].update(audio_data.tobytes())
-        frame.pts = self._timestamp
-        frame.sample_rate = self._stream._rate
-        frame.time_base = fractions.Fraction(1, self._stream._rate)
-
-        self._timestamp += len(audio_data)
+        # Inactive (standby) tracks send nothing until activated
+        await self._active.wait()
+        assert self._reader is not None
+
+        audio_data = await self._reader.get()
+        # Position after get(): a lapped reader has already skipped what it lost
+        captured = self._stream.native_index(self._reader.position - self._frame, self._rate)
+        if self._captured is not None:
+            elapsed = (captured - self._captured) * self._rate / self._stream._rate
+            self._pts += elapsed / self._stream.clock.ratio
+        self._captured = captured
+
+        frame = AudioFrame(format="s16", layout="mono", samples=self._frame)
+        np.copyto(np.frombuffer(memoryview(frame.planes[0]), np.int16)[: self._frame], audio_data)
+        frame.pts = round(self._pts)
+        frame.sample_rate = self._rate
+        frame.time_base = fractions.Fraction(1, self._rate)
         return frame
+
+    def stop(self) -> None:
+        """Stop the track and release its stream subscription."""
+        if self._reader is not None:
+            self._stream.unsubscribe(self._reader)
+        super().stop()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from typing import Annotated
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import AliasChoices, Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 # Settings singleton
 settings: Settings
@@ -17,32 +20,108 @@ class Settings(BaseSettings):
     # -------- Audio --------
     SAMPLE_RATE: int = 16_000  # Default recording sample rate
     CHANNELS: int = 1  # 1=mono, 2=stereo
+    CAPTURE_CLOCK_WARMUP: float = 10.0  # Capture before the device's drift is estimated (s)
+    CAPTURE_MAX_DRIFT_PPM: float = 500.0  # Largest device clock drift corrected for
 
     # -------- Noise Sampler --------
-    NOISE_MARGIN: int = 300  # Margin added to peak average
-    NOISE_MEASURE_INTERVAL: float = 10.0  # How often to update noise level (seconds)
+    NOISE_MARGIN: int = 300  # Margin added to the noise floor
+    NOISE_PERCENTILE: float = 0.2  # Fraction of frames expected below the floor
+    NOISE_ADAPT_RATE: float = 40.0  # How fast the floor rises (dB per second)
+    NOISE_SPEECH_GATE: float = 10.0  # Levels this far above the floor count as speech (dB)
+    NOISE_SPEECH_ADAPT_RATE: float = 2.0  # How fast the floor rises during speech (dB per second)
+    NOISE_SMOOTHING: float = 0.15  # EMA time constant on the floor (seconds)
+    NOISE_MEASURE_INTERVAL: float = 10.0  # How often to log the threshold (seconds)
 
     # -------- Recorder --------
     SILENCE_DURATION: float = 1.5  # Stop recording after silence (seconds)
     MIN_RECORD_DURATION: float = 3.0  # Minimum recording time (seconds)
     MAX_RECORD_DURATION: float = 10.0  # Maximum recording time (seconds)
 
+    # -------- Player --------
+    PLAYER_MIN_DELAY: float = 0.04  # Lowest jitter buffer target depth (seconds)
+    PLAYER_MAX_DELAY: float = 0.3  # Highest jitter buffer target depth (seconds)
+    PLAYER_CONCEAL: float = 0.06  # Longest gap hidden by concealment (seconds)
+
+    # -------- Clips --------
+    CLIP_CACHE_DIR: Path = Path("cache/clips")  # Clips converted for playback, by content hash
+    CLIP_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Disk budget; least recently used go first
+    CLIP_MEMORY_BYTES: int = 16 * 1024 * 1024  # Mapped clips kept warm (~87 s of audio)
+    WAKE_EARCON_PATH: Path | None = None  # WAV played the moment the wake word is heard
+
+    # -------- Echo Cancellation --------
+    AEC_ENABLED: bool = False  # Cancel the speaker's echo in captured audio
+    AEC_FILTER_LENGTH: float = 0.064  # Echo tail modelled after the delay (seconds)
+    AEC_MAX_DELAY: float = 0.3  # Largest playback-to-capture delay searched (seconds)
+    AEC_STEP: float = 0.5  # Normalized adaptation step size (0-1)
+
+    # -------- Logging --------
+    LOG_LEVEL: str = "INFO"  # Root log level (DEBUG shows every transcript delta)
+    LOG_RATE: float = 20.0  # Sustained records per second per module below WARNING
+    LOG_BURST: int = 50  # Records a quiet module may emit back to back
+    LOG_QUEUE_SIZE: int = 10_000  # Records waiting for the writer thread; more are dropped
+
+    # -------- Tracing --------
+    TRACING_ENABLED: bool = True  # Record spans and counters in memory
+    TRACE_CAPACITY: int = 10_000  # Spans retained for quantiles and the Chrome trace
+    TRACE_EXPORT_DIR: Path | None = None  # Write metrics.prom and trace.json here (None = off)
+    TRACE_EXPORT_INTERVAL: float = 10.0  # How often to rewrite the export files (seconds)
+
     # -------- API Keys --------
     OPENAI_API_KEY: str | None = None
     PORCUPINE_ACCESS_KEY: str | None = None
 
+    # -------- HTTP client --------
+    HTTP_POOL_LIMIT: int = 10  # Max pooled connections across all hosts
+    HTTP_KEEPALIVE_TIMEOUT: float = 60.0  # Keep idle connections open this long (seconds)
+    HTTP_DNS_CACHE_TTL: int = 300  # Cache DNS lookups (seconds)
+    HTTP_TIMEOUT: float = 15.0  # Total per-request timeout (seconds)
+    HTTP_CONNECT_TIMEOUT: float = 5.0  # TCP/TLS connect timeout (seconds)
+
+    # -------- Home Assistant --------
+    HA_URL: str = "http://homeassistant.local:8123"  # Base URL of the REST API
+    HA_TOKEN: str | None = None  # Long-lived access token; function calling is off without it
+    HA_CALL_TIMEOUT: float = 5.0  # Timeout per service call (seconds)
+    # Started before response.done and run even if it is then cancelled: only safe, idempotent
+    # actions. Not switch.*: switches drive arbitrary relays (heaters, pumps)
+    HA_SPECULATIVE_ACTIONS: list[str] = ["get_state", "light.turn_on", "light.turn_off"]
+
     # -------- OpenAI Realtime API --------
     REALTIME_API_NEW_SESSION_URL: str = "https://api.openai.com/v1/realtime/sessions"
     REALTIME_API_SIGNALING_URL: str = "https://api.openai.com/v1/realtime"
     REALTIME_MODEL: str = "gpt-4o-realtime-preview"
+    # Pre-negotiated sessions kept ready (0 = off). Each one mints a key and runs an SDP
+    # exchange every REALTIME_STANDBY_MAX_AGE seconds, around the clock (~1700 a day)
+    REALTIME_STANDBY_SESSIONS: int = 0
+    REALTIME_STANDBY_MAX_AGE: float = 50.0  # Replace standby sessions after this (seconds)
+    REALTIME_STANDBY_REFRESH_MARGIN: float = 10.0  # Replace this long before key expiry (s)
+    REALTIME_LOCAL_ENDPOINTING: bool = False  # End turns on-device instead of by server VAD
+    REALTIME_ENDPOINT_SILENCE: float = 0.4  # Trailing silence that ends a turn (seconds)
+    REALTIME_ENDPOINT_MIN_SPEECH: float = 0.1  # Loud audio needed to count as speech (seconds)
+    REALTIME_ENDPOINT_NO_SPEECH: float = 5.0  # Give up if nothing is said after wake (seconds)
+    REALTIME_ENDPOINT_MAX_DURATION: float = 15.0  # Cut off longer utterances (seconds)
 
     # -------- Porcupine Settings --------
+    WAKE_QUEUE_FRAMES: int = 64  # Frames waiting for the inference thread (~2 s at 16 kHz)
+    WAKE_GATE_ENABLED: bool = False  # Run Porcupine only while levels reach the noise threshold
+    WAKE_GATE_LOOKBACK: float = 0.5  # Audio replayed from before the gate opened (seconds)
+    WAKE_GATE_HANGOVER: float = 1.0  # Keep the gate open after the last loud block (seconds)
     PORCUPINE_MODEL_PATH: Path = MODEL_ROOT / "porcupine" / "acoustic" / "porcupine_params_ja.pv"
-    PORCUPINE_KEYWORD_PATH: Path = (
-        MODEL_ROOT / "porcupine" / "wakewords" / "Sample_ja_raspberry-pi_v3_0_0.ppn"
+    PORCUPINE_KEYWORD_PATHS: Annotated[list[Path], NoDecode] = Field(  # Keyword files, one handle
+        default=[MODEL_ROOT / "porcupine" / "wakewords" / "Sample_ja_raspberry-pi_v3_0_0.ppn"],
+        # A single path in the old PORCUPINE_KEYWORD_PATH still works
+        validation_alias=AliasChoices("PORCUPINE_KEYWORD_PATHS", "PORCUPINE_KEYWORD_PATH"),
     )
+    PORCUPINE_SENSITIVITIES: list[float] = []  # One per keyword in [0, 1]; empty = 0.5 each
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @field_validator("PORCUPINE_KEYWORD_PATHS", mode="before")
+    @classmethod
+    def _keyword_paths(cls, value: object) -> object:
+        """Accept a JSON list or a single path from the environment."""
+        if isinstance(value, str):
+            return json.loads(value) if value.lstrip().startswith("[") else [value]
+        return value
+
 
 settings = Settings()
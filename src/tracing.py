@@ -0,0 +1,285 @@
+"""In-process span tracing and counters with Prometheus-text and Chrome-trace export."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import numpy as np
+
+from .settings import settings
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass(slots=True, frozen=True)
+class SpanRecord:
+    """One finished span; times from ``time.perf_counter_ns()``."""
+
+    name: str
+    start: int
+    duration: int
+    thread: int
+    attrs: dict[str, object] | None = None
+
+
+@dataclass(slots=True)
+class _Totals:
+    """Running aggregate of every span of one name, including evicted ones."""
+
+    count: int = 0
+    total: int = 0
+    maximum: int = 0
+
+
+class Span:
+    """Context manager timing one ``with`` block, including any awaits inside it."""
+
+    __slots__ = ("_tracer", "_name", "_attrs", "_start")
+
+    _tracer: Tracer
+    _name: str
+    _attrs: dict[str, object] | None
+    _start: int
+
+    def __init__(self, tracer: Tracer, name: str, attrs: dict[str, object] | None) -> None:
+        """Create span; timing starts on ``__enter__``."""
+        self._tracer = tracer
+        self._name = name
+        self._attrs = attrs
+        self._start = 0
+
+    def __enter__(self) -> Span:
+        """Start timing."""
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Record the span, marking it if the block raised."""
+        attrs = self._attrs
+        if exc_type is not None:
+            attrs = {**(attrs or {}), "error": exc_type.__name__}
+        self._tracer.record(self._name, self._start, attrs)
+
+
+class _NullSpan:
+    """Span handed out while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Spans, instant marks and counters kept in a bounded in-memory ring.
+
+    Recording a span is a ``perf_counter_ns()`` call, a record appended to a
+    ``deque`` and an update of the per-name totals. Real-time callbacks use
+    ``tally()`` instead, which only updates the totals, so they neither allocate
+    nor push the per-turn spans out of the ring. When the ring is full the
+    oldest spans are dropped, but totals and counters keep counting, so
+    Prometheus values stay monotonic.
+
+    Each span name and counter should be written from one thread; the ring
+    itself is safe to append to from any thread.
+    """
+
+    enabled: bool
+    _spans: deque[SpanRecord]
+    _marks: deque[tuple[str, int, int]]
+    _totals: dict[str, _Totals]
+    _counters: dict[str, int]
+    _origin: int
+
+    def __init__(self, capacity: int = 10_000, enabled: bool = True) -> None:
+        """Create tracer.
+
+        Args:
+            capacity: Finished spans (and, separately, marks) retained for export.
+            enabled: If False, spans, marks and counters are no-ops.
+        """
+        self.enabled = enabled
+        self._spans = deque(maxlen=capacity)
+        self._marks = deque(maxlen=capacity)
+        self._totals = {}
+        self._counters = {}
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name: str, **attrs: object) -> Span | _NullSpan:
+        """Time a ``with`` block as span ``name``."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attrs or None)
+
+    @staticmethod
+    def now() -> int:
+        """Timestamp to pass to ``record()`` as a span start."""
+        return time.perf_counter_ns()
+
+    def record(self, name: str, start: int, attrs: dict[str, object] | None = None) -> None:
+        """Record a span from ``start`` (a ``now()`` value) until now.
+
+        For spans that begin and end in different callbacks, or on hot paths
+        where a context manager is too much.
+        """
+        if not self.enabled:
+            return
+        duration = time.perf_counter_ns() - start
+        self._spans.append(SpanRecord(name, start, duration, threading.get_ident(), attrs))
+        self._add(name, duration)
+
+    def tally(self, name: str, start: int) -> None:
+        """Add the time since ``start`` to the totals of ``name`` without retaining a span.
+
+        For real-time callbacks: after the first call per name nothing is
+        allocated, and the ring is left to the per-turn spans. Such names get
+        ``_sum``, ``_count`` and maximum but no quantiles or trace entries.
+        """
+        if self.enabled:
+            self._add(name, time.perf_counter_ns() - start)
+
+    def _add(self, name: str, duration: int) -> None:
+        totals = self._totals.get(name)
+        if totals is None:
+            totals = self._totals[name] = _Totals()
+        totals.count += 1
+        totals.total += duration
+        if duration > totals.maximum:
+            totals.maximum = duration
+
+    def mark(self, name: str) -> None:
+        """Record an instant event, e.g. the first response audio frame."""
+        if self.enabled:
+            self._marks.append((name, time.perf_counter_ns(), threading.get_ident()))
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add ``value`` to counter ``name``."""
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @property
+    def spans(self) -> list[SpanRecord]:
+        """Retained spans, oldest first."""
+        return list(self._spans)
+
+    @property
+    def counters(self) -> dict[str, int]:
+        """Current counter values."""
+        return dict(self._counters)
+
+    def clear(self) -> None:
+        """Drop every span, mark, total and counter."""
+        self._spans.clear()
+        self._marks.clear()
+        self._totals.clear()
+        self._counters.clear()
+
+    def prometheus(self, prefix: str = "smartspeaker") -> str:
+        """Render totals, recent quantiles and counters in Prometheus text format.
+
+        Quantiles are computed over the spans still retained; ``_sum`` and
+        ``_count`` cover every span since start.
+        """
+        recent: dict[str, list[int]] = {}
+        for record in list(self._spans):
+            recent.setdefault(record.name, []).append(record.duration)
+        lines = [
+            f"# HELP {prefix}_span_seconds Time spent in traced pipeline stages.",
+            f"# TYPE {prefix}_span_seconds summary",
+        ]
+        maxima = [
+            f"# HELP {prefix}_span_max_seconds Longest span since start.",
+            f"# TYPE {prefix}_span_max_seconds gauge",
+        ]
+        for name, totals in sorted(list(self._totals.items())):
+            label = f'span="{name}"'
+            if name in recent:
+                values = np.quantile(np.array(recent[name]), QUANTILES) / 1e9
+                for q, value in zip(QUANTILES, values):
+                    lines.append(f'{prefix}_span_seconds{{{label},quantile="{q}"}} {value:.9f}')
+            lines.append(f"{prefix}_span_seconds_sum{{{label}}} {totals.total / 1e9:.9f}")
+            lines.append(f"{prefix}_span_seconds_count{{{label}}} {totals.count}")
+            maxima.append(f"{prefix}_span_max_seconds{{{label}}} {totals.maximum / 1e9:.9f}")
+        lines += maxima
+        lines += [
+            f"# HELP {prefix}_events_total Counted pipeline events.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        for name, value in sorted(list(self._counters.items())):
+            lines.append(f'{prefix}_events_total{{counter="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Retained spans and marks as a Chrome trace (``chrome://tracing``, Perfetto)."""
+        pid = os.getpid()
+        events: list[dict[str, Any]] = []
+        for record in list(self._spans):
+            event = {
+                "name": record.name,
+                "cat": record.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (record.start - self._origin) / 1e3,
+                "dur": record.duration / 1e3,
+                "pid": pid,
+                "tid": record.thread,
+            }
+            if record.attrs:
+                event["args"] = record.attrs
+            events.append(event)
+        for name, at, thread in list(self._marks):
+            ts = (at - self._origin) / 1e3
+            events.append({"name": name, "ph": "i", "s": "p", "ts": ts, "pid": pid, "tid": thread})
+        ts = (time.perf_counter_ns() - self._origin) / 1e3
+        for name, value in sorted(list(self._counters.items())):
+            events.append({"name": name, "ph": "C", "ts": ts, "pid": pid, "args": {name: value}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, directory: Path) -> None:
+        """Write ``metrics.prom`` and ``trace.json`` into ``directory``.
+
+        Each file is replaced atomically, so a node_exporter textfile collector
+        or a copy in progress never sees a partial file.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(directory / "metrics.prom", self.prometheus())
+        _write_atomic(directory / "trace.json", json.dumps(self.chrome_trace()))
+
+    async def run_exporter(self, directory: Path, interval: float) -> None:
+        """Export every ``interval`` seconds until cancelled, then once more."""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                # Serializing thousands of spans takes tens of ms; keep it off the loop
+                await asyncio.to_thread(self.export, directory)
+        finally:
+            self.export(directory)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# Process-wide tracer
+tracer = Tracer(capacity=settings.TRACE_CAPACITY, enabled=settings.TRACING_ENABLED)
@@ -1,4 +1,5 @@
 """Wakeword detection modules."""
-from .porcupine_wake import PorcupineWakeWordDetector
+from .engine import WakeBackend, WakeEngine
+from .porcupine_wake import PorcupineBackend, PorcupineWakeWordDetector
 
-__all__ = ["PorcupineWakeWordDetector"]
\ No newline at end of file
+__all__ = ["PorcupineWakeWordDetector", "PorcupineBackend", "WakeEngine", "WakeBackend"]
\ No newline at end of file
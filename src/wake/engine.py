@@ -0,0 +1,249 @@
+"""Wake word engine sharing one framing pipeline across keywords and back ends."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from typing import Any, Protocol
+
+import numpy as np
+
+from ..audio import AudioStream
+from ..audio.framing import FrameAccumulator
+from ..audio.noise import NoiseSampler
+from ..audio.ring import RingReader
+from ..interfaces import WakeEvent, WakeWordDetector
+from ..settings import settings
+from ..tracing import tracer
+from .worker import InferenceWorker
+
+logger = logging.getLogger(__name__)
+
+
+class WakeBackend(Protocol):
+    """Frame-based keyword spotter, e.g. one Porcupine handle with several keywords."""
+
+    @property
+    def sample_rate(self) -> int:
+        """Rate the back end expects, in Hz."""
+        ...
+
+    @property
+    def frame_length(self) -> int:
+        """Samples per ``process()`` call."""
+        ...
+
+    @property
+    def keywords(self) -> Sequence[str]:
+        """Keyword names, in the order ``process()`` reports them."""
+        ...
+
+    def process(self, pcm: np.ndarray) -> int:
+        """Index into ``keywords`` of the keyword ending in this frame, or -1."""
+        ...
+
+    def delete(self) -> None:
+        """Release native resources."""
+        ...
+
+
+class WakeEngine(WakeWordDetector):
+    """Run every back end on one resampled, framed subscription.
+
+    The stream is subscribed once at the back ends' common rate, cut into
+    frames once, and each frame is handed to the inference thread, which runs
+    the back ends in turn. Extra keywords therefore cost only their inference,
+    not another subscription, resampler or frame buffer.
+
+    With a ``gate`` the engine runs as a cascade: per-block levels, which the
+    stream computes anyway, decide whether the expensive stages run at all.
+    """
+
+    _stream: AudioStream
+    _backends: list[WakeBackend]
+    _keywords: list[str]
+    _rate: int
+    _frame_length: int
+    _frames: FrameAccumulator
+    _worker: InferenceWorker
+    _gate: NoiseSampler | None
+    _lookback: float
+    _hangover: float
+    _observed: int
+    _inferred: int
+    _last_wake: int
+
+    def __init__(
+        self,
+        stream: AudioStream,
+        backends: Sequence[WakeBackend],
+        gate: NoiseSampler | None = None,
+        *,
+        lookback: float | None = None,
+        hangover: float | None = None,
+    ) -> None:
+        """Create engine.
+
+        Args:
+            stream: Audio stream to listen for wake words.
+            backends: Spotters to run on every frame; all must agree on sample
+                rate and frame length. The first to fire wins.
+            gate: Threshold source for cascaded mode. If given, audio is only
+                resampled and run through the back ends while block levels reach
+                the threshold, plus ``lookback`` before and ``hangover`` after.
+            lookback: Seconds replayed from before the block that opened the
+                gate, so quiet onsets still reach the spotter. Defaults to
+                WAKE_GATE_LOOKBACK.
+            hangover: Seconds the gate stays open after the last loud block.
+                Defaults to WAKE_GATE_HANGOVER.
+
+        Raises:
+            ValueError: If there are no back ends or their framing differs.
+        """
+        if not backends:
+            raise ValueError("At least one wake back end is required")
+        framing = {(b.sample_rate, b.frame_length) for b in backends}
+        if len(framing) > 1:
+            raise ValueError(f"Wake back ends disagree on (rate, frame length): {framing}")
+        self._stream = stream
+        self._backends = list(backends)
+        self._keywords = [keyword for b in backends for keyword in b.keywords]
+        self._rate, self._frame_length = framing.pop()
+        self._frames = FrameAccumulator(self._frame_length)
+        self._worker = InferenceWorker(self._process, settings.WAKE_QUEUE_FRAMES)
+        self._gate = gate
+        self._lookback = settings.WAKE_GATE_LOOKBACK if lookback is None else lookback
+        self._hangover = settings.WAKE_GATE_HANGOVER if hangover is None else hangover
+        self._observed = 0
+        self._inferred = 0
+        self._last_wake = 0
+
+    @property
+    def keywords(self) -> list[str]:
+        """Every keyword of every back end, as reported in ``WakeEvent.keyword``."""
+        return list(self._keywords)
+
+    @property
+    def skip_fraction(self) -> float:
+        """Share of captured audio never run through the back ends (lookback replays count)."""
+        if not self._observed:
+            return 0.0
+        inferred = self._inferred * self._stream._rate / self._rate
+        return max(0.0, 1.0 - inferred / self._observed)
+
+    async def wait_for_wake(self) -> WakeEvent:
+        """Wait for any keyword.
+
+        Returns:
+            The keyword and the capture sample index where it ended.
+        """
+        self._frames.reset()
+        self._worker.begin()
+        # Subscribe before yielding so no audio slips by while the feed task starts
+        if self._gate is None:
+            # The stream resamples once for every subscriber at the back ends' rate.
+            reader = self._stream.subscribe(rate=self._rate)
+            feed = asyncio.create_task(self._feed(reader))
+        else:
+            levels = self._stream.subscribe_features()
+            feed = asyncio.create_task(self._feed_gated(levels, self._gate))
+        result = self._worker.result()
+        try:
+            with tracer.span("wake.wait"):
+                either: set[asyncio.Future[Any]] = {result, feed}
+                await asyncio.wait(either, return_when=asyncio.FIRST_COMPLETED)
+                if not result.done() and not feed.cancelled() and feed.exception() is not None:
+                    feed.result()  # The feed failed; no result would ever come
+                detected, end = await result
+            if detected < 0:
+                raise RuntimeError("Audio stream ended before the wake word was detected")
+            keyword = self._keywords[detected]
+            logger.info("Wake word detected: %s", keyword)
+            tracer.count(f"wake.detected.{keyword}")
+            self._last_wake = end
+            return WakeEvent(keyword, end)
+        finally:
+            feed.cancel()
+            if feed.done() and not feed.cancelled():
+                feed.exception()  # Retrieved: a detection that won the race is what counts
+
+    async def _feed(self, reader: RingReader) -> None:
+        """Queue every frame of ``reader`` for inference until cancelled."""
+        try:
+            async for block in self._stream.frames(reader):
+                self._observed += len(block) * self._stream._rate // self._rate
+                await self._push(reader, block)
+        finally:
+            self._stream.unsubscribe(reader)
+        await self._worker.finish()
+
+    async def _feed_gated(self, levels: RingReader, gate: NoiseSampler) -> None:
+        """Queue frames only around blocks that reach the gate's threshold.
+
+        While the gate is closed nothing is subscribed at the back ends' rate,
+        so neither resampling nor inference runs. Opening it subscribes from
+        ``lookback`` before the loud block; the ring still holds that audio.
+        The replay never reaches back past the previous wake, which would
+        otherwise detect the same keyword again.
+        """
+        chunk = self._stream._chunk
+        lookback = int(self._lookback * self._stream._rate)
+        hangover = int(self._hangover * self._stream._rate)
+        reader: RingReader | None = None
+        quiet = 0  # Captured samples since the last loud block
+        try:
+            async for block in self._stream.frames(levels):
+                self._observed += len(block) * chunk
+                loud = np.flatnonzero(block["rms"] >= gate.current_threshold())
+                if len(loud):
+                    quiet = (len(block) - 1 - int(loud[-1])) * chunk
+                    if reader is None:
+                        first = levels.position - len(block) + int(loud[0])
+                        onset = self._stream.feature_native_index(first)
+                        start = max(self._stream.oldest, self._last_wake, onset - lookback)
+                        reader = self._stream.subscribe(rate=self._rate, start=start)
+                        self._frames.reset()
+                        tracer.count("wake.gate.opened")
+                else:
+                    quiet += len(block) * chunk
+                if reader is None:
+                    continue
+                # Taps are pumped before features, so this block's audio is ready
+                while (pcm := reader.read()) is not None:
+                    await self._push(reader, pcm)
+                if quiet >= hangover:
+                    self._stream.unsubscribe(reader)
+                    reader = None
+        finally:
+            self._stream.unsubscribe(levels)
+            if reader is not None:
+                self._stream.unsubscribe(reader)
+        await self._worker.finish()
+
+    async def _push(self, reader: RingReader, block: np.ndarray) -> None:
+        """Frame one block read from ``reader`` and queue the frames, tagged by capture index."""
+        frame_length = self._frame_length
+        chunks = self._frames.push(block)
+        # Samples not yet framed are the newest ones read
+        end = reader.position - self._frames.pending - len(chunks) * frame_length
+        for chunk in chunks:
+            end += frame_length
+            self._inferred += frame_length
+            await self._worker.put(chunk, self._stream.native_index(end, rate=self._rate))
+
+    def _process(self, pcm: np.ndarray) -> int:
+        """Run every back end on one frame; inference thread only."""
+        offset = 0
+        for backend in self._backends:
+            index = backend.process(pcm)
+            if index >= 0:
+                return offset + index
+            offset += len(backend.keywords)
+        return -1
+
+    def close(self) -> None:
+        """Stop the inference thread and release every back end."""
+        self._worker.close()
+        for backend in self._backends:
+            backend.delete()
@@ -1,73 +1,103 @@
-from collections import deque
-from typing import cast
+from collections.abc import Sequence
+from pathlib import Path
 
 import numpy as np
-import numpy.typing as npt
 import pvporcupine
-from scipy.signal import resample_poly
 
 from ..audio import AudioStream
-from ..interfaces import WakeWordDetector
+from ..audio.noise import NoiseSampler
 from ..settings import settings
+from .engine import WakeBackend, WakeEngine
 
-Int16Array = npt.NDArray[np.int16]
 
+class PorcupineBackend:
+    """One Porcupine handle spotting several keywords in a single ``process()`` call."""
 
-class PorcupineWakeWordDetector(WakeWordDetector):
-    """Porcupine wake word detector implementation."""
-
-    _stream: AudioStream
     _porcupine: pvporcupine.Porcupine
-    _stream_sample_rate: int
-    _porcupine_sample_rate: int
-    _buffer: deque[int]
+    _keywords: list[str]
 
-    def __init__(self, stream: AudioStream) -> None:
-        """Initialize Porcupine wake word detector.
+    def __init__(
+        self, keyword_paths: Sequence[Path], sensitivities: Sequence[float] | None = None
+    ) -> None:
+        """Load the acoustic model and keyword files.
 
         Args:
-            stream: Audio stream to listen for wake words.
+            keyword_paths: ``.ppn`` files; each file's stem names its keyword.
+            sensitivities: One value in [0, 1] per keyword. Defaults to 0.5 each.
 
         Raises:
             RuntimeError: If PORCUPINE_ACCESS_KEY is not set.
+            ValueError: If the number of sensitivities does not match the keywords.
         """
-        self._stream = stream
-
         if not settings.PORCUPINE_ACCESS_KEY:
             raise RuntimeError("PORCUPINE_ACCESS_KEY not set in environment")
+        if not sensitivities:
+            sensitivities = [0.5] * len(keyword_paths)
+        if len(sensitivities) != len(keyword_paths):
+            raise ValueError("Need one sensitivity per keyword")
 
         self._porcupine = pvporcupine.create(
             access_key=settings.PORCUPINE_ACCESS_KEY,
             model_path=str(settings.PORCUPINE_MODEL_PATH),
-            keyword_paths=[str(settings.PORCUPINE_KEYWORD_PATH)],
+            keyword_paths=[str(path) for path in keyword_paths],
+            sensitivities=list(sensitivities),
+        )
+        self._keywords = [Path(path).stem for path in keyword_paths]
+
+    @property
+    def sample_rate(self) -> int:
+        """Rate Porcupine expects (16 kHz)."""
+        return int(self._porcupine.sample_rate)
+
+    @property
+    def frame_length(self) -> int:
+        """Samples per ``process()`` call (512)."""
+        return int(self._porcupine.frame_length)
+
+    @property
+    def keywords(self) -> list[str]:
+        """Keyword names, in ``keyword_paths`` order."""
+        return self._keywords
+
+    def process(self, pcm: np.ndarray) -> int:
+        """Index of the keyword ending in this frame, or -1."""
+        return int(self._porcupine.process(pcm))
+
+    def delete(self) -> None:
+        """Release the Porcupine handle."""
+        self._porcupine.delete()
+
+
+class PorcupineWakeWordDetector(WakeEngine):
+    """Porcupine wake word detector implementation.
+
+    Every keyword shares one Porcupine handle, one 16 kHz subscription and one
+    frame buffer; inference runs on a dedicated worker thread, so draining a
+    backlog never stalls the event loop.
+    """
+
+    def __init__(
+        self,
+        stream: AudioStream,
+        keyword_paths: Sequence[Path] | None = None,
+        sensitivities: Sequence[float] | None = None,
+        extra_backends: Sequence[WakeBackend] = (),
+        gate: NoiseSampler | None = None,
+    ) -> None:
+        """Initialize Porcupine wake word detector.
+
+        Args:
+            stream: Audio stream to listen for wake words.
+            keyword_paths: Keyword files. Defaults to PORCUPINE_KEYWORD_PATHS.
+            sensitivities: Per-keyword sensitivities. Defaults to PORCUPINE_SENSITIVITIES.
+            extra_backends: Other spotters (e.g. per-user models) run on the same frames.
+            gate: Run Porcupine only while block levels reach this sampler's threshold.
+
+        Raises:
+            RuntimeError: If PORCUPINE_ACCESS_KEY is not set.
+        """
+        backend = PorcupineBackend(
+            settings.PORCUPINE_KEYWORD_PATHS if keyword_paths is None else keyword_paths,
+            settings.PORCUPINE_SENSITIVITIES if sensitivities is None else sensitivities,
         )
-        self._stream_sample_rate = stream._rate
-        self._porcupine_sample_rate = self._porcupine.sample_rate
-        self._buffer = deque()
-
-    def _resample_frame(self, frame: np.ndarray) -> Int16Array:
-        if self._stream_sample_rate == self._porcupine_sample_rate:
-            return cast(Int16Array, frame)
-
-        resampled = resample_poly(
-            frame,
-            self._porcupine_sample_rate,
-            self._stream_sample_rate,
-        ).astype(np.int16)
-
-        return cast(Int16Array, resampled)
-
-    async def wait_for_wake(self) -> None:
-        """Wait for wake word detection."""
-        queue = self._stream.subscribe()
-        async for frame in self._stream.frames(queue):
-            self._buffer.extend(self._resample_frame(frame))
-
-            while len(self._buffer) >= self._porcupine.frame_length:
-                chunk = np.array(
-                    [self._buffer.popleft() for _ in range(self._porcupine.frame_length)],
-                    dtype=np.int16,
-                )
-                if self._porcupine.process(chunk) >= 0:
-                    print("Wake word detected")
-                    return
+        super().__init__(stream, [backend, *extra_backends], gate)
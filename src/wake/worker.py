@@ -0,0 +1,165 @@
+"""Wake word inference on a dedicated thread, fed through a bounded queue."""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from collections.abc import Callable
+
+import numpy as np
+
+from ..tracing import tracer
+
+
+class InferenceWorker:
+    """Run a blocking per-frame detector off the event loop.
+
+    The loop submits frames with ``put()``; a worker thread runs ``process`` on
+    each one and resolves the ``result()`` future with the frame's tag as soon
+    as it returns a non-negative value, or with ``(-1, -1)`` once every frame
+    submitted before ``finish()`` came back negative. An exception raised by
+    ``process`` fails the future instead. When the queue is full
+    ``put()`` waits without blocking the loop, so a large backlog is drained at
+    the speed of inference while WebRTC, the player and the data channel keep
+    running.
+
+    Each frame's inference time is traced as ``wake.inference`` and the time it
+    sat in the queue as ``wake.queue_lag``.
+    """
+
+    _process: Callable[[np.ndarray], int]
+    _queue: queue.Queue[tuple[int, np.ndarray | None, int, int] | None]
+    _thread: threading.Thread | None
+    _loop: asyncio.AbstractEventLoop | None
+    _generation: int
+    _result: asyncio.Future[tuple[int, int]] | None
+    _space: asyncio.Event
+    _waiting: bool
+
+    def __init__(self, process: Callable[[np.ndarray], int], capacity: int = 64) -> None:
+        """Create worker; its thread starts on the first ``begin()``.
+
+        Args:
+            process: Detector call; returns the detected keyword index or -1.
+                Only ever called from the worker thread.
+            capacity: Frames that may wait for inference.
+        """
+        self._process = process
+        self._queue = queue.Queue(capacity)
+        self._thread = None
+        self._loop = None
+        self._generation = 0
+        self._result = None
+        self._space = asyncio.Event()
+        self._waiting = False
+
+    @property
+    def backlog(self) -> int:
+        """Frames waiting for inference."""
+        return self._queue.qsize()
+
+    def begin(self) -> None:
+        """Start a new detection; frames still queued for an earlier one are skipped."""
+        loop = asyncio.get_running_loop()
+        if self._thread is None or self._loop is not loop:
+            self._loop = loop
+            self._space = asyncio.Event()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="wake", daemon=True)
+                self._thread.start()
+        self._generation += 1
+        self._result = loop.create_future()
+
+    async def put(self, frame: np.ndarray, tag: int) -> None:
+        """Queue one frame, waiting (without blocking the loop) while the queue is full.
+
+        Args:
+            frame: Samples; copied, so views into shared buffers are fine.
+            tag: Returned by ``result()`` if this frame triggers, e.g. its end index.
+        """
+        await self._enqueue((self._generation, frame.copy(), tag, tracer.now()))
+
+    async def finish(self) -> None:
+        """No more frames for this detection; ``result()`` resolves after the last one."""
+        await self._enqueue((self._generation, None, -1, tracer.now()))
+
+    async def _enqueue(self, item: tuple[int, np.ndarray | None, int, int]) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                self._space.clear()
+                self._waiting = True
+                if not self._queue.full():
+                    continue  # The worker took a frame before it could see the flag
+                tracer.count("wake.queue_full")
+                await self._space.wait()
+
+    def result(self) -> asyncio.Future[tuple[int, int]]:
+        """Future of ``(detector result, tag)`` for the first triggering frame."""
+        assert self._result is not None, "begin() not called"
+        return self._result
+
+    def close(self) -> None:
+        """Stop the worker thread after the frame it is processing."""
+        if self._thread is None:
+            return
+        self._generation += 1  # Skip whatever is still queued
+        while True:
+            try:
+                self._queue.put_nowait(None)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        finished = 0  # Last generation resolved; only the loop advances _generation
+        while (item := self._queue.get()) is not None:
+            generation, frame, tag, queued = item
+            if self._waiting:
+                self._waiting = False
+                self._post(self._space.set)
+            if generation <= finished or generation != self._generation:
+                continue  # Detection already finished or abandoned
+            if frame is None:
+                finished = generation
+                self._post(self._resolve, generation, -1, tag)
+                continue
+            tracer.record("wake.queue_lag", queued)
+            start = tracer.now()
+            try:
+                detected = self._process(frame)
+            except Exception as e:  # Handed to the waiting loop
+                # The thread stays up for the next begin(); this detection has failed
+                finished = generation
+                self._post(self._fail, generation, e)
+                continue
+            tracer.record("wake.inference", start)
+            if detected >= 0:
+                # Frames queued behind this one belong to a finished detection
+                finished = generation
+                self._post(self._resolve, generation, detected, tag)
+
+    def _resolve(self, generation: int, detected: int, tag: int) -> None:
+        # Loop side; ignores a result for a detection that was given up on
+        future = self._result
+        if future is not None and not future.done() and generation == self._generation:
+            future.set_result((detected, tag))
+
+    def _fail(self, generation: int, error: Exception) -> None:
+        # Loop side, as _resolve()
+        future = self._result
+        if future is not None and not future.done() and generation == self._generation:
+            future.set_exception(error)
+
+    def _post(self, callback: Callable[..., None], *args: object) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(callback, *args)
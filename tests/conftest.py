@@ -0,0 +1,33 @@
+from collections.abc import AsyncIterator
+
+import pytest_asyncio
+
+from benchmarks.ha_standin import HomeAssistantStandIn
+from benchmarks.standin import RealtimeStandIn
+from src.http_client import HttpClient
+from src.settings import settings
+
+
+@pytest_asyncio.fixture
+async def standin() -> AsyncIterator[RealtimeStandIn]:
+    """Local Realtime endpoints wired into settings."""
+    server = RealtimeStandIn()
+    server.config.key_latency = server.config.sdp_latency = 0.0
+    await server.start()
+    urls = settings.REALTIME_API_NEW_SESSION_URL, settings.REALTIME_API_SIGNALING_URL
+    settings.REALTIME_API_NEW_SESSION_URL = server.session_url
+    settings.REALTIME_API_SIGNALING_URL = server.signaling_url
+    yield server
+    settings.REALTIME_API_NEW_SESSION_URL, settings.REALTIME_API_SIGNALING_URL = urls
+    await HttpClient.close()
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def ha_standin() -> AsyncIterator[HomeAssistantStandIn]:
+    """Local Home Assistant REST API; pass its ``base_url`` and ``TOKEN`` to the executor."""
+    server = HomeAssistantStandIn()
+    await server.start()
+    yield server
+    await HttpClient.close()
+    await server.stop()
@@ -0,0 +1,112 @@
+import asyncio
+import wave
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+import sounddevice as sd
+
+from src.audio.clips import ClipCache
+from src.audio.device import AudioDevice
+from src.audio.player import OUTPUT_BLOCK, AudioPlayer
+
+MiB = 1024 * 1024
+
+
+def _wav(path: Path, samples: np.ndarray, rate: int) -> Path:
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(samples.astype("<i2").tobytes())
+    return path
+
+
+class _FakeOutputStream:
+    """Captures the player's callback so the test can pull blocks like the device."""
+
+    callback: Callable[[np.ndarray, int, Any, Any], None] | None = None
+
+    def __init__(
+        self, *, callback: Callable[[np.ndarray, int, Any, Any], None], **_: object
+    ) -> None:
+        _FakeOutputStream.callback = callback
+
+    def __enter__(self) -> "_FakeOutputStream":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        pass
+
+
+def test_clips_are_stored_converted_and_addressed_by_content(tmp_path: Path) -> None:
+    """A 16 kHz mono WAV becomes a mapped 48 kHz stereo clip; identical audio is stored once."""
+    # Arrange
+    tone = (8000 * np.sin(np.arange(1600) * 2 * np.pi * 440 / 16_000)).astype(np.int16)
+    wav = _wav(tmp_path / "chime.wav", tone, 16_000)
+    cache = ClipCache(tmp_path / "clips", max_bytes=MiB, memory_bytes=MiB)
+
+    # Act
+    key = cache.add("wake", wav)
+    again = cache.put("chime", tone, 16_000)
+    clip = cache.get("wake")
+
+    # Assert
+    assert again == key
+    assert [p.stem for p in (tmp_path / "clips").glob("*.pcm")] == [key]
+    assert isinstance(clip, np.memmap) and not clip.flags.writeable
+    assert clip.shape == (4800, 2)
+    np.testing.assert_array_equal(clip[:, 0], clip[:, 1])
+    assert cache.get("chime") is clip  # Served from the mapped tier
+
+
+def test_least_recently_used_clips_are_evicted(tmp_path: Path) -> None:
+    """Beyond the disk budget the clip used longest ago is deleted; a recent get() keeps one."""
+    # Arrange - three 1 s clips (192 kB each) in a budget for two
+    cache = ClipCache(tmp_path, max_bytes=400_000, memory_bytes=200_000)
+    clips = [np.full(48_000, i + 1, dtype=np.int16) for i in range(3)]
+
+    # Act
+    first = cache.put("first", clips[0], 48_000)
+    second = cache.put("second", clips[1], 48_000)
+    cache.get("first")  # Touch: "second" is now the oldest
+    cache.put("third", clips[2], 48_000)
+
+    # Assert
+    assert "first" in cache and "third" in cache
+    assert "second" not in cache and second not in cache
+    with pytest.raises(KeyError):
+        cache.get("second")
+    assert len(cache._mapped) == 1 and first in cache._mapped
+
+
+@pytest.mark.asyncio
+async def test_player_mixes_clip_into_next_block(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A clip starts in the very next output block, mixed over response audio with saturation."""
+    # Arrange
+    monkeypatch.setattr(sd, "OutputStream", _FakeOutputStream)
+    player = AudioPlayer(device=AudioDevice(0, "test", 48_000, 2))
+    await player.start()
+    await asyncio.sleep(0)
+    callback = _FakeOutputStream.callback
+    assert callback is not None
+    clip = np.full((OUTPUT_BLOCK + 100, 2), 30_000, dtype=np.int16)
+    out = np.zeros((OUTPUT_BLOCK, 2), dtype=np.int16)
+
+    # Act
+    await player.play_clip(clip)
+    callback(out, OUTPUT_BLOCK, None, None)
+    first = out.copy()
+    await player.play_audio(np.full(OUTPUT_BLOCK * 2 * 4, 10_000, dtype=np.int16))
+    callback(out, OUTPUT_BLOCK, None, None)
+    second = out.copy()
+    callback(out, OUTPUT_BLOCK, None, None)
+    await player.stop()
+
+    # Assert
+    assert (first == 30_000).all()
+    assert (second[:100] == 32_767).all()  # Clip tail over response audio, clipped
+    assert (second[100:] == 10_000).all()
+    assert (out == 10_000).all()  # Finished clip is not replayed
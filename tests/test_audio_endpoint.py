@@ -0,0 +1,30 @@
+from src.audio.endpoint import Endpointer
+
+BLOCK = 0.032  # 512 samples at 16 kHz
+
+
+def test_endpointer_ends_after_trailing_silence() -> None:
+    """A click is not speech; the turn ends once speech is followed by enough silence."""
+    # Arrange
+    endpointer = Endpointer(BLOCK, silence=0.4, min_speech=0.1)
+    levels = [100.0] * 10 + [3_000.0] + [100.0] * 5 + [3_000.0] * 20 + [100.0] * 40
+
+    # Act
+    ended_at = next(i for i, rms in enumerate(levels) if endpointer.update(rms, 500.0))
+
+    # Assert - 20 speech blocks end at index 35, then 13 blocks (>= 0.4 s) of silence
+    assert endpointer.heard_speech
+    assert ended_at == 35 + 13
+
+
+def test_endpointer_gives_up_without_speech() -> None:
+    """Silence after the wake word ends the turn after ``no_speech`` without speech."""
+    # Arrange
+    endpointer = Endpointer(BLOCK, no_speech=1.0)
+
+    # Act
+    ended = [endpointer.update(100.0, 500.0) for _ in range(40)]
+
+    # Assert - 1.0 s is 32 blocks
+    assert ended.index(True) == 31
+    assert not endpointer.heard_speech
@@ -0,0 +1,53 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.audio.device import AudioDevice
+from src.audio.features import compute_features
+from src.audio.stream import AudioStream
+from src.audio.utils import calculate_rms
+
+
+def test_compute_features_matches_reference() -> None:
+    """Batched float32 features agree with per-frame float64 reference values."""
+    # Arrange
+    rng = np.random.default_rng(0)
+    frames = rng.integers(-32768, 32767, (6, 512), dtype=np.int16)
+    frames[1] = 0
+    frames[2, 100] = -32768
+    frames[3] = np.tile([5, -5], 256)
+
+    # Act
+    features = compute_features(frames)
+
+    # Assert
+    rms = [calculate_rms(f) for f in frames]
+    np.testing.assert_allclose(features["rms"], rms, rtol=1e-5)
+    assert features["peak"][2] == 32768
+    assert features["dbfs"][1] == pytest.approx(20 * np.log10(1 / 32768))
+    assert features["dbfs"][3] == pytest.approx(20 * np.log10(5 / 32768), abs=1e-4)
+    assert features["zcr"][1] == 0.0
+    assert features["zcr"][3] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_stream_publishes_features_without_pcm() -> None:
+    """A feature subscriber gets one record per block, computed once for all readers."""
+    # Arrange
+    stream = AudioStream(device=AudioDevice(0, "test", 16_000, 1), chunk=4, batch=3)
+    stream._attach(asyncio.get_running_loop())
+    first, second = stream.subscribe_features(), stream.subscribe_features()
+    blocks = [np.full(4, v, dtype=np.int16) for v in (100, -200, 300)]
+
+    # Act
+    for block in blocks:
+        stream.push(block)
+    a = [await first.get() for _ in range(3)]
+    b = await second.get()
+    stream._detach()
+
+    # Assert
+    assert [float(f["rms"][0]) for f in a] == [100.0, 200.0, 300.0]
+    assert np.shares_memory(a[0], b)
+    assert first.position == 3
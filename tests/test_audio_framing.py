@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.audio.framing import FrameAccumulator
+
+
+def test_accumulator_cuts_exact_frames_across_pushes() -> None:
+    """Frames are exact and contiguous regardless of input chunk sizes."""
+    # Arrange
+    acc = FrameAccumulator(512)
+    samples = np.arange(5_000, dtype=np.int16)
+    sizes = [170, 171, 1, 900, 1_200, 37, 2_521]
+
+    # Act
+    frames: list[np.ndarray] = []
+    start = 0
+    for size in sizes:
+        frames.extend(f.copy() for f in acc.push(samples[start : start + size]))
+        start += size
+
+    # Assert
+    assert all(len(f) == 512 for f in frames)
+    np.testing.assert_array_equal(np.concatenate(frames), samples[: len(frames) * 512])
+    assert acc.pending == 5_000 - len(frames) * 512
+
+
+def test_accumulator_frames_survive_leftover_copy() -> None:
+    """A frame completed from the carry buffer is not clobbered by the new leftover."""
+    # Arrange
+    acc = FrameAccumulator(4)
+    acc.push(np.array([1, 2], dtype=np.int16))
+
+    # Act
+    frames = acc.push(np.array([3, 4, 5, 6, 7, 8, 9], dtype=np.int16))
+
+    # Assert
+    assert [f.tolist() for f in frames] == [[1, 2, 3, 4], [5, 6, 7, 8]]
+    assert acc.pending == 1
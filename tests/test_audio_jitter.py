@@ -0,0 +1,202 @@
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+
+from src.audio.jitter import JitterBuffer
+
+RATE = 48_000
+BLOCK = 960
+
+
+def _stereo(count: int, start: int = 0) -> np.ndarray:
+    ramp = (np.arange(start, start + count) % 20_000).astype(np.int16)
+    return np.stack([ramp, -ramp], axis=1)
+
+
+def test_jitter_buffer_plays_odd_frame_sizes_gaplessly() -> None:
+    """Frames of any size come out as exact blocks in order when arrival is steady."""
+    # Arrange
+    buffer = JitterBuffer(rate=RATE, min_delay=0.04)
+    signal = _stereo(BLOCK * 40)
+    sizes = [100, 333, 7, 520]  # Sums to one block
+    written = 0
+
+    def feed(count: int) -> None:
+        nonlocal written
+        end = written + count
+        while written < end:
+            size = min(sizes[written % len(sizes)], end - written)
+            buffer.write(signal[written : written + size].reshape(-1), arrival=written / RATE)
+            written += size
+
+    feed(2 * BLOCK)
+
+    # Act
+    out = np.empty((BLOCK, 2), dtype=np.int16)
+    played = []
+    for _ in range(30):
+        feed(BLOCK)
+        buffer.read(out)
+        played.append(out.copy())
+
+    # Assert
+    np.testing.assert_array_equal(np.concatenate(played), signal[: 30 * BLOCK])
+    stats = buffer.stats
+    assert (stats.underruns, stats.overruns, stats.concealed) == (0, 0, 0)
+
+
+def test_jitter_buffer_conceals_short_gap_then_rebuffers() -> None:
+    """Running dry fades out a repeat of recent audio, then goes silent and re-primes."""
+    # Arrange
+    buffer = JitterBuffer(rate=RATE, min_delay=0.02, conceal=0.025)
+    buffer.write(_stereo(BLOCK + BLOCK // 2, start=1_000), arrival=0.0)
+    out = np.empty((BLOCK, 2), dtype=np.int16)
+    buffer.read(out)
+
+    # Act
+    buffer.read(out)  # Half real audio, half concealment
+    concealed = out[BLOCK // 2 :].copy()
+    buffer.read(out)  # Concealment budget runs out mid-block
+    tail = out.copy()
+    buffer.write(_stereo(BLOCK // 2), arrival=0.1)
+    buffer.read(out)  # Below target: still re-buffering
+
+    # Assert
+    stats = buffer.stats
+    assert stats.underruns == 1
+    assert stats.concealed == int(0.025 * RATE)
+    assert np.abs(concealed).max() > 0
+    assert np.abs(concealed[-10:]).max() < np.abs(concealed[:10]).max()
+    assert not tail[-100:].any()
+    assert not out.any()
+
+
+def test_jitter_buffer_overrun_refuses_newest() -> None:
+    """Writing past capacity keeps the buffered audio and counts an overrun."""
+    # Arrange
+    buffer = JitterBuffer(rate=RATE, min_delay=0.01, capacity=0.05)
+    signal = _stereo(3_000)
+
+    # Act
+    buffer.write(signal, arrival=0.0)
+    out = np.empty((BLOCK, 2), dtype=np.int16)
+    buffer.read(out)
+
+    # Assert
+    assert buffer.stats.overruns == 1
+    np.testing.assert_array_equal(out[0], signal[0])
+
+
+def test_jitter_buffer_target_follows_arrival_jitter() -> None:
+    """Bursty arrival raises the target; a deep buffer is drained slightly faster."""
+    # Arrange
+    steady = JitterBuffer(rate=RATE, min_delay=0.04)
+    bursty = JitterBuffer(rate=RATE, min_delay=0.04)
+    frame = _stereo(BLOCK)
+
+    # Act
+    for i in range(50):
+        steady.write(frame, arrival=i * 0.02)
+        bursty.write(frame, arrival=(i // 4) * 0.08)  # Four frames at once every 80 ms
+    out = np.empty((BLOCK, 2), dtype=np.int16)
+    depth = steady.stats.depth
+    steady.read(out)
+
+    # Assert
+    assert steady.stats.target == int(0.04 * RATE)
+    assert bursty.stats.target > steady.stats.target
+    assert depth - steady.stats.depth > BLOCK
+
+
+def test_jitter_buffer_read_allocates_no_sample_buffers() -> None:
+    """The callback path stays allocation-free in steady, stretched and concealing reads."""
+    # Arrange
+    out = np.empty((BLOCK, 2), dtype=np.int16)
+    buffers = {
+        "steady": JitterBuffer(rate=RATE, min_delay=0.04),
+        "faster": JitterBuffer(rate=RATE, min_delay=0.04),
+        "slower": JitterBuffer(rate=RATE, min_delay=0.2),
+        "conceal": JitterBuffer(rate=RATE, min_delay=0.02),
+    }
+    buffers["steady"].write(_stereo(BLOCK * 5), arrival=0.0)
+    buffers["faster"].write(_stereo(BLOCK * 20), arrival=0.0)
+    buffers["slower"].write(_stereo(BLOCK * 10), arrival=0.0)
+    buffers["conceal"].write(_stereo(BLOCK), arrival=0.0)
+    buffers["slower"]._target = int(0.3 * RATE)  # Primed, then far below target
+    for buffer in buffers.values():
+        buffer.read(out)
+
+    # Act
+    peaks = {}
+    for name, buffer in buffers.items():
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        buffer.read(out)
+        peaks[name] = tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+
+    # Assert - one block of samples is 3840 bytes; only small Python objects remain
+    assert buffers["faster"].stats.depth < BLOCK * 18
+    assert buffers["conceal"].stats.concealed > 0
+    assert all(peak < 2048 for peak in peaks.values()), peaks
+
+
+class _ExactJitterBuffer(JitterBuffer):
+    STRETCH = 10**9  # Zero-length stretch: interpolation reproduces the input exactly
+
+
+def test_jitter_buffer_threaded_stress(record_property: Callable[[str, object], None]) -> None:
+    """A producer thread and a callback thread exchange audio without corruption."""
+    # Arrange
+    buffer = _ExactJitterBuffer(rate=RATE, min_delay=0.01, max_delay=0.05, capacity=0.2)
+    total = RATE * 2
+    signal = np.stack([np.arange(total) % 30_000 + 1, -(np.arange(total) % 30_000) - 1], axis=1)
+    signal = signal.astype(np.int16)
+    done = threading.Event()
+
+    def produce() -> None:
+        rng = np.random.default_rng(0)
+        sent = 0
+        while sent < total:
+            size = min(int(rng.integers(1, 2_000)), total - sent)
+            while buffer._ring.free() < size:
+                time.sleep(0)
+            buffer.write(signal[sent : sent + size])
+            sent += size
+        done.set()
+
+    played: list[np.ndarray] = []
+    timings: list[int] = []
+
+    def callback() -> None:
+        out = np.empty((BLOCK, 2), dtype=np.int16)
+        while not (done.is_set() and buffer.stats.depth < int(0.05 * RATE) + BLOCK):
+            if buffer.stats.depth < int(0.05 * RATE) + BLOCK:
+                time.sleep(0)
+                continue
+            start = time.perf_counter_ns()
+            buffer.read(out)
+            timings.append(time.perf_counter_ns() - start)
+            played.append(out.copy())
+
+    # Act
+    threads = [threading.Thread(target=produce), threading.Thread(target=callback)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    # Assert
+    worst_ms = max(timings) / 1e6
+    record_property("worst_callback_ms", worst_ms)
+    print(f"\n{len(timings)} callbacks, worst-case read() {worst_ms:.3f} ms")
+    output = np.concatenate(played)
+    np.testing.assert_array_equal(output, signal[: len(output)])
+    assert len(output) > total // 2
+    stats = buffer.stats
+    assert (stats.underruns, stats.overruns) == (0, 0)
+    assert worst_ms < BLOCK / RATE * 1e3  # Within one block's real-time deadline
@@ -5,8 +5,10 @@ from unittest.mock import MagicMock
 import numpy as np
 import pytest
 
-from src.audio.noise import NoiseSampler
+from src.audio.noise import NoiseFloorEstimator, NoiseSampler
+from src.audio.sources import SyntheticSource
 from src.audio.stream import AudioStream
+from src.settings import settings
 
 
 class MockQueue:
@@ -70,3 +72,73 @@ async def test_noise_sampler_start_runs() -> None:
     # Assert
     # If we reached here, the sampler started and stopped cleanly.
     assert True
+
+
+def _levels(rng: np.random.Generator, rms: float, frames: int) -> list[float]:
+    return list(rms * rng.uniform(0.7, 1.3, frames))
+
+
+def test_noise_floor_ignores_speech_and_adapts_to_room_change() -> None:
+    """The floor stays near ambient through speech, then follows a louder room within seconds."""
+    # Arrange - 32 ms frames (512 samples at 16 kHz)
+    rng = np.random.default_rng(0)
+    estimator = NoiseFloorEstimator(0.032)
+    quiet = _levels(rng, 100.0, 60)
+    speech = [3_000.0 if i % 3 else 100.0 for i in range(30)]  # ~1 s with pauses
+    loud = _levels(rng, 800.0, 250)  # ~8 s of a louder room
+
+    # Act
+    for rms in quiet:
+        estimator.update(rms)
+    settled = estimator.floor
+    during_speech = max(estimator.update(rms) for rms in speech)
+    for rms in _levels(rng, 100.0, 30):
+        estimator.update(rms)
+    for rms in loud:
+        adapted = estimator.update(rms)
+
+    # Assert
+    assert settled is not None and 60 < settled < 140
+    assert during_speech < 1_000
+    assert 400 < adapted < 1_100
+
+
+def test_noise_floor_holds_through_unbroken_speech() -> None:
+    """Seconds of speech without pauses keep the floor a few dB from ambient."""
+    # Arrange
+    rng = np.random.default_rng(0)
+    estimator = NoiseFloorEstimator(0.032)
+    for rms in _levels(rng, 100.0, 60):
+        estimator.update(rms)
+    settled = estimator.floor
+    assert settled is not None
+
+    # Act - ~3 s of continuous speech
+    during_speech = max(estimator.update(rms) for rms in _levels(rng, 3_000.0, 94))
+
+    # Assert - threshold stays under ~500 instead of climbing past 1000
+    assert during_speech < 2.5 * settled
+    assert during_speech + settings.NOISE_MARGIN < 500
+
+
+@pytest.mark.asyncio
+async def test_noise_sampler_threshold_updates_continuously() -> None:
+    """The threshold is available after the first frames instead of after an interval."""
+    # Arrange
+    stream = AudioStream(source=SyntheticSource(tones=(), noise=0.01, duration=0.5, realtime=False))
+    sampler = NoiseSampler(stream)
+    task = asyncio.create_task(sampler.start())
+    await asyncio.sleep(0)
+
+    # Act
+    await stream.run()
+    await asyncio.sleep(0)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+    # Assert - noise at 1% of full scale is ~330 RMS
+    floor = sampler.current_threshold() - settings.NOISE_MARGIN
+    assert 150 < floor < 500
@@ -0,0 +1,88 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.audio.device import AudioDevice
+from src.audio.ring import AudioRingBuffer
+from src.audio.stream import AudioStream
+from src.realtime.realtime import AudioStreamTrack
+
+
+def _stream(rate: int = 16_000) -> AudioStream:
+    return AudioStream(device=AudioDevice(0, "test", rate, 1), chunk=160, buffer_blocks=50)
+
+
+async def _settle(stream: AudioStream) -> None:
+    while stream._notified != stream._ring.written:
+        await asyncio.sleep(0)
+
+
+def test_ring_reader_starts_in_history_clamped_to_retained_audio() -> None:
+    """Readers may start in the past, aligned to blocks and never before the oldest sample."""
+    # Arrange
+    ring = AudioRingBuffer(capacity=16, block=4)
+    ring.write(np.arange(40, dtype=np.int16))
+
+    # Act
+    recent, clamped = ring.reader(start=30), ring.reader(start=0)
+
+    # Assert
+    assert recent.position == 28
+    assert clamped.position == ring.oldest == 28
+    block = clamped.read()
+    assert block is not None and block.tolist() == [28, 29, 30, 31]
+    assert clamped.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_subscribers_start_from_wake_index() -> None:
+    """Native, resampled and feature subscribers all start at the same capture index."""
+    # Arrange - 1 s of audio whose value is its block number
+    stream = _stream()
+    stream._attach(asyncio.get_running_loop())
+    stream.subscribe(rate=48_000)  # Existing tap, created before the history
+    for i in range(100):
+        stream.push(np.full(160, i, dtype=np.int16))
+    await _settle(stream)
+    wake_index = 90 * 160
+
+    # Act
+    native = stream.subscribe(start=wake_index)
+    existing_tap = stream.subscribe(rate=48_000, start=wake_index)
+    new_tap = stream.subscribe(rate=8_000, start=wake_index)
+    features = stream.subscribe_features(start=wake_index)
+    stream._detach()
+
+    # Assert
+    first = native.read()
+    assert first is not None and first[0] == 90
+    assert features.available() == 10
+    for reader, rate in ((existing_tap, 48_000), (new_tap, 8_000)):
+        assert stream.native_index(reader.position, rate=rate) == pytest.approx(wake_index, abs=160)
+        backlog = reader.available() * 16_000 // rate
+        assert 9 * 160 <= backlog <= 11 * 160
+
+
+@pytest.mark.asyncio
+async def test_track_sends_preroll_backlog_immediately() -> None:
+    """An activated track drains the pre-roll without waiting for new capture."""
+    # Arrange
+    stream = _stream(rate=48_000)
+    stream._attach(asyncio.get_running_loop())
+    for i in range(100):
+        stream.push(np.full(160, i, dtype=np.int16))
+    await _settle(stream)
+    track = AudioStreamTrack(stream)
+
+    # Act
+    track.activate(start=60 * 160)
+    frames = [await asyncio.wait_for(track.recv(), timeout=0.1) for _ in range(6)]
+    stream._detach()
+    track.stop()
+
+    # Assert
+    first = frames[0].to_ndarray()
+    assert first[0, 0] == 60
+    assert [f.samples for f in frames] == [960] * 6  # 20 ms frames
+    assert [f.pts for f in frames] == [960 * i for i in range(6)]
@@ -0,0 +1,93 @@
+import asyncio
+import io
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.audio.noise import NoiseSampler
+from src.audio.recorder import Recorder
+from src.audio.sources import FileSource
+from src.audio.stream import AudioStream
+from src.settings import settings
+
+RATE = 16_000
+
+
+@pytest.fixture
+def utterance(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[Path, np.ndarray]:
+    """Raw PCM file: 1 s of tone followed by 2 s of silence, with short recorder limits."""
+    monkeypatch.setattr(settings, "MIN_RECORD_DURATION", 0.5)
+    monkeypatch.setattr(settings, "SILENCE_DURATION", 0.5)
+    t = np.arange(RATE) / RATE
+    tone = (np.sin(2 * np.pi * 300 * t) * 5000).astype(np.int16)
+    signal = np.concatenate([tone, np.zeros(2 * RATE, dtype=np.int16)])
+    path = tmp_path / "utterance.pcm"
+    path.write_bytes(signal.tobytes())
+    return path, signal
+
+
+def _recorder(path: Path) -> tuple[AudioStream, Recorder]:
+    stream = AudioStream(source=FileSource(path, sample_rate=RATE, realtime=False))
+    noise = MagicMock(spec=NoiseSampler)
+    noise.current_threshold.return_value = 500
+    return stream, Recorder(stream, noise)
+
+
+@pytest.mark.asyncio
+async def test_recorder_fills_preallocated_buffer(utterance: tuple[Path, np.ndarray]) -> None:
+    """The recording is a view of one reused buffer and its WAV parts decode to the audio."""
+    # Arrange
+    path, signal = utterance
+    stream, recorder = _recorder(path)
+    buffer = recorder._buffer
+
+    # Act
+    task = asyncio.create_task(recorder.record_until_silence())
+    await asyncio.sleep(0)
+    await stream.run()
+    recording = await task
+    header, pcm = recording.wav()
+
+    # Assert - stops after ~0.5 s of silence following the tone
+    assert 1.4 < recording.duration < 1.7
+    assert recorder._buffer is buffer
+    assert np.shares_memory(recording.samples, buffer)
+    np.testing.assert_array_equal(recording.samples, signal[: len(recording.samples)])
+    with wave.open(io.BytesIO(header + pcm), "rb") as wav_file:
+        assert wav_file.getframerate() == RATE
+        decoded = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+    np.testing.assert_array_equal(decoded, recording.samples)
+
+
+@pytest.mark.asyncio
+async def test_recorder_streams_chunks_while_capturing(
+    utterance: tuple[Path, np.ndarray],
+) -> None:
+    """Streaming mode yields a WAV header, then PCM chunks as each block arrives."""
+    # Arrange
+    path, _ = utterance
+    stream, recorder = _recorder(path)
+    chunks: list[bytes] = []
+    captured_while_streaming: list[int] = []
+
+    async def consume() -> None:
+        async for chunk in recorder.stream_until_silence():
+            chunks.append(bytes(chunk))
+            captured_while_streaming.append(recorder.last_recording().samples.size)
+
+    # Act
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    await stream.run()
+    await task
+
+    # Assert
+    header, body = chunks[0], b"".join(chunks[1:])
+    assert header[:4] == b"RIFF" and len(header) == 44
+    assert int.from_bytes(header[4:8], "little") == 0xFFFFFFFF
+    assert len(chunks) > 10
+    assert captured_while_streaming[1] < captured_while_streaming[-1]
+    assert body == recorder.last_recording().samples.tobytes()
@@ -0,0 +1,55 @@
+import asyncio
+
+import numpy as np
+import pytest
+from scipy.signal import upfirdn
+
+from src.audio.device import AudioDevice
+from src.audio.resample import StreamingResampler, _polyphase_filter
+from src.audio.stream import AudioStream
+
+
+@pytest.mark.parametrize(
+    "src_rate,dst_rate", [(48_000, 16_000), (44_100, 16_000), (16_000, 48_000)]
+)
+def test_streaming_output_matches_one_shot_filtering(src_rate: int, dst_rate: int) -> None:
+    """Block-wise output is identical to filtering the whole signal at once."""
+    # Arrange
+    rng = np.random.default_rng(0)
+    signal = (rng.standard_normal(8_000) * 3_000).astype(np.int16)
+    resampler = StreamingResampler(src_rate, dst_rate)
+
+    # Act - irregular block sizes, including ones shorter than the decimation factor
+    out, start = [], 0
+    for size in [1, 2, 512, 300, 7, 4_000, 3_178]:
+        out.append(resampler.process(signal[start : start + size]))
+        start += size
+    streamed = np.concatenate(out)
+
+    # Assert
+    h = _polyphase_filter(resampler._up, resampler._down).T.reshape(-1)
+    reference = upfirdn(h, signal.astype(np.float64), resampler._up, resampler._down)
+    expected = np.clip(np.rint(reference[: len(streamed)]), -32768, 32767)
+    np.testing.assert_array_equal(streamed, expected)
+    assert abs(len(streamed) - len(signal) * dst_rate / src_rate) <= 1
+
+
+@pytest.mark.asyncio
+async def test_stream_resamples_once_per_rate() -> None:
+    """Subscribers at the same rate share one resampled ring."""
+    # Arrange
+    stream = AudioStream(device=AudioDevice(0, "test", 48_000, 1), chunk=480)
+    stream._attach(asyncio.get_running_loop())
+    first = stream.subscribe(rate=16_000)
+    second = stream.subscribe(rate=16_000)
+
+    # Act
+    for _ in range(3):
+        stream.push(np.zeros(480, dtype=np.int16))
+    a, b = await first.get(), await second.get()
+    stream._detach()
+
+    # Assert
+    assert len(stream._taps) == 1
+    assert len(a) == 160
+    assert np.shares_memory(a, b)
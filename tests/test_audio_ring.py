@@ -0,0 +1,149 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.audio.device import AudioDevice
+from src.audio.ring import AudioRingBuffer, RingReader, SpscRing
+from src.audio.stream import AudioStream
+
+
+def test_ring_reader_returns_zero_copy_views() -> None:
+    """Blocks are read-only views into the shared buffer, not copies."""
+    # Arrange
+    ring = AudioRingBuffer(capacity=16, block=4)
+    first, second = ring.reader(), ring.reader()
+
+    # Act
+    ring.write(np.arange(4, dtype=np.int16))
+    a, b = first.read(), second.read()
+
+    # Assert
+    assert a is not None and b is not None
+    assert np.shares_memory(a, b)
+    assert not a.flags.writeable
+    np.testing.assert_array_equal(a, [0, 1, 2, 3])
+    assert first.read() is None
+
+
+def test_ring_wraps_and_drops_oldest_for_slow_reader() -> None:
+    """A lapped reader skips to the newest data and counts what it lost."""
+    # Arrange
+    ring = AudioRingBuffer(capacity=16, block=4)
+    reader = ring.reader()
+
+    # Act - write 7 blocks into a 4-block ring
+    for i in range(7):
+        ring.write(np.full(4, i, dtype=np.int16))
+    blocks = []
+    while (block := reader.read()) is not None:
+        blocks.append(int(block[0]))
+
+    # Assert - at most capacity - block samples of backlog are kept
+    assert blocks == [4, 5, 6]
+    assert reader.dropped == 16
+
+
+def test_ring_reader_with_non_dividing_block() -> None:
+    """Readers with a block size that does not divide the ring still get contiguous data."""
+    # Arrange
+    ring = AudioRingBuffer(capacity=16, block=4)
+    reader = ring.reader(block=3)
+
+    # Act
+    out = []
+    for i in range(6):
+        ring.write(np.arange(i * 4, i * 4 + 4, dtype=np.int16))
+        while (block := reader.read()) is not None:
+            out.extend(block.tolist())
+
+    # Assert
+    assert out == list(range(24))
+
+
+@pytest.mark.asyncio
+async def test_stream_fans_out_with_one_wakeup_per_batch() -> None:
+    """Every subscriber sees every block, and the loop is woken once per batch."""
+    # Arrange
+    stream = AudioStream(device=AudioDevice(0, "test", 16_000, 1), chunk=4, batch=2)
+    readers = [stream.subscribe() for _ in range(4)]
+    wakeups = 0
+    notify = stream._notify
+
+    def counting_notify() -> None:
+        nonlocal wakeups
+        wakeups += 1
+        notify()
+
+    stream._notify = counting_notify  # type: ignore[method-assign]
+    stream._attach(asyncio.get_running_loop())
+
+    async def consume(reader: RingReader) -> list[int]:
+        return [int((await reader.get())[0]) for _ in range(4)]
+
+    # Act - subscribers wait, then the PortAudio thread delivers 4 blocks at once
+    tasks = [asyncio.create_task(consume(r)) for r in readers]
+    await asyncio.sleep(0)
+    for i in range(4):
+        stream.push(np.full(4, i, dtype=np.int16))
+    received = await asyncio.gather(*tasks)
+    stream._detach()
+
+    # Assert
+    assert received == [[0, 1, 2, 3]] * 4
+    assert wakeups == 1
+
+
+def test_spsc_ring_threads_transfer_exact_sequence() -> None:
+    """Concurrent producer and consumer threads see every sample once, in order."""
+    # Arrange
+    ring = SpscRing(capacity=1_000, channels=2)
+    total = 200_000
+    signal = np.stack([np.arange(total) % 30_000, np.arange(total) % 7], axis=1).astype(np.int16)
+    received = np.empty_like(signal)
+
+    def produce() -> None:
+        rng = np.random.default_rng(1)
+        sent = 0
+        while sent < total:
+            size = min(int(rng.integers(1, 700)), total - sent)
+            sent += ring.write(signal[sent : sent + size])
+
+    def consume() -> None:
+        rng = np.random.default_rng(2)
+        got = 0
+        while got < total:
+            size = min(int(rng.integers(1, 700)), total - got)
+            got += ring.read(received[got : got + size])
+
+    # Act
+    threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    # Assert
+    np.testing.assert_array_equal(received, signal)
+    assert ring.available() == 0
+
+
+def test_ring_reader_read_all_returns_contiguous_batches() -> None:
+    """read_all hands out every pending block as one 2-D view, split only at the ring end."""
+    # Arrange
+    ring = AudioRingBuffer(capacity=16, block=4)
+    reader = ring.reader()
+    ring.write(np.arange(8, dtype=np.int16))
+    assert reader.read() is not None and reader.read() is not None
+
+    # Act - 12 samples pending, 8 before the ring end and 4 after the wrap
+    ring.write(np.arange(8, 20, dtype=np.int16))
+    first, second, third = reader.read_all(), reader.read_all(), reader.read_all()
+
+    # Assert
+    assert first is not None and second is not None
+    assert first.shape == (2, 4) and np.shares_memory(first, ring._buffer)
+    np.testing.assert_array_equal(first.ravel(), np.arange(8, 16))
+    np.testing.assert_array_equal(second.ravel(), np.arange(16, 20))
+    assert third is None
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from benchmarks.bench_turn_latency import NullPlayer
+from benchmarks.ha_standin import TOKEN, HomeAssistantStandIn
+from src.audio import AudioStream, SyntheticSource
+from src.ha import ActionExecutor, ActionResult
+from src.main import run_actions
+from src.realtime.realtime import RealtimeSession
+from src.realtime.types import FunctionCall
+
+
+def _service(call_id: str, service: str, entity: str) -> FunctionCall:
+    domain = entity.split(".")[0]
+    arguments = {"domain": domain, "service": service, "entity_id": entity}
+    return FunctionCall("call_service", arguments, call_id)
+
+
+class _Channel:
+    """Records what the session sends over the data channel."""
+
+    sent: list[dict[str, object]]
+
+    def __init__(self) -> None:
+        self.sent = []
+
+    def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+
+@pytest.mark.asyncio
+async def test_independent_calls_run_concurrently(ha_standin: HomeAssistantStandIn) -> None:
+    """Calls on different entities overlap, finishing in about one service latency."""
+    # Arrange
+    ha_standin.config.latency = 0.2
+    executor = ActionExecutor(ha_standin.base_url, TOKEN)
+    entities = ["climate.living", "light.kitchen", "light.hall", "switch.fan"]
+    calls = [_service(f"c{i}", "turn_off", e) for i, e in enumerate(entities)]
+
+    # Act
+    start = time.perf_counter()
+    results = await executor.execute(calls)
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert [r.call_id for r in results] == ["c0", "c1", "c2", "c3"]
+    assert all(r.ok for r in results)
+    assert json.loads(results[1].output)[0] == {
+        "entity_id": "light.kitchen",
+        "state": "off",
+        "attributes": {},
+    }
+    assert ha_standin.stats.max_in_flight == 4
+    assert elapsed < 0.2 * 2
+    assert all(ha_standin.states[e] == "off" for e in entities)
+
+
+@pytest.mark.asyncio
+async def test_calls_on_one_entity_keep_their_order(ha_standin: HomeAssistantStandIn) -> None:
+    """Two calls on the same light run one after the other; an unrelated call overlaps them."""
+    # Arrange
+    ha_standin.config.latency = 0.1
+    executor = ActionExecutor(ha_standin.base_url, TOKEN)
+    calls = [
+        _service("on", "turn_on", "light.kitchen"),
+        _service("fan", "turn_on", "switch.fan"),
+        _service("off", "turn_off", "light.kitchen"),
+    ]
+
+    # Act
+    results = await executor.execute(calls)
+
+    # Assert
+    assert all(r.ok for r in results)
+    kitchen = [c for c in ha_standin.stats.calls if c[1] == "light.kitchen"]
+    assert [c[0] for c in kitchen] == ["light.turn_on", "light.turn_off"]
+    assert kitchen[1][2] >= kitchen[0][3]  # Second started after the first finished
+    assert ha_standin.states["light.kitchen"] == "off"
+    assert ha_standin.stats.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_do_not_fail_the_batch(ha_standin: HomeAssistantStandIn) -> None:
+    """A timed-out call and an unknown function return errors; the other call still succeeds."""
+    # Arrange
+    ha_standin.config.latency = 0.01
+    ha_standin.config.slow["lock.door"] = 1.0
+    executor = ActionExecutor(ha_standin.base_url, TOKEN, timeout=0.2)
+    calls = [
+        _service("slow", "lock", "lock.door"),
+        FunctionCall("open_pod_bay_doors", {}, "unknown"),
+        _service("ok", "turn_on", "light.kitchen"),
+    ]
+
+    # Act
+    start = time.perf_counter()
+    slow, unknown, ok = await executor.execute(calls)
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert not slow.ok and json.loads(slow.output) == {"error": "timeout"}
+    assert not unknown.ok and "open_pod_bay_doors" in json.loads(unknown.output)["error"]
+    assert ok.ok
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_malformed_arguments_become_error_outputs(
+    ha_standin: HomeAssistantStandIn,
+) -> None:
+    """Badly shaped arguments or ids outside HA's syntax fail their own call; the rest run."""
+    # Arrange
+    executor = ActionExecutor(ha_standin.base_url, TOKEN)
+    bad = [
+        FunctionCall("call_service", {"domain": "light", "service": "turn_on", "data": "x"}, "a"),
+        FunctionCall("call_service", {"domain": "light", "service": "turn_on", "data": [1]}, "b"),
+        FunctionCall("call_service", {"domain": 1, "service": "turn_on"}, "c"),
+        FunctionCall("call_service", {"domain": "light", "service": "on", "entity_id": 5}, "d"),
+        FunctionCall("get_state", {"entity_id": ["light.kitchen"]}, "e"),
+        FunctionCall("call_service", {"domain": "../config", "service": "turn_on"}, "f"),
+        FunctionCall("call_service", {"domain": "light", "service": "turn_on?x=1"}, "g"),
+        _service("h", "turn_on", "light.kitchen/../../config"),
+        FunctionCall("get_state", {"entity_id": "../config/core"}, "i"),
+    ]
+    calls = [*bad, _service("ok", "turn_on", "light.kitchen")]
+
+    # Act
+    started = [executor.speculate(call) for call in bad]
+    results = await executor.execute(calls)
+
+    # Assert
+    assert started == [False] * len(bad)
+    assert [r.ok for r in results] == [False] * len(bad) + [True]
+    assert all("error" in json.loads(r.output) for r in results[:-1])
+    assert [c[1] for c in ha_standin.stats.calls] == ["light.kitchen"]
+
+
+@pytest.mark.asyncio
+async def test_function_outputs_are_sent_before_one_response() -> None:
+    """Each result becomes a function_call_output item, followed by a single response.create."""
+    # Arrange
+    session = RealtimeSession(AudioStream(source=SyntheticSource()), NullPlayer())
+    channel = _Channel()
+    session._dc = channel
+    results = [ActionResult("a", '{"ok": 1}', ok=True), ActionResult("b", "{}", ok=False)]
+
+    # Act
+    session.send_function_outputs(results)
+
+    # Assert
+    assert channel.sent == [
+        {
+            "type": "conversation.item.create",
+            "item": {"type": "function_call_output", "call_id": "a", "output": '{"ok": 1}'},
+        },
+        {
+            "type": "conversation.item.create",
+            "item": {"type": "function_call_output", "call_id": "b", "output": "{}"},
+        },
+        {"type": "response.create"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_whitelisted_calls_start_before_the_response_is_done(
+    ha_standin: HomeAssistantStandIn,
+) -> None:
+    """A whitelisted call runs on speculate(); a held entity keeps later calls on it in order."""
+    # Arrange
+    ha_standin.config.latency = 0.05
+    executor = ActionExecutor(ha_standin.base_url, TOKEN)
+    lock = _service("lock", "lock", "lock.door")  # Not whitelisted
+    light = _service("light", "turn_on", "light.kitchen")
+    after_lock = _service("after", "turn_on", "light.porch")
+    after_lock.arguments["entity_id"] = ["light.porch", "lock.door"]
+
+    # Act
+    started = [executor.speculate(call) for call in (lock, light, after_lock)]
+    await asyncio.sleep(0.1)  # The model is still generating
+    early = list(ha_standin.stats.calls)
+    results = await executor.execute([lock, light, after_lock])
+
+    # Assert
+    assert started == [False, True, False]
+    assert [c[1] for c in early] == ["light.kitchen"]
+    assert all(r.ok for r in results)
+    assert [c[1] for c in ha_standin.stats.calls].count("light.kitchen") == 1  # Not run again
+    porch = next(c for c in ha_standin.stats.calls if c[1] == "light.porch")
+    door = next(c for c in ha_standin.stats.calls if c[1] == "lock.door")
+    assert porch[2] >= door[3]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_response_runs_no_held_calls(ha_standin: HomeAssistantStandIn) -> None:
+    """After a barge-in only the already speculated call has run, and nothing is sent back."""
+    # Arrange
+    executor = ActionExecutor(ha_standin.base_url, TOKEN)
+    session = RealtimeSession(AudioStream(source=SyntheticSource()), NullPlayer())
+    channel = _Channel()
+    session._dc = channel
+    light = {"domain": "light", "service": "turn_on", "entity_id": "light.kitchen"}
+    heater = {"domain": "switch", "service": "turn_on", "entity_id": "switch.heater"}
+    output = [
+        {"type": "function_call", "name": "call_service", "call_id": "c1"},
+        {"type": "function_call", "name": "call_service", "call_id": "c2"},
+    ]
+    output[0]["arguments"], output[1]["arguments"] = json.dumps(light), json.dumps(heater)
+    messages: list[dict[str, object]] = [
+        {**item, "type": "response.function_call_arguments.done", "item_id": item["call_id"]}
+        for item in output
+    ]
+    messages.append(
+        {"type": "response.done", "response": {"status": "cancelled", "output": output}}
+    )
+    actions = asyncio.create_task(run_actions(session, executor))
+    await asyncio.sleep(0)  # Subscribe to the session's events
+
+    # Act
+    for message in messages:
+        session._handle_message(json.dumps(message))
+    await asyncio.sleep(0.2)
+    actions.cancel()
+
+    # Assert
+    assert [c[1] for c in ha_standin.stats.calls] == ["light.kitchen"]
+    assert "switch.heater" not in ha_standin.states
+    assert channel.sent == []
@@ -0,0 +1,43 @@
+import pytest
+
+from benchmarks.bench_turn_latency import NullPlayer
+from benchmarks.standin import RealtimeStandIn
+from src.audio import AudioStream, SyntheticSource
+from src.http_client import HttpClient
+from src.realtime.realtime import RealtimeSession
+
+
+@pytest.mark.asyncio
+async def test_session_and_signaling_requests_share_one_connection(
+    standin: RealtimeStandIn,
+) -> None:
+    """Key fetches and SDP exchanges of consecutive sessions reuse one keep-alive connection."""
+    # Arrange
+    stream = AudioStream(source=SyntheticSource(sample_rate=48_000))
+
+    # Act
+    for _ in range(3):
+        session = RealtimeSession(stream, NullPlayer())
+        await session.prepare_standby()
+        await session.disconnect()
+
+    # Assert
+    assert standin.stats.session_requests == 3
+    assert standin.stats.sdp_requests == 3
+    assert len(standin.stats.connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_close_opens_a_fresh_pool() -> None:
+    """After close() the next caller gets a new, open session."""
+    # Arrange
+    first = HttpClient.session()
+
+    # Act
+    await HttpClient.close()
+    second = HttpClient.session()
+
+    # Assert
+    assert first.closed
+    assert second is not first and not second.closed
+    await HttpClient.close()
@@ -0,0 +1,74 @@
+import io
+import logging
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from src.log import setup_logging, shutdown_logging
+
+
+class _BlockedStream(io.StringIO):
+    """Console whose writes hang until released, like a stalled journald pipe."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.release.wait()
+        return super().write(s)
+
+
+@pytest.fixture
+def restore_logging() -> Iterator[None]:
+    """Undo ``setup_logging()`` and the root level after the test."""
+    level = logging.getLogger().level
+    yield
+    shutdown_logging()
+    logging.getLogger().setLevel(level)
+
+
+@pytest.mark.usefixtures("restore_logging")
+def test_rate_limit_suppresses_chatty_module_but_not_warnings() -> None:
+    """Past its burst a module's info records are dropped and counted; warnings always pass."""
+    # Arrange
+    out = io.StringIO()
+    setup_logging("INFO", out, rate=0.001, burst=3)
+    chatty = logging.getLogger("test.chatty")
+    quiet = logging.getLogger("test.quiet")
+
+    # Act
+    for i in range(10):
+        chatty.info("delta %d", i)
+    chatty.warning("still here")
+    quiet.info("unaffected")
+    shutdown_logging()
+
+    # Assert
+    lines = out.getvalue().splitlines()
+    assert sum("delta" in line for line in lines) == 3
+    assert any("still here" in line for line in lines)
+    assert any("[test.quiet] unaffected" in line for line in lines)
+
+
+@pytest.mark.usefixtures("restore_logging")
+def test_logging_does_not_block_on_stalled_console() -> None:
+    """A hung console stalls only the writer thread; callers return immediately."""
+    # Arrange
+    out = _BlockedStream()
+    setup_logging("INFO", out, rate=1e9, burst=1_000_000)
+    logger = logging.getLogger("test.stalled")
+
+    # Act
+    start = time.perf_counter()
+    for i in range(1_000):
+        logger.info("record %d", i)
+    elapsed = time.perf_counter() - start
+    out.release.set()
+    shutdown_logging()
+
+    # Assert - everything queued is written once the console recovers
+    assert elapsed < 0.5
+    assert out.getvalue().count("record") == 1_000
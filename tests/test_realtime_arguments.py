@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.bench_turn_latency import NullPlayer
+from src.audio import AudioStream, SyntheticSource
+from src.realtime.arguments import ArgumentsParser
+from src.realtime.events import FunctionCallReady, RealtimeEvent
+from src.realtime.realtime import RealtimeSession
+from src.realtime.types import FunctionCall
+
+ARGUMENTS = {
+    "domain": "light",
+    "service": "turn_on",
+    "entity_id": ["light.kitchen", "light.hall"],
+    "data": {"name": 'say "}{" \\ done', "brightness": 128},
+}
+
+
+def _pieces(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_parser_completes_on_the_closing_brace() -> None:
+    """Brackets, quotes and escapes inside strings never end the object, at any split."""
+    # Arrange
+    text = json.dumps(ARGUMENTS)
+
+    for size in (1, 2, 3, 7, len(text)):
+        parser = ArgumentsParser()
+
+        # Act
+        completed = [i for i, piece in enumerate(_pieces(text, size)) if parser.feed(piece)]
+
+        # Assert
+        assert completed == [len(_pieces(text, size)) - 1], f"size {size}"
+        assert parser.value == ARGUMENTS
+
+
+def test_parser_rejects_non_objects() -> None:
+    """A completed array is not valid function arguments."""
+    # Arrange
+    parser = ArgumentsParser()
+
+    # Act / Assert
+    assert parser.feed("[1, ") is None
+    with pytest.raises(ValueError):
+        parser.feed("2]")
+
+
+@pytest.mark.asyncio
+async def test_session_publishes_calls_before_response_done() -> None:
+    """The delta completing a call's arguments publishes it; the done event does not again."""
+    # Arrange
+    session = RealtimeSession(AudioStream(source=SyntheticSource()), NullPlayer())
+    queue: asyncio.Queue[RealtimeEvent | None] = asyncio.Queue()
+    session._subscribers.append(queue)
+    received: list[RealtimeEvent] = []
+    text = json.dumps(ARGUMENTS)
+    messages = [
+        {
+            "type": "response.output_item.added",
+            "response_id": "resp_1",
+            "item": {
+                "id": "item_1",
+                "type": "function_call",
+                "name": "call_service",
+                "call_id": "call_1",
+            },
+        },
+        *(
+            {
+                "type": "response.function_call_arguments.delta",
+                "item_id": "item_1",
+                "call_id": "call_1",
+                "delta": piece,
+            }
+            for piece in _pieces(text, 5)
+        ),
+        {
+            "type": "response.function_call_arguments.done",
+            "item_id": "item_1",
+            "call_id": "call_1",
+            "name": "call_service",
+            "arguments": text,
+        },
+    ]
+
+    # Act
+    for message in messages:
+        session._handle_message(json.dumps(message))
+    while not queue.empty() and (event := queue.get_nowait()) is not None:
+        received.append(event)
+
+    # Assert
+    ready = [i for i, e in enumerate(received) if isinstance(e, FunctionCallReady)]
+    assert len(ready) == 1
+    assert received[ready[0] + 1].type == "response.function_call_arguments.delta"
+    assert received[ready[0] + 2].type == "response.function_call_arguments.done"
+    ready_event = received[ready[0]]
+    assert isinstance(ready_event, FunctionCallReady)
+    assert ready_event.call == FunctionCall("call_service", ARGUMENTS, "call_1")
@@ -0,0 +1,46 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from benchmarks.bench_turn_latency import NullPlayer
+from benchmarks.standin import RealtimeStandIn
+from src.audio import AudioStream, FileSource, NoiseSampler
+from src.realtime.realtime import RealtimeSession
+
+RATE = 16_000
+
+
+@pytest.mark.asyncio
+async def test_local_endpointing_commits_without_server_vad(
+    standin: RealtimeStandIn, tmp_path: Path
+) -> None:
+    """Local silence stops the uplink, commits the buffer and requests the response."""
+    # Arrange - 0.5 s of tone between silences, replayed in real time
+    t = np.arange(RATE // 2) / RATE
+    tone = (np.sin(2 * np.pi * 300 * t) * 5000).astype(np.int16)
+    silence = np.zeros(RATE, dtype=np.int16)
+    path = tmp_path / "utterance.pcm"
+    path.write_bytes(np.concatenate([silence[: RATE // 4], tone, silence, silence]).tobytes())
+    stream = AudioStream(source=FileSource(path, sample_rate=RATE))
+    noise = MagicMock(spec=NoiseSampler)
+    noise.current_threshold.return_value = 500
+    session = RealtimeSession(stream, NullPlayer(), noise)
+    stream_task = asyncio.create_task(stream.run())
+
+    try:
+        # Act
+        await session.connect(audio_enabled=True, start=0)
+        async with asyncio.timeout(5):
+            await session.wait_for_speech_stopped()
+            while "response.create" not in standin.stats.client_events:
+                await asyncio.sleep(0.01)
+
+        # Assert - the turn ended ~0.4 s after the tone, well before the file did
+        assert standin.stats.client_events == ["input_audio_buffer.commit", "response.create"]
+        assert not stream_task.done()
+    finally:
+        await session.disconnect()
+        stream_task.cancel()
@@ -0,0 +1,122 @@
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from benchmarks.bench_turn_latency import NullPlayer
+from benchmarks.standin import RealtimeStandIn
+from src.audio import AudioStream, SyntheticSource
+from src.realtime import events
+from src.realtime.events import (
+    EventDispatcher,
+    RealtimeEvent,
+    ResponseDone,
+    SpeechStopped,
+    TranscriptDelta,
+)
+from src.realtime.realtime import RealtimeSession
+
+
+@pytest.mark.parametrize("decoder", [json.loads, events.decode], ids=["json", "default"])
+def test_dispatcher_routes_typed_events(
+    decoder: Callable[[str | bytes], Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Known events reach their typed handlers, unknown ones the fallback, all the listener."""
+    # Arrange
+    monkeypatch.setattr(events, "decode", decoder)
+    dispatcher = EventDispatcher()
+    deltas: list[str] = []
+    done: list[ResponseDone] = []
+    unknown: list[str] = []
+    seen: list[RealtimeEvent] = []
+    dispatcher.on(TranscriptDelta, lambda e: deltas.append(e.delta))
+    dispatcher.on(ResponseDone, done.append)
+    dispatcher.on(RealtimeEvent, lambda e: unknown.append(e.type))
+    dispatcher.on_any(seen.append)
+    call = {"type": "function_call", "name": "light", "call_id": "c1", "arguments": '{"on":1}'}
+    messages = [
+        {"type": "response.text.delta", "delta": "he"},
+        {"type": "response.audio_transcript.delta", "delta": "llo"},
+        {"type": "session.created"},
+        {"type": "response.done", "response": {"status": "completed", "output": [call]}},
+    ]
+
+    # Act
+    for message in messages:
+        dispatcher.dispatch(json.dumps(message))
+
+    # Assert
+    assert deltas == ["he", "llo"]
+    assert unknown == ["session.created"]
+    assert [(c.name, c.arguments, c.call_id) for c in done[0].function_calls] == [
+        ("light", {"on": 1}, "c1")
+    ]
+    kinds = [TranscriptDelta, TranscriptDelta, RealtimeEvent, ResponseDone]
+    assert [type(e) for e in seen] == kinds
+    with pytest.raises(ValueError):
+        dispatcher.dispatch("not json")
+
+
+@pytest.mark.asyncio
+async def test_session_streams_events_and_builds_result(standin: RealtimeStandIn) -> None:
+    """``events()`` yields the turn's typed events and the session assembles its result."""
+    # Arrange
+    standin.config.speech_start = standin.config.speech_duration = 0.05
+    standin.config.vad_silence = standin.config.response_latency = 0.05
+    stream = AudioStream(source=SyntheticSource(sample_rate=48_000))
+    stream_task = asyncio.create_task(stream.run())
+    session = RealtimeSession(stream, NullPlayer())
+    received: list[RealtimeEvent] = []
+
+    async def collect() -> None:
+        async for event in session.events():
+            received.append(event)
+
+    collector = asyncio.create_task(collect())
+    await asyncio.sleep(0)
+
+    try:
+        # Act
+        await session.connect(audio_enabled=True)
+        async with asyncio.timeout(10):
+            result = await session.wait_for_result()
+        await session.disconnect()
+        async with asyncio.timeout(1):
+            await collector
+
+        # Assert
+        assert result.transcript == "こんにちは、どうぞ"
+        assert result.function_calls is None and not result.is_interrupted
+        assert result.duration_ms is not None and result.duration_ms > 0
+        assert any(isinstance(e, SpeechStopped) for e in received)
+        assert [e.delta for e in received if isinstance(e, TranscriptDelta)] == list(
+            standin.config.transcript
+        )
+        assert isinstance(received[-1], ResponseDone)
+    finally:
+        await session.disconnect()
+        stream_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_truncated_arguments_do_not_drop_response_done() -> None:
+    """A cut-off call is dropped; the turn still completes with the well-formed calls."""
+    # Arrange
+    session = RealtimeSession(AudioStream(source=SyntheticSource()), NullPlayer())
+    output = [
+        {"type": "function_call", "name": "get_state", "call_id": "c1", "arguments": '{"enti'},
+        {"type": "function_call", "name": "get_state", "call_id": "c2", "arguments": "[1]"},
+        {"type": "function_call", "name": "get_state", "call_id": "c3", "arguments": "{}"},
+    ]
+    message = {"type": "response.done", "response": {"status": "incomplete", "output": output}}
+
+    # Act
+    session._handle_message(json.dumps(message))
+    async with asyncio.timeout(1):
+        result = await session.wait_for_result()
+
+    # Assert
+    assert result.function_calls is not None
+    assert [c.call_id for c in result.function_calls] == ["c3"]
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from benchmarks.bench_turn_latency import NullPlayer
+from benchmarks.standin import RealtimeStandIn
+from src.audio import AudioStream, SyntheticSource
+from src.realtime.realtime import RealtimeSessionManager
+
+
+@pytest.mark.asyncio
+async def test_get_session_hands_over_prewarmed_session(standin: RealtimeStandIn) -> None:
+    """A standby session is negotiated before the wake word and only activated after it."""
+    # Arrange
+    stream = AudioStream(source=SyntheticSource(sample_rate=48_000))
+    stream_task = asyncio.create_task(stream.run())
+    RealtimeSessionManager.start_standby(stream, 1, player_factory=NullPlayer)
+    try:
+        async with asyncio.timeout(10):
+            while not RealtimeSessionManager._standby:
+                await asyncio.sleep(0.01)
+        requests_before = standin.stats.session_requests
+
+        # Act
+        session = await RealtimeSessionManager.get_session(stream)
+        track = session._send_track
+        assert track is not None
+        idle_on_standby = track._reader is None  # No audio sent while on standby
+        await session.connect(audio_enabled=True)
+
+        # Assert - no signaling on the wake path, and the pool is refilled afterwards
+        assert session.is_prepared
+        assert idle_on_standby and track._reader is not None
+        assert standin.stats.session_requests == requests_before
+        async with asyncio.timeout(10):
+            while not RealtimeSessionManager._standby:
+                await asyncio.sleep(0.01)
+        assert standin.stats.session_requests == requests_before + 1
+    finally:
+        await RealtimeSessionManager.stop_standby()
+        if RealtimeSessionManager._current_session is not None:
+            await RealtimeSessionManager._current_session.disconnect()
+            RealtimeSessionManager._current_session = None
+        stream_task.cancel()
@@ -0,0 +1,92 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.audio.clock import CaptureClock
+from src.audio.device import AudioDevice
+from src.audio.stream import AudioStream
+from src.realtime.realtime import OPUS_SAMPLE_RATE, AudioStreamTrack
+
+RATE = 48_000
+CHUNK = 160
+
+
+def _stream(rate: int = RATE) -> AudioStream:
+    device = AudioDevice(0, "test", rate, 1)
+    return AudioStream(device=device, chunk=CHUNK, buffer_blocks=50)
+
+
+async def _push(stream: AudioStream, blocks: int) -> None:
+    for _ in range(blocks):
+        stream.push(np.ones(CHUNK, dtype=np.int16))
+    while stream._notified != stream._ring.written:
+        await asyncio.sleep(0)
+
+
+def test_capture_clock_estimates_drift_after_warmup() -> None:
+    """The ratio stays nominal during warmup, then follows the device, within the clamp."""
+    # Arrange
+    clock = CaptureClock(RATE, warmup=5.0, max_drift=500e-6)
+
+    # Act - a device 100 ppm fast, then an implausible burst
+    clock.observe(0, 100.0)
+    clock.observe(RATE, 101.0)
+    early = clock.ratio
+    clock.observe(round(10 * RATE * 1.0001), 110.0)
+    drift = clock.ratio
+    clock.observe(20 * RATE, 111.0)
+
+    # Assert
+    assert early == 1.0
+    assert drift == pytest.approx(1.0001, abs=1e-7)
+    assert clock.ratio == 1.0005
+
+
+@pytest.mark.asyncio
+async def test_track_timestamps_follow_capture_clock() -> None:
+    """Frames are 20 ms; pts spans lost audio and is scaled by the measured drift."""
+    # Arrange - a device measured 0.1% fast
+    stream = _stream()
+    stream._clock = MagicMock(ratio=1.001)
+    stream._attach(asyncio.get_running_loop())
+    track = AudioStreamTrack(stream)
+    track.activate()
+
+    # Act - one frame, then enough capture to lap the track's 8000-sample ring
+    await _push(stream, 6)
+    first = await asyncio.wait_for(track.recv(), timeout=0.1)
+    await _push(stream, 100)
+    second = await asyncio.wait_for(track.recv(), timeout=0.1)
+    stream._detach()
+    track.stop()
+
+    # Assert
+    assert first.samples == second.samples == 960
+    assert first.to_ndarray().tolist() == [[1] * 960]
+    assert track._reader is not None
+    lost = track._reader.dropped
+    assert lost > 0
+    assert (first.pts, second.pts) == (0, round((960 + lost) / 1.001))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rate", [16_000, 44_100])
+async def test_track_sends_20ms_frames_from_resampled_devices(rate: int) -> None:
+    """On a device that is not 48 kHz the track still reads whole 960-sample frames."""
+    # Arrange
+    stream = _stream(rate)
+    stream._attach(asyncio.get_running_loop())
+    track = AudioStreamTrack(stream, sample_rate=OPUS_SAMPLE_RATE)
+    track.activate()
+
+    # Act - 100 ms of capture
+    await _push(stream, rate // 10 // CHUNK)
+    frames = [await asyncio.wait_for(track.recv(), timeout=0.1) for _ in range(3)]
+    stream._detach()
+    track.stop()
+
+    # Assert
+    assert [frame.samples for frame in frames] == [960] * 3
+    assert [frame.pts for frame in frames] == [0, 960, 1920]
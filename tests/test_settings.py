@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import pytest
+
+from src.settings import Settings
+
+
+@pytest.mark.parametrize(
+    ("name", "value", "expected"),
+    [
+        ("PORCUPINE_KEYWORD_PATH", "/models/hey.ppn", [Path("/models/hey.ppn")]),
+        ("PORCUPINE_KEYWORD_PATHS", "/models/hey.ppn", [Path("/models/hey.ppn")]),
+        (
+            "PORCUPINE_KEYWORD_PATHS",
+            '["/models/a.ppn", "b.ppn"]',
+            [Path("/models/a.ppn"), Path("b.ppn")],
+        ),
+    ],
+)
+def test_keyword_paths_accept_the_old_name_and_a_single_path(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    name: str,
+    value: str,
+    expected: list[Path],
+) -> None:
+    """An override under the pre-rename name or as one bare path is not dropped."""
+    # Arrange - no .env in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(name, value)
+
+    # Act
+    settings = Settings()
+
+    # Assert
+    assert settings.PORCUPINE_KEYWORD_PATHS == expected
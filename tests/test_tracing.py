@@ -0,0 +1,61 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.audio import AudioStream, SyntheticSource
+from src.tracing import Tracer, tracer
+
+
+def test_exports_keep_totals_past_ring_capacity(tmp_path: Path) -> None:
+    """Evicted spans still count in Prometheus totals; the Chrome trace holds what is retained."""
+    # Arrange
+    trace = Tracer(capacity=4)
+
+    # Act
+    for _ in range(10):
+        with trace.span("stage", turn=1):
+            pass
+    with pytest.raises(KeyError):
+        with trace.span("failing"):
+            raise KeyError("x")
+    trace.mark("first_audio")
+    trace.count("underruns", 2)
+    trace.export(tmp_path)
+
+    # Assert
+    metrics = (tmp_path / "metrics.prom").read_text()
+    assert 'smartspeaker_span_seconds_count{span="stage"} 10' in metrics
+    assert 'smartspeaker_span_seconds{span="stage",quantile="0.99"}' in metrics
+    assert 'smartspeaker_events_total{counter="underruns"} 2' in metrics
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert len(spans) == 4
+    assert spans[-1]["args"] == {"error": "KeyError"}
+    assert {e["name"] for e in events if e["ph"] == "i"} == {"first_audio"}
+    assert [e["args"] for e in events if e["ph"] == "C"] == [{"underruns": 2}]
+
+
+@pytest.mark.asyncio
+async def test_audio_callbacks_are_tallied_without_evicting_spans() -> None:
+    """Capture callbacks and batch processing are totalled; the ring keeps the turn's spans."""
+    # Arrange
+    tracer.clear()
+    stream = AudioStream(source=SyntheticSource(sample_rate=16_000, realtime=False))
+    reader = stream.subscribe()
+    with tracer.span("realtime.sdp"):
+        pass
+
+    # Act
+    task = asyncio.create_task(stream.run())
+    for _ in range(5):
+        await reader.get()
+    task.cancel()
+    metrics = tracer.prometheus()
+
+    # Assert
+    assert [span.name for span in tracer.spans] == ["realtime.sdp"]
+    for name in ("audio.push", "audio.notify"):
+        assert f'smartspeaker_span_seconds_count{{span="{name}"}}' in metrics
+        assert f'smartspeaker_span_seconds{{span="{name}",quantile' not in metrics
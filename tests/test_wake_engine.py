@@ -0,0 +1,106 @@
+import asyncio
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.audio import AudioStream, FileSource, SyntheticSource
+from src.wake import WakeEngine
+
+RATE = 16_000
+FRAME = 512
+
+
+class _LevelSpotter:
+    """Back end whose keywords fire on a frame peak within their level band."""
+
+    sample_rate = RATE
+    frame_length = FRAME
+
+    def __init__(self, bands: dict[str, tuple[int, int]]) -> None:
+        self._bands = list(bands.values())
+        self._keywords = list(bands)
+        self.frames = 0
+        self.deleted = False
+
+    @property
+    def keywords(self) -> Sequence[str]:
+        return self._keywords
+
+    def process(self, pcm: np.ndarray) -> int:
+        self.frames += 1
+        peak = int(np.abs(pcm).max())
+        for i, (low, high) in enumerate(self._bands):
+            if low <= peak < high:
+                return i
+        return -1
+
+    def delete(self) -> None:
+        self.deleted = True
+
+
+@pytest.mark.asyncio
+async def test_backends_share_one_subscription_and_report_keyword(tmp_path: Path) -> None:
+    """Every back end sees the same frames; the event names the keyword that fired."""
+    # Arrange - a peak in frame 3 that only the second back end's "hey" band matches
+    samples = np.zeros(RATE * 2, dtype=np.int16)
+    samples[3 * FRAME + 7] = 25_000
+    path = tmp_path / "wake.pcm"
+    path.write_bytes(samples.tobytes())
+    stream = AudioStream(source=FileSource(path, sample_rate=RATE, realtime=False))
+    first = _LevelSpotter({"alexa": (10_000, 20_000), "computer": (5_000, 10_000)})
+    second = _LevelSpotter({"hey": (20_000, 30_000)})
+    engine = WakeEngine(stream, [first, second])
+
+    # Act
+    wait = asyncio.create_task(engine.wait_for_wake())
+    await asyncio.sleep(0)
+    stream_task = asyncio.create_task(stream.run())
+    try:
+        async with asyncio.timeout(5):
+            event = await wait
+    finally:
+        stream_task.cancel()
+        engine.close()
+
+    # Assert
+    assert engine.keywords == ["alexa", "computer", "hey"]
+    assert (event.keyword, event.sample_index) == ("hey", 4 * FRAME)
+    assert first.frames == second.frames == 4
+    assert first.deleted and second.deleted
+
+
+def test_backends_must_agree_on_framing() -> None:
+    """Back ends that need different frames cannot share the pipeline."""
+    # Arrange
+    stream = AudioStream(source=SyntheticSource(sample_rate=RATE))
+    other = _LevelSpotter({"x": (0, 1)})
+    other.frame_length = FRAME * 2
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        WakeEngine(stream, [_LevelSpotter({"y": (0, 1)}), other])
+
+
+@pytest.mark.asyncio
+async def test_feed_failure_is_raised_from_wait_for_wake(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An exception in the feed task ends wait_for_wake() instead of leaving it waiting."""
+    # Arrange
+    stream = AudioStream(source=SyntheticSource(sample_rate=RATE))
+    engine = WakeEngine(stream, [_LevelSpotter({"alexa": (10_000, 20_000)})])
+
+    async def broken_push(*_: object) -> None:
+        raise OSError("resampler failed")
+
+    monkeypatch.setattr(engine, "_push", broken_push)
+    stream_task = asyncio.create_task(stream.run())
+
+    # Act / Assert
+    try:
+        with pytest.raises(OSError, match="resampler failed"):
+            async with asyncio.timeout(5):
+                await engine.wait_for_wake()
+    finally:
+        stream_task.cancel()
+        engine.close()
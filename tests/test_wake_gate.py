@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_wake_gate import detect, make_corpus, recall
+
+RATE = 16_000
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> tuple[Path, list[tuple[int, int]]]:
+    """Three keywords and two loud distractors in 20 s of noise."""
+    samples, spans = make_corpus(RATE, keywords=3, distractors=2, slot=4.0)
+    path = tmp_path / "corpus.pcm"
+    path.write_bytes(samples.tobytes())
+    return path, spans
+
+
+@pytest.mark.asyncio
+async def test_gate_skips_idle_audio_without_losing_keywords(
+    corpus: tuple[Path, list[tuple[int, int]]],
+) -> None:
+    """Gated and always-on inference detect the same wakes; the gate skips most frames."""
+    # Arrange
+    path, spans = corpus
+
+    # Act
+    always_on, _ = await detect(path, RATE, gated=False)
+    gated, skipped = await detect(path, RATE, gated=True)
+
+    # Assert
+    assert recall(always_on, spans, RATE) == 1.0
+    assert gated == always_on
+    assert skipped > 0.5
+
+
+@pytest.mark.asyncio
+async def test_lookback_replays_quiet_onset(corpus: tuple[Path, list[tuple[int, int]]]) -> None:
+    """Without lookback the spotter never hears the onset that precedes the gate opening."""
+    # Arrange
+    path, spans = corpus
+
+    # Act
+    detections, _ = await detect(path, RATE, gated=True, lookback=0.0)
+
+    # Assert
+    assert recall(detections, spans, RATE) == 0.0
@@ -0,0 +1,162 @@
+import asyncio
+import queue
+import time
+from pathlib import Path
+
+import numpy as np
+import pvporcupine
+import pytest
+
+from src.audio import AudioStream, FileSource
+from src.settings import settings
+from src.tracing import tracer
+from src.wake.porcupine_wake import PorcupineWakeWordDetector
+from src.wake.worker import InferenceWorker
+
+RATE = 16_000
+FRAME = 512
+
+
+class _SlowPorcupine:
+    """Stand-in engine: 3 ms of blocking work per frame, triggers on a loud sample."""
+
+    sample_rate = RATE
+    frame_length = FRAME
+
+    def process(self, pcm: np.ndarray) -> int:
+        time.sleep(0.003)
+        return 0 if int(np.abs(pcm).max()) > 10_000 else -1
+
+    def delete(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_worker_keeps_loop_responsive_while_draining_backlog() -> None:
+    """Inference runs off the loop; a full queue suspends the producer instead of blocking."""
+    # Arrange
+    tracer.clear()
+    engine = _SlowPorcupine()
+    worker = InferenceWorker(engine.process, capacity=8)
+    frames = np.zeros((100, FRAME), dtype=np.int16)
+    frames[70, 10] = 20_000
+    gaps: list[float] = []
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    async def feed() -> None:
+        for i, frame in enumerate(frames):
+            await worker.put(frame, i)
+        await worker.finish()
+
+    # Act
+    tick = asyncio.create_task(ticker())
+    worker.begin()
+    producer = asyncio.create_task(feed())
+    async with asyncio.timeout(5):
+        detected, tag = await worker.result()
+    producer.cancel()
+    tick.cancel()
+    worker.close()
+
+    # Assert - ~0.2 s of inference, yet the loop never stalled for a frame's worth of it
+    assert (detected, tag) == (0, 70)
+    assert max(gaps) < 0.05
+    names = [span.name for span in tracer.spans]
+    assert names.count("wake.inference") == 71
+    assert tracer.counters["wake.queue_full"] > 0
+
+
+@pytest.mark.asyncio
+async def test_detector_reports_capture_index_of_wake_frame(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The wake index is the end of the triggering frame, in capture samples."""
+    # Arrange - a click inside the fifth Porcupine frame of a replayed file
+    samples = np.zeros(RATE * 2, dtype=np.int16)
+    samples[4 * FRAME + 100] = 20_000
+    path = tmp_path / "wake.pcm"
+    path.write_bytes(samples.tobytes())
+    monkeypatch.setattr(settings, "PORCUPINE_ACCESS_KEY", "test")
+    monkeypatch.setattr(pvporcupine, "create", lambda **_: _SlowPorcupine())
+    stream = AudioStream(source=FileSource(path, sample_rate=RATE, realtime=False))
+    detector = PorcupineWakeWordDetector(stream)
+
+    # Act
+    wait = asyncio.create_task(detector.wait_for_wake())
+    await asyncio.sleep(0)  # Subscribe before the first block is captured
+    stream_task = asyncio.create_task(stream.run())
+    try:
+        async with asyncio.timeout(5):
+            event = await wait
+    finally:
+        stream_task.cancel()
+        detector.close()
+
+    # Assert
+    assert event.sample_index == 5 * FRAME
+    assert event.keyword == settings.PORCUPINE_KEYWORD_PATHS[0].stem
+
+
+@pytest.mark.asyncio
+async def test_producer_retries_when_worker_dequeues_before_seeing_the_flag() -> None:
+    """A frame taken between a failed put and the waiting flag does not strand the producer."""
+    # Arrange - capacity 1, full; the "worker" takes the frame right as the put fails
+    worker = InferenceWorker(lambda _: -1, capacity=1)
+    frame = np.zeros(FRAME, dtype=np.int16)
+    worker._queue.put_nowait((0, frame, 0, 0))
+    put_nowait = worker._queue.put_nowait
+
+    def racing_put(item: tuple[int, np.ndarray | None, int, int] | None) -> None:
+        try:
+            put_nowait(item)
+        except queue.Full:
+            worker._queue.get_nowait()  # Dequeued while _waiting was still False
+            raise
+
+    worker._queue.put_nowait = racing_put  # type: ignore[method-assign]
+
+    # Act
+    async with asyncio.timeout(1):
+        await worker.put(frame, 1)
+
+    # Assert
+    assert worker.backlog == 1
+
+
+@pytest.mark.asyncio
+async def test_detector_error_fails_the_detection_and_worker_recovers() -> None:
+    """An exception from the detector reaches result(); the next detection runs normally."""
+    # Arrange
+    calls = 0
+
+    def process(pcm: np.ndarray) -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("porcupine error")
+        return 0 if int(np.abs(pcm).max()) > 10_000 else -1
+
+    worker = InferenceWorker(process, capacity=1)
+    loud = np.full(FRAME, 20_000, dtype=np.int16)
+
+    # Act
+    worker.begin()
+    await worker.put(loud, 1)
+    with pytest.raises(RuntimeError, match="porcupine error"):
+        async with asyncio.timeout(1):
+            await worker.result()
+    worker.begin()
+    await worker.put(loud, 2)
+    async with asyncio.timeout(1):
+        detected, tag = await worker.result()
+    worker.close()
+
+    # Assert
+    assert (detected, tag) == (0, 2)